@@ -0,0 +1,76 @@
+"""
+Cost of one Evaluator.eval() call per node type, and per operator of an
+integer infix expression, in nanoseconds. Each figure includes evaluating
+the node's children (all leaves here) and building the result. 'miss' is
+a node type eval() does not handle, the price of dispatch alone.
+
+    python -m benchmarks.dispatch
+"""
+import sys
+import timeit
+
+from monkey.evaluator.evaluator import Evaluator
+from monkey.lexer.lexer import Lexer
+from monkey.object.environment import Environment
+from monkey.parser.pratt_parser import Parser
+
+NUMBER = 100000
+REPEAT = 5
+
+# name -> (source, path to the node from the first statement)
+nodes = {
+    'Program': ('5', None),
+    'LetStatement': ('let b = 5;', ()),
+    'Identifier': ('a', ('expression',)),
+    'ExpressionStatement': ('5;', ()),
+    'FunctionLiteral': ('fn(x) { x }', ('expression',)),
+    'CallExpression': ('f(1)', ('expression',)),
+    'IntegerLiteral': ('5', ('expression',)),
+    'Boolean': ('true', ('expression',)),
+    'NullLiteral': ('null', ('expression',)),
+    'PrefixExpression': ('-5', ('expression',)),
+    'InfixExpression': ('1 + 2', ('expression',)),
+    'BlockStatement': ('if (true) { 5 }', ('expression', 'consequence')),
+    'IfExpression': ('if (true) { 5 }', ('expression',)),
+    'ReturnStatement': ('return 5;', ()),
+}
+
+operators = ('+', '-', '*', '/', '<', '>', '==', '!=')
+
+
+def node_of(source, path):
+    program = Parser(Lexer(source)).parse_program()
+    if path is None:
+        return program
+    node = program.statements[0]
+    for field in path:
+        node = getattr(node, field)
+    return node
+
+
+def environment(evaluator):
+    env = Environment()
+    evaluator.eval(node_of('let a = 1; let f = fn(x) { x };', None), env)
+    return env
+
+
+def cost(evaluator, node, env):
+    best = min(timeit.repeat(lambda: evaluator.eval(node, env), number=NUMBER, repeat=REPEAT))
+    return best / NUMBER * 1e9
+
+
+def main():
+    evaluator = Evaluator()
+    env = environment(evaluator)
+
+    print(f'Python {sys.version.split()[0]}, ns per eval()')
+    print(f'{"miss":24} {cost(evaluator, object(), env):8.0f}')
+    for name, (source, path) in nodes.items():
+        print(f'{name:24} {cost(evaluator, node_of(source, path), env):8.0f}')
+    for operator in operators:
+        node = node_of(f'7 {operator} 3', ('expression',))
+        print(f'{"7 " + operator + " 3":24} {cost(evaluator, node, env):8.0f}')
+
+
+if __name__ == '__main__':
+    main()
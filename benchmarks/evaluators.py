@@ -0,0 +1,88 @@
+"""
+Run time of recursive and closure-heavy programs on each evaluator, and the
+Integer objects each makes for one run (literal constants included).
+
+    python -m benchmarks.evaluators
+"""
+import sys
+import timeit
+
+from monkey.evaluator.evaluator import Evaluator
+from monkey.evaluator.raising_evaluator import RaisingEvaluator
+from monkey.evaluator.unboxed_evaluator import UnboxedEvaluator
+from monkey.lexer.lexer import Lexer
+from monkey.object.environment import Environment
+from monkey.object.object import Integer
+from monkey.parser.pratt_parser import Parser
+
+REPEAT = 5
+
+programs = {
+    'fib': """
+        let fib = fn(n) { if (n < 2) { return n; } fib(n - 1) + fib(n - 2) };
+        fib(18)
+    """,
+    'closures': """
+        let adder = fn(x) { fn(y) { x + y } };
+        let compose = fn(f, g) { fn(x) { g(f(x)) } };
+        let loop = fn(i, acc) {
+            if (i == 0) { acc } else { loop(i - 1, compose(adder(i), adder(1))(acc)) }
+        };
+        loop(300, 0) + loop(300, 0) + loop(300, 0)
+    """,
+}
+
+
+class NoSmallIntegers(Evaluator):
+    small_integers = None
+
+
+evaluators = {
+    'Evaluator': Evaluator,
+    'no small ints': NoSmallIntegers,
+    'RaisingEvaluator': RaisingEvaluator,
+    'UnboxedEvaluator': UnboxedEvaluator,
+}
+
+
+def integers_made(evaluator_class, source):
+    count = 0
+    init = Integer.__init__
+
+    def counting(self, value=None):
+        nonlocal count
+        count += 1
+        init(self, value)
+
+    program = Parser(Lexer(source)).parse_program()  # no literal constants yet
+    Integer.__init__ = counting
+    try:
+        evaluator_class().eval(program, Environment())
+    finally:
+        Integer.__init__ = init
+    return count
+
+
+def main():
+    sys.setrecursionlimit(100000)
+    print(f'Python {sys.version.split()[0]}, ms')
+    print(f'{"":20}' + ''.join(f'{name:>12}' for name in programs))
+    parsed = {name: Parser(Lexer(source)).parse_program() for name, source in programs.items()}
+
+    for name, evaluator_class in evaluators.items():
+        times = []
+        for program in parsed.values():
+            best = min(timeit.repeat(
+                lambda: evaluator_class().eval(program, Environment()), number=1, repeat=REPEAT,
+            ))
+            times.append(best * 1000)
+        print(f'{name:20}' + ''.join(f'{t:12.1f}' for t in times))
+
+    print('\nInteger objects made')
+    for name, evaluator_class in evaluators.items():
+        counts = [integers_made(evaluator_class, source) for source in programs.values()]
+        print(f'{name:20}' + ''.join(f'{c:12}' for c in counts))
+
+
+if __name__ == '__main__':
+    main()
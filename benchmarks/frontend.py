@@ -0,0 +1,200 @@
+"""
+Lexer and parser throughput on generated programs (see benchmarks.generator),
+in tokens and AST nodes per second, for input sizes from 1 KB to 100 MB.
+
+    python -m benchmarks.frontend --sizes 1K 100K 1M --output before.json
+    python -m benchmarks.frontend --sizes 1K 100K 1M --compare before.json
+
+Every result is the best of repeated runs until --min-time seconds have
+passed (at least one run). Parsers build the whole tree, so the largest
+sizes need several GB of memory.
+"""
+import argparse
+import datetime
+import json
+import platform
+import sys
+import time
+
+from benchmarks.generator import ProgramGenerator
+from monkey.ast.ast import walk
+from monkey.lexer.lexer import Lexer
+from monkey.lexer.regex_lexer import RegexLexer
+from monkey.parser import cfg_parser, pratt_parser
+from monkey.tok.tok import TokenType
+from monkey.v2 import main as v2
+
+SIZES = ('1K', '10K', '100K', '1M', '10M', '100M')
+MAX_RUNS = 5
+
+units = {'K': 1000, 'M': 1000 ** 2, 'G': 1000 ** 3}
+
+
+def parse_size(text):
+    text = text.upper()
+    if text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def count_tokens(lexer, eof):
+    count = 0
+    while lexer.next_token().type is not eof:
+        count += 1
+    return count
+
+
+def count_v2_nodes(program):
+    count = 0
+    stack = [program]
+    while stack:
+        node = stack.pop()
+        count += 1
+        for value in vars(node).values():
+            if isinstance(value, v2.AST):
+                stack.append(value)
+            elif type(value) is list:
+                stack.extend(v for v in value if isinstance(v, v2.AST))
+    return count
+
+
+# name -> (run(source), count(result) giving the number of nodes built, or None)
+frontends = {
+    'Lexer': (
+        lambda source: count_tokens(Lexer(source), TokenType.EOF),
+        None,
+    ),
+    'RegexLexer': (
+        lambda source: count_tokens(RegexLexer(source), TokenType.EOF),
+        None,
+    ),
+    'pratt_parser.Parser': (
+        lambda source: pratt_parser.Parser(Lexer(source)).parse_program(),
+        lambda program: sum(1 for _ in walk(program)),
+    ),
+    'cfg_parser.Parser': (
+        lambda source: cfg_parser.Parser(Lexer(source)).parse_program(),
+        lambda program: sum(1 for _ in walk(program)),
+    ),
+    'v2.Lexer': (
+        lambda source: count_tokens(v2.Lexer(source), v2.TokenType.EOF),
+        None,
+    ),
+    # v2's let_statement() returns None, so its trees leave out let statements
+    'v2.Parser': (
+        lambda source: v2.Parser(v2.Lexer(source)).parse(),
+        count_v2_nodes,
+    ),
+}
+
+
+def measure(run, source, min_time):
+    best = None
+    total = 0.0
+    runs = 0
+    while runs < MAX_RUNS and (runs == 0 or total < min_time):
+        start = time.perf_counter()
+        result = run(source)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        total += elapsed
+        runs += 1
+    return best, runs, result
+
+
+def benchmark(sizes, names, generator_args, min_time):
+    results = []
+    for size in sizes:
+        source = ProgramGenerator(**generator_args).program(size)
+        tokens = count_tokens(RegexLexer(source), TokenType.EOF)
+        v2_tokens = None
+
+        for name in names:
+            run, count = frontends[name]
+            seconds, runs, result = measure(run, source, min_time)
+            nodes = count(result) if count is not None else None
+            if name.startswith('v2'):
+                if v2_tokens is None:
+                    v2_tokens = count_tokens(v2.Lexer(source), v2.TokenType.EOF)
+                token_count = v2_tokens
+            else:
+                token_count = tokens
+
+            results.append({
+                'frontend': name,
+                'size': size,
+                'bytes': len(source.encode('utf-8')),
+                'runs': runs,
+                'seconds': seconds,
+                'tokens': token_count,
+                'nodes': nodes,
+                'tokens_per_second': token_count / seconds,
+                'nodes_per_second': None if nodes is None else nodes / seconds,
+            })
+            print_row(results[-1])
+            del result
+    return results
+
+
+def print_row(row, baseline=None):
+    line = f'{row["frontend"]:22} {row["size"]:>11,} {row["seconds"]:10.4f}s {row["tokens_per_second"]:14,.0f} tok/s'
+    if row['nodes_per_second'] is not None:
+        line += f' {row["nodes_per_second"]:14,.0f} nodes/s'
+    if baseline is not None:
+        line += f'  x{row["tokens_per_second"] / baseline["tokens_per_second"]:.2f}'
+    print(line)
+
+
+def compare(results, path):
+    with open(path) as f:
+        before = {(r['frontend'], r['size']): r for r in json.load(f)['results']}
+    print(f'\nagainst {path} (x = tokens/s now / before)')
+    for row in results:
+        baseline = before.get((row['frontend'], row['size']))
+        if baseline is not None:
+            print_row(row, baseline)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lexer and parser throughput.')
+    parser.add_argument('--sizes', nargs='+', default=SIZES, help='input sizes, e.g. 1K 10M (default: %(default)s)')
+    parser.add_argument('--frontends', nargs='+', default=list(frontends), choices=list(frontends))
+    parser.add_argument('--min-time', type=float, default=1.0, help='seconds to repeat each run for')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--depth', type=int, default=2)
+    parser.add_argument('--breadth', type=int, default=4)
+    parser.add_argument('--function-density', type=float, default=0.1)
+    parser.add_argument('--expression-length', type=int, default=3)
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--compare', help='JSON results of an earlier run to compare with')
+    args = parser.parse_args()
+
+    generator_args = {
+        'seed': args.seed,
+        'depth': args.depth,
+        'breadth': args.breadth,
+        'function_density': args.function_density,
+        'expression_length': args.expression_length,
+    }
+    sizes = [parse_size(s) for s in args.sizes]
+
+    print(f'Python {sys.version.split()[0]} on {platform.platform()}')
+    results = benchmark(sizes, args.frontends, generator_args, args.min_time)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'time': datetime.datetime.now().isoformat(timespec='seconds'),
+                'python': sys.version,
+                'implementation': platform.python_implementation(),
+                'platform': platform.platform(),
+                'generator': generator_args,
+                'results': results,
+            }, f, indent=2)
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Seeded random Monkey programs for the benchmarks.
+
+Every program is accepted without errors by the lexers and parsers in
+monkey.lexer, monkey.parser and monkey.v2: statements always end in ';',
+blocks are never empty and only names are called.
+
+    python -m benchmarks.generator --size 10000 --seed 1
+"""
+import argparse
+import random
+
+NAMES = ('a', 'b', 'c', 'x', 'y', 'count', 'total', 'value', 'next_item', 'acc')
+INFIX_OPERATORS = ('+', '-', '*', '/', '<', '>', '==', '!=')
+
+
+class ProgramGenerator:
+    """
+    depth:             how deeply blocks (fn bodies and if branches) nest
+    breadth:           at most this many statements per block
+    function_density:  chance that a statement or operand is a fn literal
+    expression_length: at most this many operands per infix chain
+
+    A statement grows about as (breadth * expression_length) ** depth, so
+    keep depth small when the others are large.
+    """
+    def __init__(self, seed=0, depth=2, breadth=4, function_density=0.1, expression_length=3):
+        self.random = random.Random(seed)
+        self.depth = depth
+        self.breadth = breadth
+        self.function_density = function_density
+        self.expression_length = expression_length
+
+    def program(self, size):
+        """
+        Return a program of at least size characters, one top-level
+        statement per line.
+        """
+        lines = []
+        length = 0
+        while length < size:
+            line = self.statement(0, top_level=True)
+            lines.append(line)
+            length += len(line) + 1
+        return '\n'.join(lines) + '\n'
+
+    def statement(self, depth, top_level=False):
+        r = self.random.random()
+        if r < self.function_density and depth < self.depth:
+            return f'let {self.name()} = {self.function(depth)};'
+        elif r < 0.45:
+            return f'let {self.name()} = {self.expression(depth)};'
+        elif r < 0.6 and not top_level:
+            return f'return {self.expression(depth)};'
+        else:
+            return f'{self.expression(depth)};'
+
+    def block(self, depth):
+        count = self.random.randint(1, self.breadth)
+        return '{ ' + ' '.join(self.statement(depth + 1) for _ in range(count)) + ' }'
+
+    def function(self, depth):
+        parameters = self.random.sample(NAMES, self.random.randint(0, 3))
+        return f'fn({", ".join(parameters)}) {self.block(depth)}'
+
+    def expression(self, depth):
+        parts = [self.operand(depth)]
+        for _ in range(self.random.randint(0, self.expression_length - 1)):
+            parts.append(self.random.choice(INFIX_OPERATORS))
+            parts.append(self.operand(depth))
+        return ' '.join(parts)
+
+    def operand(self, depth):
+        r = self.random.random()
+        nested = depth < self.depth
+
+        if r < self.function_density and nested:
+            return self.function(depth)
+        elif r < 0.3:
+            return str(self.random.randint(0, 100000))
+        elif r < 0.55:
+            return self.name()
+        elif r < 0.6:
+            return self.random.choice(('true', 'false', 'null'))
+        elif r < 0.7:
+            return self.random.choice(('-', '!')) + self.operand(depth)
+        elif r < 0.8 and nested:
+            return '(' + self.expression(depth + 1) + ')'
+        elif r < 0.9:
+            count = self.random.randint(0, 3)
+            arguments = ', '.join(self.expression(depth + 1) for _ in range(count)) if nested else ''
+            return f'{self.name()}({arguments})'
+        elif nested:
+            condition = self.expression(depth + 1)
+            out = f'if ({condition}) {self.block(depth)}'
+            if self.random.random() < 0.5:
+                out += f' else {self.block(depth)}'
+            return out
+        else:
+            return self.name()
+
+    def name(self):
+        return self.random.choice(NAMES)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Print a random Monkey program.')
+    parser.add_argument('--size', type=int, default=1000, help='minimum length in characters')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--depth', type=int, default=2)
+    parser.add_argument('--breadth', type=int, default=4)
+    parser.add_argument('--function-density', type=float, default=0.1)
+    parser.add_argument('--expression-length', type=int, default=3)
+    args = parser.parse_args()
+
+    generator = ProgramGenerator(args.seed, args.depth, args.breadth, args.function_density, args.expression_length)
+    print(generator.program(args.size), end='')
+
+
+if __name__ == '__main__':
+    main()
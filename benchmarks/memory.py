@@ -0,0 +1,104 @@
+"""
+Bytes per token, AST node and call frame with the __slots__ classes, next to
+the same objects as plain __dict__ instances (the representation before the
+classes got __slots__).
+
+    python -m benchmarks.memory
+"""
+import gc
+import sys
+import tracemalloc
+
+from monkey.ast.ast import walk
+from monkey.evaluator.evaluator import Evaluator
+from monkey.lexer.lexer import Lexer
+from monkey.object.environment import Environment
+from monkey.object.object import Function, Integer
+from monkey.parser.pratt_parser import Parser
+from monkey.tok.tok import TokenType
+
+SOURCE = """
+let add = fn(a, b) { a + b };
+let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+let result = add(fib(10), -(3 * 4) / 2);
+if (result > 10) { return true; } else { return !false; }
+""" * 200
+
+dict_classes = {}
+
+
+def slot_names(cls):
+    names = []
+    for klass in reversed(cls.__mro__):
+        names.extend(klass.__dict__.get('__slots__', ()))
+    return names
+
+
+def as_slotted(obj):
+    cls = type(obj)
+    copy = cls.__new__(cls)
+    for name in slot_names(cls):
+        setattr(copy, name, getattr(obj, name))
+    return copy
+
+
+def as_dict_based(obj):
+    cls = type(obj)
+    plain = dict_classes.get(cls)
+    if plain is None:
+        plain = dict_classes[cls] = type(cls.__name__, (), {})
+    copy = plain()
+    for name in slot_names(cls):
+        setattr(copy, name, getattr(obj, name))
+    return copy
+
+
+def bytes_per_object(objects, copy):
+    # copies share every referenced value with the originals, so only the
+    # objects themselves (and a frame's own store dict) are measured
+    gc.collect()
+    tracemalloc.start()
+    copies = []
+    for obj in objects:
+        c = copy(obj)
+        if type(obj) is Environment:
+            c.store = dict(obj.store)
+        copies.append(c)
+    size = tracemalloc.get_traced_memory()[0] - sys.getsizeof(copies)
+    tracemalloc.stop()
+    return size / len(objects)
+
+
+def tokens():
+    lexer = Lexer(SOURCE)
+    result = []
+    token = lexer.next_token()
+    while token.type != TokenType.EOF:
+        result.append(token)
+        token = lexer.next_token()
+    return result
+
+
+def nodes():
+    return list(walk(Parser(Lexer(SOURCE)).parse_program()))
+
+
+def frames():
+    # the environment apply_function() builds for a two argument call
+    function = Parser(Lexer("fn(a, b) { a + b }")).parse_program().statements[0].expression
+    fn = Function(parameters=function.parameters, body=function.body, env=Environment())
+    evaluator = Evaluator()
+    return [evaluator.extend_function_env(fn, [Integer(1), Integer(2)]) for _ in range(5000)]
+
+
+def main():
+    print(f'Python {sys.version.split()[0]}')
+    print(f'{"":8} {"__dict__":>10} {"__slots__":>10}')
+    for name, objects in (('token', tokens()), ('node', nodes()), ('frame', frames())):
+        before = bytes_per_object(objects, as_dict_based)
+        after = bytes_per_object(objects, as_slotted)
+        print(f'{name:8} {before:10.1f} {after:10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,24 +1,41 @@
 class Node:
+    # start/end: source span, set by the parsers (see monkey.tok.position for line/column)
+    # structural_hash: set once the node is shared through a monkey.ast.intern.Interner
+    __slots__ = ('start', 'end', 'structural_hash')
+
+    # attributes holding a child node or a list of child nodes
+    child_fields = ()
+
     def token_literal(self):
         pass
 
     def string(self):
-        pass
+        return printer.to_string(self)
 
 
 class Statement(Node):
+    __slots__ = ()
+
     def statement_node(self):
         pass
 
 
 class Expression(Node):
+    __slots__ = ()
+
     def expression_node(self):
         pass
 
 
 class Program(Statement):
+    __slots__ = ('statements',)
+    child_fields = ('statements',)
+
     def __init__(self):
         self.statements = []
+        self.start = None
+        self.end = None
+        self.structural_hash = None
 
     def token_literal(self):
         if len(self.statements) > 0:
@@ -26,20 +43,18 @@ class Program(Statement):
         else:
             return ""
 
-    def string(self):
-        out = ""
-
-        for s in self.statements:
-            out += s.string()
-
-        return out
-
 
 class LetStatement(Statement):
+    __slots__ = ('token', 'name', 'value')
+    child_fields = ('name', 'value')
+
     def __init__(self, token, name=None, value=None):
         self.token = token
         self.name = name
         self.value = value
+        self.start = None
+        self.end = None
+        self.structural_hash = None
 
     def token_literal(self):
         return self.token.literal
@@ -47,22 +62,16 @@ class LetStatement(Statement):
     def statement_node(self):
         pass
 
-    def string(self):
-        out = self.token_literal() + " "
-        out += self.name.string()
-        out += " = "
-
-        if self.value is not None:
-            out += self.value.string()
-
-        out += ";"
-        return out
-
 
 class Identifier(Expression):
+    __slots__ = ('token', 'value')
+
     def __init__(self, token, value):
         self.token = token
         self.value = value
+        self.start = None
+        self.end = None
+        self.structural_hash = None
 
     def expression_node(self):
         pass
@@ -70,14 +79,16 @@ class Identifier(Expression):
     def token_literal(self):
         return self.token.literal
 
-    def string(self):
-        return self.value
-
 
 class NullLiteral(Expression):
+    __slots__ = ('token', 'value')
+
     def __init__(self, token):
         self.token = token
         self.value = None
+        self.start = None
+        self.end = None
+        self.structural_hash = None
 
     def expression_node(self):
         pass
@@ -85,14 +96,17 @@ class NullLiteral(Expression):
     def token_literal(self):
         return self.token.literal
 
-    def string(self):
-        return self.token.literal
-
 
 class ReturnStatement(Statement):
+    __slots__ = ('token', 'return_value')
+    child_fields = ('return_value',)
+
     def __init__(self, token, return_value=None):
         self.token = token
         self.return_value = return_value
+        self.start = None
+        self.end = None
+        self.structural_hash = None
 
     def statement_node(self):
         pass
@@ -100,21 +114,17 @@ class ReturnStatement(Statement):
     def token_literal(self):
         return self.token.literal
 
-    def string(self):
-        out = self.token_literal() + " "
-
-        if self.return_value is not None:
-            out += self.return_value.string()
-
-        out += ";"
-
-        return out
-
 
 class ExpressionStatement(Statement):
+    __slots__ = ('token', 'expression')
+    child_fields = ('expression',)
+
     def __init__(self, token, expression=None):
         self.token = token
         self.expression = expression
+        self.start = None
+        self.end = None
+        self.structural_hash = None
 
     def statement_node(self):
         pass
@@ -122,17 +132,18 @@ class ExpressionStatement(Statement):
     def token_literal(self):
         return self.token.literal()
 
-    def string(self):
-        if self.expression is not None:
-            return self.expression.string()
-
-        return ""
-
 
 class IntegerLiteral(Expression):
+    __slots__ = ('token', 'value', 'constant')
+
     def __init__(self, token, value=None):
         self.token = token
         self.value = value
+        # the runtime object for value, made by the evaluator on first use
+        self.constant = None
+        self.start = None
+        self.end = None
+        self.structural_hash = None
 
     def expression_node(self):
         pass
@@ -140,15 +151,18 @@ class IntegerLiteral(Expression):
     def token_literal(self):
         return self.token.literal
 
-    def string(self):
-        return self.token.literal
-
 
 class PrefixExpression(Expression):
+    __slots__ = ('token', 'operator', 'right')
+    child_fields = ('right',)
+
     def __init__(self, token, operator=None, right=None):
         self.token = token
         self.operator = operator
         self.right = right
+        self.start = None
+        self.end = None
+        self.structural_hash = None
 
     def expression_node(self):
         pass
@@ -156,21 +170,19 @@ class PrefixExpression(Expression):
     def token_literal(self):
         return self.token.literal
 
-    def string(self):
-        out = "("
-        out += self.operator
-        out += self.right.string()
-        out += ")"
-
-        return out
-
 
 class InfixExpression(Expression):
+    __slots__ = ('token', 'left', 'operator', 'right')
+    child_fields = ('left', 'right')
+
     def __init__(self, token, left=None, operator=None, right=None):
         self.token = token
         self.left = left
         self.operator = operator
         self.right = right
+        self.start = None
+        self.end = None
+        self.structural_hash = None
 
     def expression_node(self):
         pass
@@ -178,20 +190,16 @@ class InfixExpression(Expression):
     def token_literal(self):
         return self.token.literal
 
-    def string(self):
-        out = "("
-        out += self.left.string()
-        out += " " + self.operator + " "
-        out += self.right.string()
-        out += ")"
-
-        return out
-
 
 class Boolean(Expression):
+    __slots__ = ('token', 'value')
+
     def __init__(self, token, value=None):
         self.token = token
         self.value = value
+        self.start = None
+        self.end = None
+        self.structural_hash = None
 
     def expression_node(self):
         pass
@@ -199,16 +207,19 @@ class Boolean(Expression):
     def token_literal(self):
         return self.token.literal
 
-    def string(self):
-        return self.token.literal
-
 
 class IfExpression(Expression):
+    __slots__ = ('token', 'condition', 'consequence', 'alternative')
+    child_fields = ('condition', 'consequence', 'alternative')
+
     def __init__(self, token, condition=None, consequence=None, alternative=None):
         self.token = token
         self.condition = condition
         self.consequence = consequence
         self.alternative = alternative
+        self.start = None
+        self.end = None
+        self.structural_hash = None
 
     def expression_node(self):
         pass
@@ -216,23 +227,17 @@ class IfExpression(Expression):
     def token_literal(self):
         return self.token.literal
 
-    def string(self):
-        out = "if"
-        out += self.condition.string()
-        out += " "
-        out += self.consequence.string()
-
-        if self.alternative is not None:
-            out += "else "
-            out += self.alternative.string()
-
-        return out
-
 
 class BlockStatement(Statement):
+    __slots__ = ('token', 'statements')
+    child_fields = ('statements',)
+
     def __init__(self, token):
         self.token = token
         self.statements = []
+        self.start = None
+        self.end = None
+        self.structural_hash = None
 
     def statement_node(self):
         pass
@@ -240,20 +245,22 @@ class BlockStatement(Statement):
     def token_literal(self):
         return self.token.literal
 
-    def string(self):
-        out = ""
-
-        for s in self.statements:
-            out += s.string()
-
-        return out
-
 
 class FunctionLiteral(Expression):
+    __slots__ = ('token', 'parameters', 'body', 'body_loader', 'body_errors')
+    child_fields = ('parameters', 'body')
+
     def __init__(self, token):
         self.token = token
         self.parameters = []
         self.body = None
+        # Parser(lazy_bodies=True) leaves body None and sets body_loader to a
+        # callable returning (body, errors), see load_body()
+        self.body_loader = None
+        self.body_errors = ()
+        self.start = None
+        self.end = None
+        self.structural_hash = None
 
     def expression_node(self):
         pass
@@ -261,25 +268,27 @@ class FunctionLiteral(Expression):
     def token_literal(self):
         return self.token.literal
 
-    def string(self):
-        out = ""
-        params = []
-        for p in self.parameters:
-            params.append(p.string())
-
-        out += self.token_literal()
-        out += "("
-        out += ", ".join(params) + ") "
-        out += self.body.string()
-
-        return out
+    def load_body(self):
+        """
+        Parse a skipped body on first use and keep it, returns the errors found in it.
+        """
+        if self.body_loader is not None:
+            self.body, self.body_errors = self.body_loader()
+            self.body_loader = None
+        return self.body_errors
 
 
 class CallExpression(Expression):
+    __slots__ = ('token', 'function', 'arguments')
+    child_fields = ('function', 'arguments')
+
     def __init__(self, token):
         self.token = token
         self.function = None
         self.arguments = []
+        self.start = None
+        self.end = None
+        self.structural_hash = None
 
     def expression_node(self):
         pass
@@ -287,16 +296,30 @@ class CallExpression(Expression):
     def token_literal(self):
         return self.token.literal
 
-    def string(self):
-        out = ""
-
-        args = []
-        for a in self.arguments:
-            args.append(a.string())
-
-        out += self.function.string()
-        out += "("
-        out += ", ".join(args)
-        out += ")"
 
-        return out
+def iter_child_nodes(node):
+    for field in node.child_fields:
+        child = getattr(node, field)
+        if type(child) is list or type(child) is tuple:
+            for c in child:
+                if c is not None:
+                    yield c
+        elif child is not None:
+            yield child
+
+
+def walk(node):
+    """
+    Depth-first, pre-order walk that does not recurse, so it is safe on very deep trees.
+    """
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        children = list(iter_child_nodes(node))
+        children.reverse()
+        stack.extend(children)
+
+
+# at the end, as the printer imports the classes above
+from monkey.ast import printer  # noqa: E402
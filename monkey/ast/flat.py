@@ -0,0 +1,365 @@
+import struct
+import sys
+from array import array
+
+from monkey.ast.ast import (
+    Program,
+    LetStatement,
+    Identifier,
+    NullLiteral,
+    ReturnStatement,
+    ExpressionStatement,
+    IntegerLiteral,
+    PrefixExpression,
+    InfixExpression,
+    Boolean,
+    IfExpression,
+    BlockStatement,
+    FunctionLiteral,
+    CallExpression,
+)
+from monkey.tok.tok import Token, token_kinds, kind_of
+
+# Node kinds, the row of the root Program is always 0
+PROGRAM = 0
+LET = 1
+IDENTIFIER = 2
+NULL = 3
+RETURN = 4
+EXPRESSION = 5
+INTEGER = 6
+PREFIX = 7
+INFIX = 8
+BOOLEAN = 9
+IF = 10
+BLOCK = 11
+FUNCTION = 12
+CALL = 13
+
+node_classes = [
+    Program,
+    LetStatement,
+    Identifier,
+    NullLiteral,
+    ReturnStatement,
+    ExpressionStatement,
+    IntegerLiteral,
+    PrefixExpression,
+    InfixExpression,
+    Boolean,
+    IfExpression,
+    BlockStatement,
+    FunctionLiteral,
+    CallExpression,
+]
+kind_of_class = {cls: kind for kind, cls in enumerate(node_classes)}
+
+NONE = -1  # a missing child, list, string, span or token
+
+MAGIC = b'MKFLAT'
+VERSION = 1
+# magic, version, byte order, rows, lists length, strings count, strings bytes
+header = struct.Struct('<6sBBIIII')
+
+# name and typecode of every column, in serialization order
+columns = (
+    ('kinds', 'b'),
+    ('token_kinds', 'b'),
+    ('token_literals', 'i'),
+    ('token_starts', 'i'),
+    ('token_ends', 'i'),
+    ('starts', 'i'),
+    ('ends', 'i'),
+    ('a', 'i'),
+    ('b', 'i'),
+    ('c', 'i'),
+)
+
+
+class FlatProgram:
+    """
+    A Program as parallel arrays, one row per node. What a, b and c hold
+    depends on the kind of the row:
+
+        PROGRAM     a: statements list
+        LET         a: name, b: value
+        IDENTIFIER  a: value string
+        RETURN      a: return_value
+        EXPRESSION  a: expression
+        INTEGER     a: value string
+        PREFIX      a: operator string, b: right
+        INFIX       a: left, b: operator string, c: right
+        BOOLEAN     a: 1, 0 or NONE for the cfg parser's null
+        IF          a: condition, b: consequence, c: alternative
+        BLOCK       a: statements list
+        FUNCTION    a: parameters list, b: body
+        CALL        a: function, b: arguments list
+
+    Children are row numbers, strings index self.strings and a list is an
+    offset into self.lists where the item count is followed by the items.
+    """
+    __slots__ = tuple(name for name, _ in columns) + ('lists', 'strings')
+
+    def __init__(self):
+        for name, typecode in columns:
+            setattr(self, name, array(typecode))
+        self.lists = array('i')
+        self.strings = []
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __reduce__(self):
+        return from_bytes, (self.to_bytes(),)
+
+    def to_bytes(self):
+        """
+        Serialize into one buffer: a header, every column's raw machine
+        values and the strings as UTF-8 with their end offsets.
+        """
+        blobs = [s.encode('utf-8') for s in self.strings]
+        string_ends = array('I')
+        total = 0
+        for blob in blobs:
+            total += len(blob)
+            string_ends.append(total)
+
+        parts = [getattr(self, name) for name, _ in columns] + [self.lists, string_ends]
+        size = header.size + sum(len(part) * part.itemsize for part in parts) + total
+
+        out = bytearray(size)
+        header.pack_into(
+            out, 0, MAGIC, VERSION, sys.byteorder == 'little',
+            len(self.kinds), len(self.lists), len(blobs), total,
+        )
+        offset = header.size
+        for part in parts:
+            n = len(part) * part.itemsize
+            out[offset:offset + n] = memoryview(part).cast('B')
+            offset += n
+        out[offset:] = b''.join(blobs)
+        return bytes(out)
+
+
+def from_bytes(data):
+    magic, version, little, rows, lists, count, total = header.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('not a flat program, or written by another version')
+
+    flat = FlatProgram()
+    view = memoryview(data)
+    offset = header.size
+
+    def read(typecode, n):
+        nonlocal offset
+        part = array(typecode)
+        size = n * part.itemsize
+        part.frombytes(view[offset:offset + size])
+        offset += size
+        if little != (sys.byteorder == 'little'):
+            part.byteswap()
+        return part
+
+    for name, typecode in columns:
+        setattr(flat, name, read(typecode, rows))
+    flat.lists = read('i', lists)
+
+    string_ends = read('I', count)
+    blob = bytes(view[offset:offset + total])
+    start = 0
+    for end in string_ends:
+        flat.strings.append(blob[start:end].decode('utf-8'))
+        start = end
+
+    return flat
+
+
+def flatten(program):
+    """
+    Encode a tree of monkey.ast.ast nodes. Walks without recursion, forces
+    lazily parsed fn bodies and keeps nodes shared by several parents shared.
+    """
+    flat = FlatProgram()
+    kinds = flat.kinds
+    lists = flat.lists
+    string_index = {}
+    rows = {}  # id(node) -> row
+    nodes = []
+
+    def string(value):
+        if value is None:
+            return NONE
+        i = string_index.get(value)
+        if i is None:
+            i = string_index[value] = len(flat.strings)
+            flat.strings.append(value)
+        return i
+
+    def row(node):
+        if node is None:
+            return NONE
+        i = rows.get(id(node))
+        if i is None:
+            i = rows[id(node)] = len(nodes)
+            nodes.append(node)
+            kinds.append(kind_of_class[type(node)])
+        return i
+
+    def node_list(items):
+        if items is None:
+            return NONE
+        offset = len(lists)
+        lists.append(len(items))
+        for item in items:
+            lists.append(row(item))
+        return offset
+
+    def span(value):
+        return NONE if value is None else value
+
+    row(program)
+    i = 0
+    while i < len(nodes):
+        node = nodes[i]
+        kind = kinds[i]
+        a = b = c = NONE
+
+        token = getattr(node, 'token', None)
+        if token is None:
+            flat.token_kinds.append(NONE)
+            flat.token_literals.append(NONE)
+            flat.token_starts.append(NONE)
+            flat.token_ends.append(NONE)
+        else:
+            flat.token_kinds.append(kind_of[token.type])
+            flat.token_literals.append(string(token.literal))
+            flat.token_starts.append(span(token.start))
+            flat.token_ends.append(span(token.end))
+
+        flat.starts.append(span(node.start))
+        flat.ends.append(span(node.end))
+
+        if kind == PROGRAM or kind == BLOCK:
+            a = node_list(node.statements)
+        elif kind == LET:
+            a = row(node.name)
+            b = row(node.value)
+        elif kind == IDENTIFIER:
+            a = string(node.value)
+        elif kind == RETURN:
+            a = row(node.return_value)
+        elif kind == EXPRESSION:
+            a = row(node.expression)
+        elif kind == INTEGER:
+            a = string(None if node.value is None else str(node.value))
+        elif kind == PREFIX:
+            a = string(node.operator)
+            b = row(node.right)
+        elif kind == INFIX:
+            a = row(node.left)
+            b = string(node.operator)
+            c = row(node.right)
+        elif kind == BOOLEAN:
+            a = NONE if node.value is None else int(node.value)
+        elif kind == IF:
+            a = row(node.condition)
+            b = row(node.consequence)
+            c = row(node.alternative)
+        elif kind == FUNCTION:
+            node.load_body()
+            a = node_list(node.parameters)
+            b = row(node.body)
+        elif kind == CALL:
+            a = row(node.function)
+            b = node_list(node.arguments)
+
+        flat.a.append(a)
+        flat.b.append(b)
+        flat.c.append(c)
+        i += 1
+
+    return flat
+
+
+def unflatten(flat, row=0):
+    """
+    Rebuild the monkey.ast.ast tree of a FlatProgram, or its subtree at row.
+    """
+    strings = flat.strings
+    lists = flat.lists
+
+    def string(i):
+        return None if i == NONE else strings[i]
+
+    def span(value):
+        return None if value == NONE else value
+
+    nodes = []
+    for i, kind in enumerate(flat.kinds):
+        token = None
+        if flat.token_kinds[i] != NONE:
+            token = Token(
+                token_kinds[flat.token_kinds[i]],
+                string(flat.token_literals[i]),
+                span(flat.token_starts[i]),
+                span(flat.token_ends[i]),
+            )
+
+        if kind == PROGRAM:
+            node = Program()
+        elif kind == IDENTIFIER:
+            node = Identifier(token=token, value=string(flat.a[i]))
+        else:
+            node = node_classes[kind](token)
+
+        node.start = span(flat.starts[i])
+        node.end = span(flat.ends[i])
+        nodes.append(node)
+
+    def child(i):
+        return None if i == NONE else nodes[i]
+
+    def node_list(offset):
+        if offset == NONE:
+            return None
+        count = lists[offset]
+        return [child(i) for i in lists[offset + 1:offset + 1 + count]]
+
+    for i, node in enumerate(nodes):
+        kind = flat.kinds[i]
+        a = flat.a[i]
+        b = flat.b[i]
+        c = flat.c[i]
+
+        if kind == PROGRAM or kind == BLOCK:
+            node.statements = node_list(a)
+        elif kind == LET:
+            node.name = child(a)
+            node.value = child(b)
+        elif kind == RETURN:
+            node.return_value = child(a)
+        elif kind == EXPRESSION:
+            node.expression = child(a)
+        elif kind == INTEGER:
+            node.value = None if a == NONE else int(strings[a])
+        elif kind == PREFIX:
+            node.operator = string(a)
+            node.right = child(b)
+        elif kind == INFIX:
+            node.left = child(a)
+            node.operator = string(b)
+            node.right = child(c)
+        elif kind == BOOLEAN:
+            node.value = None if a == NONE else bool(a)
+        elif kind == IF:
+            node.condition = child(a)
+            node.consequence = child(b)
+            node.alternative = child(c)
+        elif kind == FUNCTION:
+            node.parameters = node_list(a)
+            node.body = child(b)
+        elif kind == CALL:
+            node.function = child(a)
+            node.arguments = node_list(b)
+
+    return child(row)
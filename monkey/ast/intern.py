@@ -0,0 +1,68 @@
+from monkey.ast.ast import Program, FunctionLiteral
+
+# attributes that are plain values rather than child nodes
+value_fields = ('value', 'operator')
+
+
+class Interner:
+    """
+    Hash-consing table for AST nodes. intern() returns the one shared node
+    for every structurally identical subtree, so equal subtrees compare with
+    `is` and carry the same precomputed structural_hash.
+
+    The parsers call it on each node once the node and its children are
+    complete (see Parser(lexer, interner=...)). A shared node keeps the
+    spans and token of its first occurrence, node lists become tuples, and
+    shared nodes must not be changed afterwards.
+    """
+    def __init__(self):
+        self.table = {}
+        self.hits = 0
+
+    def __len__(self):
+        return len(self.table)
+
+    def intern(self, node):
+        if node is None or node.structural_hash is not None or type(node) is Program:
+            return node
+        if type(node) is FunctionLiteral and node.body_loader is not None:
+            return node  # the body is not known yet
+
+        token = node.token
+        key = [type(node), token.type, token.literal]
+        hashed = [type(node).__name__, token.type.value, token.literal]
+
+        for field in value_fields:
+            value = getattr(node, field, None)
+            key.append(value)
+            hashed.append(value)
+
+        for field in node.child_fields:
+            child = getattr(node, field)
+            if type(child) is list or type(child) is tuple:
+                child = tuple(child)
+                for c in child:
+                    if c is not None and c.structural_hash is None:
+                        return node  # only whole shared subtrees are shared
+                setattr(node, field, child)
+                key.append(tuple(id(c) for c in child))
+                hashed.append(tuple(None if c is None else c.structural_hash for c in child))
+            elif child is None:
+                key.append(None)
+                hashed.append(None)
+            elif child.structural_hash is None:
+                return node
+            else:
+                # children are shared already, so their identity stands for their structure
+                key.append(id(child))
+                hashed.append(child.structural_hash)
+
+        key = tuple(key)
+        shared = self.table.get(key)
+        if shared is not None:
+            self.hits += 1
+            return shared
+
+        node.structural_hash = hash(tuple(hashed))
+        self.table[key] = node
+        return node
@@ -0,0 +1,272 @@
+import io
+
+from monkey.ast.ast import (
+    Program,
+    LetStatement,
+    Identifier,
+    NullLiteral,
+    ReturnStatement,
+    ExpressionStatement,
+    IntegerLiteral,
+    PrefixExpression,
+    InfixExpression,
+    Boolean,
+    IfExpression,
+    BlockStatement,
+    FunctionLiteral,
+    CallExpression,
+)
+
+# markers on the printer's stack, next to the strings and nodes
+NEWLINE = object()
+DEDENT = object()
+
+# pieces gathered before they are handed to the sink in one write(),
+# checked at each statement
+CHUNK = 4096
+
+
+class Printer:
+    """
+    Writes nodes to a file-like sink in one pass, without recursion and
+    without building a string per node, so the time is linear in the size
+    of the output.
+
+    With indent=None the text is exactly what Node.string() has always
+    returned. With an indent (a number of spaces or a string) every
+    statement gets its own line, blocks get braces and their statements
+    are indented, and expression statements end in ';'.
+    """
+    def __init__(self, sink, indent=None):
+        self.sink = sink
+        if type(indent) is int:
+            indent = ' ' * indent
+        self.indent = indent
+
+    def write(self, node, depth=0):
+        pretty = self.indent is not None
+        buf = []
+        out = buf.append
+        stack = [node]
+        pop = stack.pop
+        push = stack.append
+        extend = stack.extend
+
+        # the first child of a node is printed next, so it is not pushed
+        # but taken up at once by the inner loop
+        while stack:
+            node = pop()
+
+            while node is not None:
+                cls = type(node)
+
+                if cls is str:
+                    out(node)
+                    break
+
+                elif cls is Identifier:
+                    out(node.value)
+                    break
+
+                elif cls is IntegerLiteral or cls is Boolean or cls is NullLiteral:
+                    out(node.token.literal)
+                    break
+
+                elif cls is InfixExpression:
+                    out("(")
+                    extend((")", node.right, " " + node.operator + " "))
+                    node = node.left
+
+                elif cls is ExpressionStatement:
+                    if len(buf) >= CHUNK:
+                        self.sink.write(''.join(buf))
+                        buf.clear()
+                    if pretty:
+                        push(";")
+                    node = node.expression
+
+                elif cls is CallExpression:
+                    push(")")
+                    self.push_separated(stack, node.arguments)
+                    push("(")
+                    node = node.function
+
+                elif cls is PrefixExpression:
+                    out("(" + node.operator)
+                    push(")")
+                    node = node.right
+
+                elif cls is LetStatement:
+                    if len(buf) >= CHUNK:
+                        self.sink.write(''.join(buf))
+                        buf.clear()
+                    out(node.token.literal + " ")
+                    extend((";", node.value, " = "))
+                    node = node.name
+
+                elif cls is ReturnStatement:
+                    if len(buf) >= CHUNK:
+                        self.sink.write(''.join(buf))
+                        buf.clear()
+                    out(node.token.literal + " ")
+                    push(";")
+                    node = node.return_value
+
+                elif cls is BlockStatement or cls is Program:
+                    if not pretty:
+                        extend(reversed(node.statements))
+                    elif cls is Program:
+                        for s in reversed(node.statements):
+                            extend(("\n", s))
+                    elif not node.statements:
+                        out("{}")
+                    else:
+                        out("{")
+                        depth += 1
+                        extend(("}", NEWLINE, DEDENT))
+                        for s in reversed(node.statements):
+                            extend((s, NEWLINE))
+                    break
+
+                elif cls is IfExpression:
+                    if node.alternative is not None:
+                        extend((node.alternative, " else " if pretty else "else "))
+                    if pretty:
+                        out("if (")
+                        extend((node.consequence, ") "))
+                    else:
+                        out("if")
+                        extend((node.consequence, " "))
+                    node = node.condition
+
+                elif cls is FunctionLiteral:
+                    node.load_body()
+                    out(node.token.literal + "(")
+                    extend((node.body, ") "))
+                    self.push_separated(stack, node.parameters)
+                    break
+
+                elif node is NEWLINE:
+                    out("\n" + self.indent * depth)
+                    break
+
+                else:  # DEDENT
+                    depth -= 1
+                    break
+
+            # a None node, what is left of a parse error, prints as nothing
+
+        if buf:
+            self.sink.write(''.join(buf))
+
+    def push_separated(self, stack, nodes):
+        if nodes:
+            stack.append(nodes[-1])
+            for n in reversed(nodes[:-1]):
+                stack.append(", ")
+                stack.append(n)
+
+
+# Without an indent, to_string() first tries plain recursion: one function
+# per node class, each building its text in one f-string and looking up
+# the functions of its children in texts. That is quicker than Printer, and
+# only a tree deeper than the recursion limit has to go through Printer.
+
+def identifier_text(node):
+    return node.value
+
+
+def literal_text(node):
+    return node.token.literal
+
+
+def infix_text(node):
+    left = node.left
+    right = node.right
+    return f"({texts[type(left)](left)} {node.operator} {texts[type(right)](right)})"
+
+
+def prefix_text(node):
+    right = node.right
+    return f"({node.operator}{texts[type(right)](right)})"
+
+
+def expression_statement_text(node):
+    expression = node.expression
+    return texts[type(expression)](expression)
+
+
+def call_text(node):
+    function = node.function
+    arguments = ", ".join([texts[type(a)](a) for a in node.arguments or ()])
+    return f"{texts[type(function)](function)}({arguments})"
+
+
+def let_text(node):
+    name = node.name
+    value = node.value
+    return f"{node.token.literal} {texts[type(name)](name)} = {texts[type(value)](value)};"
+
+
+def return_text(node):
+    value = node.return_value
+    return f"{node.token.literal} {texts[type(value)](value)};"
+
+
+def statements_text(node):
+    return "".join([texts[type(s)](s) for s in node.statements])
+
+
+def if_text(node):
+    condition = node.condition
+    consequence = node.consequence
+    alternative = node.alternative
+    out = f"if{texts[type(condition)](condition)} {texts[type(consequence)](consequence)}"
+    if alternative is not None:
+        out += "else " + texts[type(alternative)](alternative)
+    return out
+
+
+def function_text(node):
+    node.load_body()
+    body = node.body
+    parameters = ", ".join([texts[type(p)](p) for p in node.parameters or ()])
+    return f"{node.token.literal}({parameters}) {texts[type(body)](body)}"
+
+
+def missing_text(node):
+    return ""
+
+
+texts = {
+    Program: statements_text,
+    LetStatement: let_text,
+    Identifier: identifier_text,
+    NullLiteral: literal_text,
+    ReturnStatement: return_text,
+    ExpressionStatement: expression_statement_text,
+    IntegerLiteral: literal_text,
+    PrefixExpression: prefix_text,
+    InfixExpression: infix_text,
+    Boolean: literal_text,
+    IfExpression: if_text,
+    BlockStatement: statements_text,
+    FunctionLiteral: function_text,
+    CallExpression: call_text,
+    type(None): missing_text,
+}
+
+
+def dump(node, sink, indent=None):
+    Printer(sink, indent).write(node)
+
+
+def to_string(node, indent=None):
+    if indent is None:
+        try:
+            return texts[type(node)](node)
+        except RecursionError:
+            pass
+    out = io.StringIO()
+    Printer(out, indent).write(node)
+    return out.getvalue()
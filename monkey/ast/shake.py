@@ -0,0 +1,103 @@
+"""
+Tree shaking: drop the top-level `let` bindings a program never uses.
+
+A binding can go when evaluating its value has no effect besides the
+binding itself (a fn, integer, boolean or null literal) and its name is not
+reachable. Reachable are the exported names and every name used by a
+statement that stays, transitively through the bodies of the fns bound to
+reachable names. Names are matched as names, so every top-level binding
+of a used name stays; only fn parameters shadow them.
+
+The last statement always stays, since it gives the program its value.
+fn bodies of dropped bindings are never looked at, so with
+Parser(lazy_bodies=True) they are not even parsed.
+"""
+from monkey.ast.ast import (
+    Program,
+    LetStatement,
+    Identifier,
+    IntegerLiteral,
+    Boolean,
+    NullLiteral,
+    FunctionLiteral,
+    iter_child_nodes,
+)
+
+# values whose evaluation cannot fail or do anything else
+pure_values = (FunctionLiteral, IntegerLiteral, Boolean, NullLiteral)
+
+
+def free_names(node):
+    """
+    The names node uses that are not parameters of a fn inside it.
+    """
+    names = set()
+    stack = [(node, frozenset())]
+
+    while stack:
+        node, bound = stack.pop()
+        cls = type(node)
+
+        if cls is Identifier:
+            if node.value not in bound:
+                names.add(node.value)
+        elif cls is FunctionLiteral:
+            node.load_body()
+            parameters = bound.union(p.value for p in node.parameters or () if p is not None)
+            if node.body is not None:
+                stack.append((node.body, parameters))
+        elif node is not None:
+            for child in iter_child_nodes(node):
+                stack.append((child, bound))
+
+    return names
+
+
+def shake(program, exports=()):
+    """
+    Return (program, report): a Program without the unused top-level
+    bindings (program itself when nothing could go) and a dict with the
+    number of statements before and after ('statements', 'kept'), the
+    names of the dropped bindings ('removed') and the length of source
+    they spanned ('removed_source').
+    """
+    statements = program.statements
+    last = len(statements) - 1
+    bindings = {}  # name -> indices of the droppable bindings of it
+    live = set(exports)
+
+    for i, statement in enumerate(statements):
+        if (type(statement) is LetStatement and i != last and statement.name is not None
+                and type(statement.value) in pure_values):
+            bindings.setdefault(statement.name.value, []).append(i)
+        elif statement is not None:
+            live |= free_names(statement)
+
+    pending = list(live)
+    while pending:
+        name = pending.pop()
+        for i in bindings.pop(name, ()):
+            for used in free_names(statements[i].value):
+                if used not in live:
+                    live.add(used)
+                    pending.append(used)
+
+    dropped = [i for indices in bindings.values() for i in indices]
+    report = {
+        'statements': len(statements),
+        'kept': len(statements) - len(dropped),
+        'removed': sorted(bindings),
+        'removed_source': sum(
+            statements[i].end - statements[i].start for i in dropped
+            if statements[i].start is not None and statements[i].end is not None
+        ),
+    }
+    if not dropped:
+        return program, report
+
+    dropped = set(dropped)
+    shaken = Program()
+    shaken.statements = [s for i, s in enumerate(statements) if i not in dropped]
+    shaken.start = program.start
+    shaken.end = program.end
+    return shaken, report
@@ -1,3 +1,5 @@
+import operator
+
 from monkey.ast.ast import (
     Program,
     ExpressionStatement,
@@ -18,10 +20,14 @@ from monkey.object.object import (
     Integer,
     Boolean,
     Null,
-    Type,
+    SmallIntegers,
     ReturnValue,
     Error,
     Function,
+    INTEGER_TAG,
+    RETURN_VALUE_TAG,
+    ERROR_TAG,
+    FUNCTION_TAG,
 )
 
 from monkey.object.environment import new_enclosed_environment
@@ -31,90 +37,93 @@ FALSE = Boolean(value=False)
 NULL = Null()
 
 
+def divide(left, right):
+    # truncates toward zero, through float division as it always has
+    return int(left / right)
+
+
 class Evaluator:
+    # node handlers (handlers) and integer operators (infix_operators) are
+    # looked up in tables built at the end of the class body.
+
+    # shared Integers for small results, None to make a new one every time
+    small_integers = SmallIntegers()
 
     def eval(self, node, env):
-        # Statements
-        if type(node) is Program:
-            return self.eval_program(node, env)
-        # Let Statement
-        elif type(node) is LetStatement:
-            val = self.eval(node.value, env)
-            if self.is_error(val):
-                return val
-            env.set(node.name.value, val)
-        # Identifier
-        elif type(node) is Identifier:
-            return self.eval_identifier(node, env)
-
-        elif type(node) is ExpressionStatement:
-            return self.eval(node.expression, env)
-        # Function Literal
-        elif type(node) is FunctionLiteral:
-            params = node.parameters
-            body = node.body
-            return Function(parameters=params, body=body, env=env)
-        # Function Call
-        elif type(node) is CallExpression:
-            function = self.eval(node.function, env)
-            if self.is_error(function):
-                return function
-            args = self.eval_expressions(node.arguments, env)
-
-            if len(args) == 1 and self.is_error(args[0]):
-                return args[0]
-
-            return self.apply_function(function, args)
-
-        # Expressions
-        elif type(node) is IntegerLiteral:
-            return Integer(value=node.value)
-
-        elif type(node) is BooleanAST:
-            return TRUE if node.value else FALSE
-
-        elif type(node) is NullLiteral:
-            return NULL
+        handler = self.handlers.get(type(node))
+        if handler is None:
+            return None
+        return handler(self, node, env)
+
+    def eval_let_statement(self, node, env):
+        val = self.eval(node.value, env)
+        if self.is_error(val):
+            return val
+        env.set(node.name.value, val)
+
+    def eval_expression_statement(self, node, env):
+        return self.eval(node.expression, env)
+
+    def eval_function_literal(self, node, env):
+        params = node.parameters
+        body = node.body
+        if body is None:
+            return Function(parameters=params, body=body, env=env, literal=node)
+        return Function(parameters=params, body=body, env=env)
+
+    def eval_call_expression(self, node, env):
+        function = self.eval(node.function, env)
+        if self.is_error(function):
+            return function
+        args = self.eval_expressions(node.arguments, env)
+
+        if len(args) == 1 and self.is_error(args[0]):
+            return args[0]
 
-        # Prefix and Infix Expressions
-        elif type(node) is PrefixExpression:
-            right = self.eval(node.right, env)
+        return self.apply_function(function, args)
 
-            if self.is_error(right):
-                return right
+    def eval_integer_literal(self, node, env):
+        constant = node.constant
+        if constant is None:
+            if node.value is None:
+                return Integer(value=None)
+            constant = node.constant = self.integer(node.value)
+        return constant
 
-            return self.eval_prefix_expression(node.operator, right)
+    def eval_boolean(self, node, env):
+        return TRUE if node.value else FALSE
 
-        elif type(node) is InfixExpression:
-            left = self.eval(node.left, env)
+    def eval_null_literal(self, node, env):
+        return NULL
 
-            if self.is_error(left):
-                return left
+    def eval_prefix_node(self, node, env):
+        right = self.eval(node.right, env)
 
-            right = self.eval(node.right, env)
+        if self.is_error(right):
+            return right
 
-            if self.is_error(right):
-                return right
+        return self.eval_prefix_expression(node.operator, right)
 
-            return self.eval_infix_expression(node.operator, left, right)
+    def eval_infix_node(self, node, env):
+        left = self.eval(node.left, env)
 
-        # Conditional
-        elif type(node) is BlockStatement:
-            return self.eval_block_statement(node, env)
+        if self.is_error(left):
+            return left
 
-        elif type(node) is IfExpression:
-            return self.eval_if_expression(node, env)
+        right = self.eval(node.right, env)
 
-        # Return statement
-        elif type(node) is ReturnStatement:
-            val = self.eval(node.return_value, env)
+        if self.is_error(right):
+            return right
 
-            if self.is_error(val):
-                return val
+        return self.eval_infix_expression(node.operator, left, right)
 
-            return ReturnValue(value=val)
+    def eval_return_statement(self, node, env):
+        val = self.eval(node.return_value, env)
 
-        return None
+        if self.is_error(val):
+            return val
+
+        return ReturnValue(value=val)
 
     def eval_expressions(self, exps, env):
         result = []
@@ -131,13 +140,31 @@ class Evaluator:
         for statement in program.statements:
             result = self.eval(statement, env)
 
-            if result is not None and result.type() == Type.RETURN_VALUE_OBJ:
-                return result.value  # Finally program returns the wrapped value of ReturnValue()
-            elif result is not None and result.type() == Type.ERROR_OBJ:
-                return result  # Error does not evaluates nothing. Just print the message.
+            if result is not None:
+                tag = result.tag
+                if tag == RETURN_VALUE_TAG:
+                    return result.value  # Finally program returns the wrapped value of ReturnValue()
+                elif tag == ERROR_TAG:
+                    return result  # Error does not evaluates nothing. Just print the message.
 
         return result
 
+    def eval_statements(self, statements, env):
+        """
+        Streaming eval_program(): evaluate statements as they come (e.g. from
+        Parser.parse_statements()) and yield each result. Stops after a return
+        (yielding the returned value) or an error, like eval_program().
+        """
+        for statement in statements:
+            result = self.eval(statement, env)
+
+            if result is not None and result.tag == RETURN_VALUE_TAG:
+                yield result.value
+                return
+            yield result
+            if result is not None and result.tag == ERROR_TAG:
+                return
+
     def eval_block_statement(self, block, env):
         result = None
 
@@ -145,8 +172,8 @@ class Evaluator:
             result = self.eval(statement, env)
 
             if result is not None:
-                rt = result.type()
-                if rt in (Type.RETURN_VALUE_OBJ, Type.ERROR_OBJ):
+                tag = result.tag
+                if tag == RETURN_VALUE_TAG or tag == ERROR_TAG:
                     return result
 
         return result
@@ -166,13 +193,17 @@ class Evaluator:
             return self.new_error(f'unknown operator: {operator} {right.type()}')
 
     def eval_infix_expression(self, operator, left, right):
-        if left.type() == Type.INTEGER_OBJ and right.type() == Type.INTEGER_OBJ:
-            return self.eval_integer_infix_expression(operator, left, right)
+        entry = self.infix_operators.get((operator, type(left), type(right)))
+        if entry is not None:
+            function, wrap = entry
+            return wrap(self, function(left.value, right.value))
+        elif left.tag == INTEGER_TAG and right.tag == INTEGER_TAG:
+            return self.new_error(f'type mismatch: {left.type()} {operator} {right.type()}')
         elif operator == "==":
             return self.native_bool_to_boolean_object(left == right)
         elif operator == "!=":
             return self.native_bool_to_boolean_object(left != right)
-        elif left.type() != right.type():
+        elif left.tag != right.tag:
             return self.new_error(f'type mismatch: {left.type()} {operator} {right.type()}')
         else:
             return self.new_error(f'unknown operator: {left.type()} {operator} {right.type()}')
@@ -191,69 +222,63 @@ class Evaluator:
             return NULL
 
     def is_truthy(self, obj):
-        if obj == NULL:
+        if obj is NULL:
             return False
-        elif obj == TRUE:
+        elif obj is TRUE:
             return True
-        elif obj == FALSE:
+        elif obj is FALSE:
             return False
         else:
             return True
 
     def eval_integer_infix_expression(self, operator, left, right):
-        left_val = left.value
-        right_val = right.value
-
-        if operator == '+':
-            return Integer(value=int(left_val+right_val))
-        elif operator == '-':
-            return Integer(value=int(left_val-right_val))
-        elif operator == '*':
-            return Integer(value=int(left_val*right_val))
-        elif operator == '/':
-            return Integer(value=int(left_val/right_val))
-        elif operator == '<':
-            return self.native_bool_to_boolean_object(left_val < right_val)
-        elif operator == '>':
-            return self.native_bool_to_boolean_object(left_val > right_val)
-        elif operator == '==':
-            return self.native_bool_to_boolean_object(left_val == right_val)
-        elif operator == '!=':
-            return self.native_bool_to_boolean_object(left_val != right_val)
-        else:
+        entry = self.infix_operators.get((operator, Integer, Integer))
+        if entry is None:
             return self.new_error(f'type mismatch: {left.type()} {operator} {right.type()}')
+        function, wrap = entry
+        return wrap(self, function(left.value, right.value))
 
     def native_bool_to_boolean_object(self, value):
         return TRUE if value else FALSE
 
+    def integer(self, value):
+        small = self.small_integers
+        if small is not None and small.low <= value <= small.high:
+            return small.objects[value - small.low]
+        return Integer(value=value)
+
     def eval_bang_operator_expression(self, right):
-        if right == TRUE:
+        if right is TRUE:
             return FALSE
-        elif right == FALSE:
+        elif right is FALSE:
             return TRUE
-        elif right == NULL:
+        elif right is NULL:
             return TRUE
         else:
             return FALSE
 
     def eval_minus_prefix_operator_expression(self, right):
-        if right.type() != Type.INTEGER_OBJ:
+        if right.tag != INTEGER_TAG:
             return self.new_error(f'unknown operator: -{right.type()}')
         value = right.value
-        return Integer(value=-value)
+        return self.integer(-value)
 
     def new_error(self, message):
         return Error(message=message)
 
     def is_error(self, obj):
-        if obj is not None:
-            return obj.type() == Type.ERROR_OBJ
-        return False
+        return obj is not None and obj.tag == ERROR_TAG
 
     def apply_function(self, function, args):
-        if type(function) is not Function:
+        if function.tag != FUNCTION_TAG:
             return self.new_error(f"not a function: {type(function.type())}")
 
+        if function.body is None:
+            errors = function.literal.load_body()
+            if errors:
+                return self.new_error("invalid function body: " + "; ".join(errors))
+            function.body = function.literal.body
+
         extended_env = self.extend_function_env(function, args)
         evaluated = self.eval(function.body, extended_env)
         return self.unwrap_return_value(evaluated)
@@ -272,4 +297,31 @@ class Evaluator:
 
         return obj
 
-
+    handlers = {
+        Program: eval_program,
+        LetStatement: eval_let_statement,
+        Identifier: eval_identifier,
+        ExpressionStatement: eval_expression_statement,
+        FunctionLiteral: eval_function_literal,
+        CallExpression: eval_call_expression,
+        IntegerLiteral: eval_integer_literal,
+        BooleanAST: eval_boolean,
+        NullLiteral: eval_null_literal,
+        PrefixExpression: eval_prefix_node,
+        InfixExpression: eval_infix_node,
+        BlockStatement: eval_block_statement,
+        IfExpression: eval_if_expression,
+        ReturnStatement: eval_return_statement,
+    }
+
+    # (operator, left class, right class) -> (function of the two values, method wrapping its result)
+    infix_operators = {
+        ('+', Integer, Integer): (operator.add, integer),
+        ('-', Integer, Integer): (operator.sub, integer),
+        ('*', Integer, Integer): (operator.mul, integer),
+        ('/', Integer, Integer): (divide, integer),
+        ('<', Integer, Integer): (operator.lt, native_bool_to_boolean_object),
+        ('>', Integer, Integer): (operator.gt, native_bool_to_boolean_object),
+        ('==', Integer, Integer): (operator.eq, native_bool_to_boolean_object),
+        ('!=', Integer, Integer): (operator.ne, native_bool_to_boolean_object),
+    }
@@ -0,0 +1,212 @@
+from monkey.ast.flat import (
+    PROGRAM,
+    LET,
+    IDENTIFIER,
+    NULL as NULL_KIND,
+    RETURN,
+    EXPRESSION,
+    INTEGER,
+    PREFIX,
+    INFIX,
+    BOOLEAN,
+    IF,
+    BLOCK,
+    FUNCTION,
+    CALL,
+    NONE,
+    unflatten,
+)
+from monkey.evaluator.evaluator import Evaluator, TRUE, FALSE, NULL
+from monkey.object.object import Integer, ReturnValue, Function, RETURN_VALUE_TAG, ERROR_TAG
+from monkey.object.environment import new_enclosed_environment
+
+
+class FlatFunction(Function):
+    """
+    Function made by FlatEvaluator: parameters are names and body is the row
+    of the body in flat, row the row of the fn literal.
+    """
+    __slots__ = ('flat', 'row')
+
+    def __init__(self, parameters, body, env, flat, row):
+        super().__init__(parameters, body, env)
+        self.flat = flat
+        self.row = row
+
+    def inspect(self):
+        literal = unflatten(self.flat, self.row)
+        return Function(parameters=literal.parameters, body=literal.body, env=self.env).inspect()
+
+
+class FlatEvaluator(Evaluator):
+    """
+    Evaluates a monkey.ast.flat.FlatProgram by row number instead of node
+    objects, with the same results as Evaluator on the tree. Functions it
+    creates are FlatFunctions.
+
+        FlatEvaluator(flat).eval(0, env)
+    """
+    def __init__(self, flat):
+        self.flat = flat
+        # plain lists index faster than arrays, which box every value read
+        self.kinds = list(flat.kinds)
+        self.a = list(flat.a)
+        self.b = list(flat.b)
+        self.c = list(flat.c)
+        self.strings = flat.strings
+        self.lists = flat.lists
+        self.item_lists = {}
+        # integer literal objects by row, made once
+        self.integers = {i: self.integer(int(self.strings[self.a[i]])) for i, kind in enumerate(self.kinds)
+                         if kind == INTEGER and self.a[i] != NONE}
+
+    def items(self, offset):
+        items = self.item_lists.get(offset)
+        if items is None:
+            count = self.lists[offset]
+            items = self.item_lists[offset] = self.lists[offset + 1:offset + 1 + count].tolist()
+        return items
+
+    def eval(self, node, env):
+        if node == NONE:
+            return None
+
+        kind = self.kinds[node]
+
+        # Statements
+        if kind == PROGRAM:
+            return self.eval_program(node, env)
+        # Let Statement
+        elif kind == LET:
+            val = self.eval(self.b[node], env)
+            if self.is_error(val):
+                return val
+            env.set(self.strings[self.a[self.a[node]]], val)
+        # Identifier
+        elif kind == IDENTIFIER:
+            return self.eval_identifier(node, env)
+
+        elif kind == EXPRESSION:
+            return self.eval(self.a[node], env)
+        # Function Literal
+        elif kind == FUNCTION:
+            params = [self.strings[self.a[p]] for p in self.items(self.a[node])]
+            return FlatFunction(parameters=params, body=self.b[node], env=env, flat=self.flat, row=node)
+        # Function Call
+        elif kind == CALL:
+            function = self.eval(self.a[node], env)
+            if self.is_error(function):
+                return function
+            args = self.eval_expressions(self.items(self.b[node]), env)
+
+            if len(args) == 1 and self.is_error(args[0]):
+                return args[0]
+
+            return self.apply_function(function, args)
+
+        # Expressions
+        elif kind == INTEGER:
+            constant = self.integers.get(node)
+            return Integer(value=None) if constant is None else constant
+
+        elif kind == BOOLEAN:
+            return TRUE if self.a[node] == 1 else FALSE
+
+        elif kind == NULL_KIND:
+            return NULL
+
+        # Prefix and Infix Expressions
+        elif kind == PREFIX:
+            right = self.eval(self.b[node], env)
+
+            if self.is_error(right):
+                return right
+
+            return self.eval_prefix_expression(self.strings[self.a[node]], right)
+
+        elif kind == INFIX:
+            left = self.eval(self.a[node], env)
+
+            if self.is_error(left):
+                return left
+
+            right = self.eval(self.c[node], env)
+
+            if self.is_error(right):
+                return right
+
+            return self.eval_infix_expression(self.strings[self.b[node]], left, right)
+
+        # Conditional
+        elif kind == BLOCK:
+            return self.eval_block_statement(node, env)
+
+        elif kind == IF:
+            return self.eval_if_expression(node, env)
+
+        # Return statement
+        elif kind == RETURN:
+            val = self.eval(self.a[node], env)
+
+            if self.is_error(val):
+                return val
+
+            return ReturnValue(value=val)
+
+        return None
+
+    def eval_program(self, program, env):
+        result = None
+
+        for statement in self.items(self.a[program]):
+            result = self.eval(statement, env)
+
+            if result is not None:
+                tag = result.tag
+                if tag == RETURN_VALUE_TAG:
+                    return result.value
+                elif tag == ERROR_TAG:
+                    return result
+
+        return result
+
+    def eval_block_statement(self, block, env):
+        result = None
+
+        for statement in self.items(self.a[block]):
+            result = self.eval(statement, env)
+
+            if result is not None:
+                tag = result.tag
+                if tag == RETURN_VALUE_TAG or tag == ERROR_TAG:
+                    return result
+
+        return result
+
+    def eval_identifier(self, node, env):
+        name = self.strings[self.a[node]]
+        val = env.get(name)
+        if val is None:
+            return self.new_error("identifier not found: " + name)
+        return val
+
+    def eval_if_expression(self, ie, env):
+        condition = self.eval(self.a[ie], env)
+
+        if self.is_error(condition):
+            return condition
+
+        if self.is_truthy(condition):
+            return self.eval(self.b[ie], env)
+        elif self.c[ie] != NONE:
+            return self.eval(self.c[ie], env)
+        else:
+            return NULL
+
+    def extend_function_env(self, fn, args):
+        env = new_enclosed_environment(fn.env)
+
+        for param_idx, param in enumerate(fn.parameters):
+            env.set(param, args[param_idx])
+
+        return env
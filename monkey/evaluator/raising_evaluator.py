@@ -0,0 +1,133 @@
+from monkey.ast.ast import (
+    Program,
+    LetStatement,
+    CallExpression,
+    PrefixExpression,
+    InfixExpression,
+    BlockStatement,
+    IfExpression,
+    ReturnStatement,
+)
+from monkey.evaluator.evaluator import Evaluator, NULL
+from monkey.object.object import Error, Function
+from monkey.object.environment import new_enclosed_environment
+
+
+class Return(Exception):
+    """
+    A `return` leaving its function (or the program) with value.
+    """
+    def __init__(self, value):
+        self.value = value
+
+
+class EvaluationError(Exception):
+    """
+    A runtime error, turned into an Error object only where it ends the program.
+    """
+    def __init__(self, message):
+        self.message = message
+
+
+class RaisingEvaluator(Evaluator):
+    """
+    Evaluator that raises Return and EvaluationError instead of passing
+    ReturnValue and Error objects up the tree, so evaluating a node never
+    checks what its children returned. Return is caught by the call it
+    leaves, EvaluationError by eval_program and eval_statements, which give
+    the same results and Error messages as Evaluator.
+
+    A return inside an expression (`1 + if (c) { return 2 }`) leaves the
+    whole function here, where Evaluator carries the ReturnValue into the
+    expression.
+    """
+
+    def eval_program(self, program, env):
+        result = None
+        try:
+            for statement in program.statements:
+                result = self.eval(statement, env)
+        except Return as r:
+            return r.value
+        except EvaluationError as e:
+            return Error(message=e.message)
+        return result
+
+    def eval_statements(self, statements, env):
+        for statement in statements:
+            try:
+                result = self.eval(statement, env)
+            except Return as r:
+                yield r.value
+                return
+            except EvaluationError as e:
+                yield Error(message=e.message)
+                return
+            yield result
+
+    def eval_let_statement(self, node, env):
+        env.set(node.name.value, self.eval(node.value, env))
+
+    def eval_call_expression(self, node, env):
+        function = self.eval(node.function, env)
+        args = [self.eval(argument, env) for argument in node.arguments]
+        return self.apply_function(function, args)
+
+    def eval_prefix_node(self, node, env):
+        return self.eval_prefix_expression(node.operator, self.eval(node.right, env))
+
+    def eval_infix_node(self, node, env):
+        left = self.eval(node.left, env)
+        return self.eval_infix_expression(node.operator, left, self.eval(node.right, env))
+
+    def eval_block_statement(self, block, env):
+        result = None
+        for statement in block.statements:
+            result = self.eval(statement, env)
+        return result
+
+    def eval_if_expression(self, ie, env):
+        if self.is_truthy(self.eval(ie.condition, env)):
+            return self.eval(ie.consequence, env)
+        elif ie.alternative is not None:
+            return self.eval(ie.alternative, env)
+        else:
+            return NULL
+
+    def eval_return_statement(self, node, env):
+        raise Return(self.eval(node.return_value, env))
+
+    def new_error(self, message):
+        raise EvaluationError(message)
+
+    def apply_function(self, function, args):
+        if type(function) is not Function:
+            self.new_error(f"not a function: {type(function.type())}")
+
+        if function.body is None:
+            errors = function.literal.load_body()
+            if errors:
+                self.new_error("invalid function body: " + "; ".join(errors))
+            function.body = function.literal.body
+
+        env = new_enclosed_environment(function.env)
+        for param_idx, param in enumerate(function.parameters):
+            env.set(param.value, args[param_idx])
+
+        try:
+            return self.eval(function.body, env)
+        except Return as r:
+            return r.value
+
+    # the inherited table holds Evaluator's functions, so the overridden ones go in again
+    handlers = {
+        **Evaluator.handlers,
+        Program: eval_program,
+        LetStatement: eval_let_statement,
+        CallExpression: eval_call_expression,
+        PrefixExpression: eval_prefix_node,
+        InfixExpression: eval_infix_node,
+        BlockStatement: eval_block_statement,
+        IfExpression: eval_if_expression,
+        ReturnStatement: eval_return_statement,
+    }
@@ -0,0 +1,221 @@
+import operator
+
+from monkey.ast.ast import (
+    Program,
+    IntegerLiteral,
+    Boolean as BooleanAST,
+    NullLiteral,
+    InfixExpression,
+    LetStatement,
+    BlockStatement,
+    IfExpression,
+    Identifier,
+    CallExpression,
+)
+from monkey.evaluator.evaluator import TRUE, FALSE, NULL, divide
+from monkey.evaluator.raising_evaluator import RaisingEvaluator, Return, EvaluationError
+from monkey.object.object import Integer, Boolean, Null, Error, Function, Type
+
+# Type of the values that are not objects, for error messages
+value_types = {int: Type.INTEGER_OBJ, bool: Type.BOOLEAN_OBJ, type(None): Type.NULL_OBJ}
+
+# what Evaluator evaluates to None, e.g. a `let` or an empty block; None is null here.
+# Like None in an Environment, a name bound to it is looked up further out.
+NOTHING = object()
+
+
+def type_of(value):
+    value_type = value_types.get(type(value))
+    return value.type() if value_type is None else value_type
+
+
+def box(value):
+    """
+    The object Evaluator has for value.
+    """
+    if value is NOTHING:
+        return None
+    cls = type(value)
+    if cls is int:
+        return Integer(value=value)
+    elif cls is bool:
+        return TRUE if value else FALSE
+    elif value is None:
+        return NULL
+    return value
+
+
+def unbox(obj):
+    """
+    The value UnboxedEvaluator has for an object of Evaluator.
+    """
+    cls = type(obj)
+    if cls is Integer or cls is Boolean:
+        return obj.value
+    elif cls is Null:
+        return None
+    return obj
+
+
+def inspect(value):
+    return box(value).inspect()
+
+
+class UnboxedEvaluator(RaisingEvaluator):
+    """
+    RaisingEvaluator on plain Python values: integers are ints, booleans
+    bools and null is None; only functions stay objects. Values are boxed
+    where they leave the evaluator, so eval_program and eval_statements
+    return the same objects as Evaluator (see box and unbox for the values
+    an environment holds).
+
+    Booleans are told from integers by their exact type, never with
+    isinstance or ==, so `1 == true` stays false and `1 + true` a type
+    mismatch. What Evaluator evaluates to None (no value, unlike null) is
+    NOTHING here.
+    """
+
+    def eval(self, node, env):
+        handler = self.handlers.get(type(node))
+        if handler is None:
+            return NOTHING
+        return handler(self, node, env)
+
+    def eval_program(self, program, env):
+        result = NOTHING
+        try:
+            for statement in program.statements:
+                result = self.eval(statement, env)
+        except Return as r:
+            return box(r.value)
+        except EvaluationError as e:
+            return Error(message=e.message)
+        return box(result)
+
+    def eval_statements(self, statements, env):
+        for statement in statements:
+            try:
+                result = self.eval(statement, env)
+            except Return as r:
+                yield box(r.value)
+                return
+            except EvaluationError as e:
+                yield Error(message=e.message)
+                return
+            yield box(result)
+
+    def eval_identifier(self, node, env):
+        # null is None, so Environment.get cannot tell it from a missing name
+        name = node.value
+        while env is not None:
+            val = env.store.get(name, NOTHING)
+            if val is not NOTHING:
+                return val
+            env = env.outer
+        self.new_error("identifier not found: " + name)
+
+    def eval_call_expression(self, node, env):
+        function = self.eval(node.function, env)
+        args = [self.eval(argument, env) for argument in node.arguments]
+        if type(function) is not Function:
+            self.new_error(f"not a function: {type(type_of(function))}")
+        return self.apply_function(function, args)
+
+    def eval_let_statement(self, node, env):
+        env.set(node.name.value, self.eval(node.value, env))
+        return NOTHING
+
+    def eval_block_statement(self, block, env):
+        result = NOTHING
+        for statement in block.statements:
+            result = self.eval(statement, env)
+        return result
+
+    def eval_if_expression(self, ie, env):
+        if self.is_truthy(self.eval(ie.condition, env)):
+            return self.eval(ie.consequence, env)
+        elif ie.alternative is not None:
+            return self.eval(ie.alternative, env)
+        else:
+            return None
+
+    def eval_integer_literal(self, node, env):
+        return node.value
+
+    def eval_boolean(self, node, env):
+        # cfg_parser reads `null` as a Boolean with value None, which Evaluator takes for false
+        return True if node.value else False
+
+    def eval_null_literal(self, node, env):
+        return None
+
+    def eval_infix_node(self, node, env):
+        left = self.eval(node.left, env)
+        right = self.eval(node.right, env)
+        function = self.infix_operators.get((node.operator, type(left), type(right)))
+        if function is not None:
+            return function(left, right)
+        return self.eval_infix_expression(node.operator, left, right)
+
+    def eval_prefix_expression(self, operator, right):
+        if operator == "!":
+            return self.eval_bang_operator_expression(right)
+        elif operator == "-":
+            return self.eval_minus_prefix_operator_expression(right)
+        else:
+            self.new_error(f'unknown operator: {operator} {type_of(right)}')
+
+    def eval_infix_expression(self, operator, left, right):
+        function = self.infix_operators.get((operator, type(left), type(right)))
+        if function is not None:
+            return function(left, right)
+        # type_of fails on NOTHING where Evaluator reads the tag of None
+        left_type = type_of(left)
+        if type(left) is int and type_of(right) is Type.INTEGER_OBJ:
+            self.new_error(f'type mismatch: {left_type} {operator} {Type.INTEGER_OBJ}')
+        elif operator == "==":
+            return left is right
+        elif operator == "!=":
+            return left is not right
+        right_type = type_of(right)
+        if type(left) is not type(right):
+            self.new_error(f'type mismatch: {left_type} {operator} {right_type}')
+        else:
+            self.new_error(f'unknown operator: {left_type} {operator} {right_type}')
+
+    def is_truthy(self, obj):
+        return obj is not False and obj is not None
+
+    def eval_bang_operator_expression(self, right):
+        return right is False or right is None
+
+    def eval_minus_prefix_operator_expression(self, right):
+        if type(right) is not int:
+            self.new_error(f'unknown operator: -{type_of(right)}')
+        return -right
+
+    handlers = {
+        **RaisingEvaluator.handlers,
+        Program: eval_program,
+        Identifier: eval_identifier,
+        CallExpression: eval_call_expression,
+        LetStatement: eval_let_statement,
+        BlockStatement: eval_block_statement,
+        IfExpression: eval_if_expression,
+        IntegerLiteral: eval_integer_literal,
+        BooleanAST: eval_boolean,
+        NullLiteral: eval_null_literal,
+        InfixExpression: eval_infix_node,
+    }
+
+    # (operator, left type, right type) -> function of the two values; bool is not int here
+    infix_operators = {
+        ('+', int, int): operator.add,
+        ('-', int, int): operator.sub,
+        ('*', int, int): operator.mul,
+        ('/', int, int): divide,
+        ('<', int, int): operator.lt,
+        ('>', int, int): operator.gt,
+        ('==', int, int): operator.eq,
+        ('!=', int, int): operator.ne,
+    }
@@ -0,0 +1,353 @@
+"""
+On-disk index of the names defined and used across many script files.
+
+Every `let` name and fn parameter is a definition, every other identifier a
+reference. References are resolved lexically inside their file: to the
+innermost scope (the file or an enclosing fn) that defines the name. A fn
+body sees its enclosing scopes as they are at their end, since it runs
+after they have been set up, so recursion and fns calling fns defined
+further down resolve. References that resolve to nothing are what a file
+takes from other files, and a file depends on every other file that
+defines such a name at its top level.
+
+The index is a sqlite database; a file is parsed again only when the
+digest of its contents changed.
+
+    index = SymbolIndex('symbols.db')
+    index.update(paths)
+    index.definitions('fib')
+"""
+import os
+import sqlite3
+from collections import deque, namedtuple
+
+from monkey.ast.ast import (
+    Program,
+    BlockStatement,
+    LetStatement,
+    Identifier,
+    FunctionLiteral,
+    iter_child_nodes,
+)
+from monkey.lexer.regex_lexer import RegexLexer
+from monkey.parser.cache import source_digest
+from monkey.parser.pratt_parser import Parser
+from monkey.tok.position import LineIndex
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    digest BLOB NOT NULL,
+    errors INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS definitions (
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    number INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    top_level INTEGER NOT NULL,
+    start INTEGER, "end" INTEGER, line INTEGER, "column" INTEGER,
+    PRIMARY KEY (file_id, number)
+);
+CREATE TABLE IF NOT EXISTS refs (
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    name TEXT NOT NULL,
+    definition INTEGER,
+    start INTEGER, "end" INTEGER, line INTEGER, "column" INTEGER
+);
+-- per file, the names it uses without defining them and the ones it defines at its top level
+CREATE TABLE IF NOT EXISTS imports (
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    name TEXT NOT NULL,
+    PRIMARY KEY (file_id, name)
+);
+CREATE TABLE IF NOT EXISTS exports (
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    name TEXT NOT NULL,
+    PRIMARY KEY (file_id, name)
+);
+CREATE INDEX IF NOT EXISTS definitions_name ON definitions(name);
+CREATE INDEX IF NOT EXISTS refs_name ON refs(name);
+CREATE INDEX IF NOT EXISTS refs_definition ON refs(file_id, definition);
+CREATE INDEX IF NOT EXISTS imports_name ON imports(name);
+CREATE INDEX IF NOT EXISTS exports_name ON exports(name);
+CREATE VIEW IF NOT EXISTS dependencies AS
+    SELECT DISTINCT i.file_id AS file_id, e.file_id AS dependency_id
+    FROM imports i JOIN exports e ON e.name = i.name AND e.file_id != i.file_id;
+"""
+
+# kind is 'let' or 'parameter' for definitions and 'reference' for references
+Symbol = namedtuple('Symbol', 'path name kind start end line column')
+
+LOCATION = 'f.path, s.name, {kind}, s.start, s."end", s.line, s."column"'
+
+
+class Scope:
+    __slots__ = ('names', 'parent')
+
+    def __init__(self, parent=None):
+        self.names = {}  # name -> number of its definition
+        self.parent = parent
+
+    def lookup(self, name):
+        scope = self
+        while scope is not None:
+            number = scope.names.get(name)
+            if number is not None:
+                return number
+            scope = scope.parent
+        return None
+
+
+def collect(program):
+    """
+    Return (definitions, references) of a parsed program:
+    definitions as [name, kind, top_level, node], numbered by their position,
+    and references as [name, definition number or None, node].
+    """
+    definitions = []
+    references = []
+    top = Scope()
+    functions = deque([(program, top)])  # bodies to walk, each after its enclosing scope
+
+    def define(ident, kind, scope):
+        if ident is None:
+            return
+        scope.names[ident.value] = len(definitions)
+        definitions.append([ident.value, kind, scope is top, ident])
+
+    while functions:
+        root, scope = functions.popleft()
+        stack = [root]
+
+        while stack:
+            node = stack.pop()
+            cls = type(node)
+
+            if node is None:
+                continue
+            elif cls is Identifier:
+                references.append([node.value, scope.lookup(node.value), node])
+            elif cls is LetStatement:
+                if type(node.value) is FunctionLiteral:
+                    define(node.name, 'let', scope)  # a fn may call itself
+                    stack.append(node.value)
+                else:
+                    stack.append(('define', node.name))
+                    stack.append(node.value)
+            elif cls is FunctionLiteral:
+                inner = Scope(scope)
+                for parameter in node.parameters or ():
+                    define(parameter, 'parameter', inner)
+                node.load_body()
+                functions.append((node.body, inner))
+            elif cls is tuple:
+                define(node[1], 'let', scope)
+            elif cls is Program or cls is BlockStatement:
+                stack.extend(reversed(node.statements))
+            else:
+                children = list(iter_child_nodes(node))
+                children.reverse()
+                stack.extend(children)
+
+    return definitions, references
+
+
+class SymbolIndex:
+    """
+    The index in the sqlite database at path (':memory:' for one that is
+    not kept). Paths are stored as given, so use them the same way each time.
+    """
+    def __init__(self, path):
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def update(self, paths):
+        """
+        Index the files in paths whose contents changed since they were last
+        indexed, in one transaction. Return the paths that were (re)indexed.
+        """
+        changed = []
+        with self.db:
+            for path in paths:
+                with open(path, encoding='utf-8') as f:
+                    source = f.read()
+                if self.store(path, source):
+                    changed.append(path)
+        return changed
+
+    def index_source(self, path, source):
+        """
+        Index source as the contents of path, return whether it changed.
+        """
+        with self.db:
+            return self.store(path, source)
+
+    def changed(self, paths):
+        """
+        The paths in paths that are not indexed with their current contents.
+        """
+        result = []
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                digest = source_digest(f.read())
+            if self.digest(path) != digest:
+                result.append(path)
+        return result
+
+    def digest(self, path):
+        row = self.db.execute('SELECT digest FROM files WHERE path = ?', (os.fspath(path),)).fetchone()
+        return None if row is None else row[0]
+
+    def store(self, path, source):
+        # the caller commits
+        path = os.fspath(path)
+        digest = source_digest(source)
+        if self.digest(path) == digest:
+            return False
+
+        parser = Parser(RegexLexer(source, illegal_tokens=True))
+        definitions, references = collect(parser.parse_program())
+        lines = LineIndex(source)
+
+        def location(node):
+            if node.start is None:
+                return None, None, None, None
+            return (node.start, node.end) + lines.line_col(node.start)
+
+        self.delete(path)
+        file_id = self.db.execute(
+            'INSERT INTO files (path, digest, errors) VALUES (?, ?, ?)',
+            (path, digest, len(parser.errors)),
+        ).lastrowid
+        self.db.executemany(
+            'INSERT INTO definitions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [(file_id, number, name, kind, top_level) + location(node)
+             for number, (name, kind, top_level, node) in enumerate(definitions)],
+        )
+        self.db.executemany(
+            'INSERT INTO refs VALUES (?, ?, ?, ?, ?, ?, ?)',
+            [(file_id, name, definition) + location(node) for name, definition, node in references],
+        )
+        self.db.executemany(
+            'INSERT INTO imports VALUES (?, ?)',
+            [(file_id, name) for name in {name for name, definition, _ in references if definition is None}],
+        )
+        self.db.executemany(
+            'INSERT INTO exports VALUES (?, ?)',
+            [(file_id, name) for name in {name for name, _, top_level, _ in definitions if top_level}],
+        )
+        return True
+
+    def remove(self, path):
+        with self.db:
+            self.delete(os.fspath(path))
+
+    def delete(self, path):
+        row = self.db.execute('SELECT id FROM files WHERE path = ?', (path,)).fetchone()
+        if row is not None:
+            self.db.execute('DELETE FROM definitions WHERE file_id = ?', row)
+            self.db.execute('DELETE FROM refs WHERE file_id = ?', row)
+            self.db.execute('DELETE FROM imports WHERE file_id = ?', row)
+            self.db.execute('DELETE FROM exports WHERE file_id = ?', row)
+            self.db.execute('DELETE FROM files WHERE id = ?', row)
+
+    def paths(self):
+        return [path for path, in self.db.execute('SELECT path FROM files ORDER BY path')]
+
+    def definitions(self, name):
+        """
+        Every definition of name, in every file.
+        """
+        return self.symbols(
+            f'SELECT {LOCATION.format(kind="s.kind")} FROM definitions s JOIN files f ON f.id = s.file_id '
+            'WHERE s.name = ? ORDER BY f.path, s.start',
+            (name,),
+        )
+
+    def references(self, name):
+        """
+        Every reference to name, in every file, resolved or not.
+        """
+        return self.symbols(
+            f'SELECT {LOCATION.format(kind=repr("reference"))} FROM refs s JOIN files f ON f.id = s.file_id '
+            'WHERE s.name = ? ORDER BY f.path, s.start',
+            (name,),
+        )
+
+    def definition_at(self, path, offset):
+        """
+        The definition the identifier at offset in path refers to (or is),
+        None for names taken from other files and places without a name.
+        """
+        file_id, number = self.resolve(path, offset)
+        if number is None:
+            return None
+        return self.symbols(
+            f'SELECT {LOCATION.format(kind="s.kind")} FROM definitions s JOIN files f ON f.id = s.file_id '
+            'WHERE s.file_id = ? AND s.number = ?',
+            (file_id, number),
+        )[0]
+
+    def usages(self, path, offset):
+        """
+        The references that resolve to the definition at (or referred to at)
+        offset in path.
+        """
+        file_id, number = self.resolve(path, offset)
+        if number is None:
+            return []
+        return self.symbols(
+            f'SELECT {LOCATION.format(kind=repr("reference"))} FROM refs s JOIN files f ON f.id = s.file_id '
+            'WHERE s.file_id = ? AND s.definition = ? ORDER BY s.start',
+            (file_id, number),
+        )
+
+    def resolve(self, path, offset):
+        # (file id, number of the definition named at offset or None)
+        file_id = self.file_id(path)
+        row = self.db.execute(
+            'SELECT definition FROM refs WHERE file_id = ? AND start <= ? AND ? < "end" '
+            'UNION ALL SELECT number FROM definitions WHERE file_id = ? AND start <= ? AND ? < "end"',
+            (file_id, offset, offset) * 2,
+        ).fetchone()
+        return file_id, None if row is None else row[0]
+
+    def imports(self, path):
+        """
+        Names path uses without defining them.
+        """
+        return sorted(name for name, in self.db.execute(
+            'SELECT name FROM imports WHERE file_id = ?', (self.file_id(path),)
+        ))
+
+    def dependencies(self, path):
+        """
+        Files defining at their top level a name that path imports.
+        """
+        return sorted(p for p, in self.db.execute(
+            'SELECT f.path FROM dependencies d JOIN files f ON f.id = d.dependency_id WHERE d.file_id = ?',
+            (self.file_id(path),),
+        ))
+
+    def dependents(self, path):
+        """
+        Files that depend on path, the ones to look at again when it changes.
+        """
+        return sorted(p for p, in self.db.execute(
+            'SELECT f.path FROM dependencies d JOIN files f ON f.id = d.file_id WHERE d.dependency_id = ?',
+            (self.file_id(path),),
+        ))
+
+    def file_id(self, path):
+        row = self.db.execute('SELECT id FROM files WHERE path = ?', (os.fspath(path),)).fetchone()
+        if row is None:
+            raise KeyError(f'{path} is not indexed')
+        return row[0]
+
+    def symbols(self, query, parameters):
+        return [Symbol(*row) for row in self.db.execute(query, parameters)]
@@ -12,8 +12,9 @@ def is_letter(ch):
 
 
 class Lexer:
-    def __init__(self, source):
+    def __init__(self, source, illegal_tokens=False):
         self.input = source
+        self.illegal_tokens = illegal_tokens  # emit ILLEGAL tokens instead of raising
         self.pos = 0
         self.current_char = self.input[self.pos]
 
@@ -35,10 +36,11 @@ class Lexer:
         while self.current_char is not None and self.current_char != '\n':
             self.advance()
 
-        if self.current_char is None:
+        if self.current_char is None and not self.illegal_tokens:
             error('Unexpected end of file')
 
     def number(self):
+        start = self.pos
         result = ''
         while self.current_char is not None and self.current_char.isdigit():
             result += self.current_char
@@ -51,15 +53,16 @@ class Lexer:
                 result += self.current_char
                 self.advance()
 
-        return Token(TokenType.INT, result)
+        return Token(TokenType.INT, result, start, self.pos)
 
     def identifier(self):
+        start = self.pos
         result = ''
         while self.current_char is not None and is_letter(self.current_char):
             result += self.current_char
             self.advance()
 
-        return Token(lookup_ident(result), result)
+        return Token(lookup_ident(result), result, start, self.pos)
 
     def next_token(self):
         while self.current_char is not None:
@@ -73,6 +76,8 @@ class Lexer:
                 self.skip_comments()
                 continue
 
+            start = self.pos
+
             if self.current_char.isdigit():
                 return self.number()
 
@@ -84,71 +89,76 @@ class Lexer:
                 if self.peek() == '=':
                     self.advance()  # eat the first '='
                     self.advance()  # eat the second '='
-                    return Token(TokenType.EQ, '==')
+                    return Token(TokenType.EQ, '==', start, self.pos)
                 else:
                     self.advance()
-                    return Token(TokenType.ASSIGN, '=')
+                    return Token(TokenType.ASSIGN, '=', start, self.pos)
 
             if self.current_char == '+':
                 self.advance()
-                return Token(TokenType.PLUS, '+')
+                return Token(TokenType.PLUS, '+', start, self.pos)
 
             if self.current_char == '-':
                 self.advance()
-                return Token(TokenType.MINUS, '-')
+                return Token(TokenType.MINUS, '-', start, self.pos)
 
             if self.current_char == '!':
                 if self.peek() == '=':
                     self.advance()  # eat the '!'
                     self.advance()  # eat the '='
-                    return Token(TokenType.NOT_EQ, '!=')
+                    return Token(TokenType.NOT_EQ, '!=', start, self.pos)
                 else:
                     self.advance()
-                    return Token(TokenType.BANG, '!')
+                    return Token(TokenType.BANG, '!', start, self.pos)
 
             if self.current_char == '/':
                 self.advance()
-                return Token(TokenType.SLASH, '/')
+                return Token(TokenType.SLASH, '/', start, self.pos)
 
             if self.current_char == '*':
                 self.advance()
-                return Token(TokenType.ASTERISK, '*')
+                return Token(TokenType.ASTERISK, '*', start, self.pos)
 
             if self.current_char == '<':
                 self.advance()
-                return Token(TokenType.LT, '<')
+                return Token(TokenType.LT, '<', start, self.pos)
 
             if self.current_char == '>':
                 self.advance()
-                return Token(TokenType.GT, '>')
+                return Token(TokenType.GT, '>', start, self.pos)
 
             if self.current_char == ';':
                 self.advance()
-                return Token(TokenType.SEMICOLON, ';')
+                return Token(TokenType.SEMICOLON, ';', start, self.pos)
 
             if self.current_char == ',':
                 self.advance()
-                return Token(TokenType.COMMA, ',')
+                return Token(TokenType.COMMA, ',', start, self.pos)
 
             if self.current_char == '(':
                 self.advance()
-                return Token(TokenType.LPAREN, '(')
+                return Token(TokenType.LPAREN, '(', start, self.pos)
 
             if self.current_char == ')':
                 self.advance()
-                return Token(TokenType.RPAREN, ')')
+                return Token(TokenType.RPAREN, ')', start, self.pos)
 
             if self.current_char == '{':
                 self.advance()
-                return Token(TokenType.LBRACE, '{')
+                return Token(TokenType.LBRACE, '{', start, self.pos)
 
             if self.current_char == '}':
                 self.advance()
-                return Token(TokenType.RBRACE, '}')
+                return Token(TokenType.RBRACE, '}', start, self.pos)
+
+            if self.illegal_tokens:
+                literal = self.current_char
+                self.advance()
+                return Token(TokenType.ILLEGAL, literal, start, self.pos)
 
             error('Illegal character ' + self.current_char)
 
-        return Token(TokenType.EOF, "")
+        return Token(TokenType.EOF, "", self.pos, self.pos)
 
     def read_identifier(self):
         position = self.pos
@@ -0,0 +1,79 @@
+import re
+
+from monkey.tok.tok import Token, TokenType, keywords
+from monkey.lexer.lexer import error
+
+# Non-literal token types are the ones spelled with punctuation ('=', '==', '(', ...).
+operators = {t.value: t for t in TokenType if not t.value.isalnum()}
+
+NUMBER = 1
+IDENT = 2
+COMMENT = 3
+OPERATOR = 4
+EOF = 5
+ILLEGAL = 6
+
+SKIP = r'(?:\s+|//[^\n]*\n)*'
+
+
+def build_pattern(ident=r'\w+'):
+    # After SKIP one of the groups always matches, so consecutive matches are contiguous.
+    return (
+        SKIP +
+        r'(?:'
+        r'(\d+(?:\.\d+)?)'  # NUMBER
+        r'|(' + ident + r')'  # IDENT (or keyword)
+        r'|(//)'  # COMMENT that runs into the end of the input
+        # longer spellings go first so '==' wins over '='
+        r'|(' + '|'.join(re.escape(op) for op in sorted(operators, key=len, reverse=True)) + r')'  # OPERATOR
+        r'|(\Z)'  # EOF
+        r'|(.)'  # ILLEGAL
+        r')'
+    )
+
+
+master_pattern = re.compile(build_pattern())
+
+
+class RegexLexer:
+    """
+    Drop-in replacement for Lexer that matches one master pattern per token
+    and slices literals straight out of the input.
+    """
+    def __init__(self, source, pos=0, endpos=None, illegal_tokens=False):
+        self.input = source
+        self.illegal_tokens = illegal_tokens  # emit ILLEGAL tokens instead of raising
+        self.tokens = self.scan(pos, len(source) if endpos is None else endpos)
+
+    def next_token(self):
+        return next(self.tokens)
+
+    def scan(self, pos, endpos):
+        lookup_keyword = keywords.get
+        ident = TokenType.IDENT
+        integer = TokenType.INT
+
+        for match in master_pattern.finditer(self.input, pos, endpos):
+            kind = match.lastindex
+
+            if kind == IDENT:
+                literal = match.group(IDENT)
+                yield Token(lookup_keyword(literal, ident), literal, *match.span(IDENT))
+            elif kind == OPERATOR:
+                literal = match.group(OPERATOR)
+                yield Token(operators[literal], literal, *match.span(OPERATOR))
+            elif kind == NUMBER:
+                yield Token(integer, match.group(NUMBER), *match.span(NUMBER))
+            elif kind == EOF:
+                break
+            elif kind == COMMENT:
+                if self.illegal_tokens:
+                    break
+                error('Unexpected end of file')
+            elif self.illegal_tokens:
+                yield Token(TokenType.ILLEGAL, match.group(ILLEGAL), *match.span(ILLEGAL))
+            else:
+                error('Illegal character ' + match.group(ILLEGAL))
+
+        while True:
+            yield Token(TokenType.EOF, "", endpos, endpos)
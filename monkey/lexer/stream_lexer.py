@@ -0,0 +1,129 @@
+import mmap
+import re
+
+from monkey.tok.tok import Token, TokenType, keywords
+from monkey.lexer.lexer import error
+from monkey.lexer.regex_lexer import (
+    operators,
+    master_pattern,
+    build_pattern,
+    NUMBER,
+    IDENT,
+    COMMENT,
+    OPERATOR,
+    EOF,
+    ILLEGAL,
+)
+
+# Bytes flavour of the master pattern: every non-ASCII byte is taken as part of
+# an identifier, so UTF-8 names survive and only identifier/number slices are decoded.
+bytes_pattern = re.compile(build_pattern(r'[\w\x80-\xff]+').encode('latin-1'))
+
+bytes_keywords = {k.encode(): (t, k) for k, t in keywords.items()}
+bytes_operators = {k.encode(): (t, k) for k, t in operators.items()}
+
+CHUNK_SIZE = 64 * 1024
+
+# A match ending this close to the end of the window may still grow ('1' + '.5', '=' + '=').
+LOOKAHEAD = 2
+
+
+class StreamLexer:
+    """
+    Lexer over a file object or a buffer (bytes, mmap) that never needs the
+    whole program as one str. File objects are read in chunk_size pieces and
+    only the unconsumed tail of the window is kept between reads.
+    """
+    def __init__(self, source, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+
+        if hasattr(source, 'read') and not isinstance(source, mmap.mmap):
+            self.file = source
+            self.window = source.read(chunk_size)
+            self.eof = len(self.window) == 0
+        else:
+            self.file = None
+            self.window = source  # matched in place, mmap pages come and go as the OS likes
+            self.eof = True
+
+        self.text = isinstance(self.window, str)
+        self.base = 0  # absolute offset of window[0]
+        self.pos = 0
+        self.tokens = self.scan()
+
+    @classmethod
+    def from_path(cls, path, chunk_size=CHUNK_SIZE):
+        with open(path, 'rb') as f:
+            try:
+                source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty files cannot be mapped
+                source = b''
+
+        return cls(source, chunk_size=chunk_size)
+
+    def offset(self):
+        return self.base + self.pos
+
+    def next_token(self):
+        return next(self.tokens)
+
+    def refill(self):
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+
+        self.window = self.window[self.pos:] + chunk
+        self.base += self.pos
+        self.pos = 0
+
+    def scan(self):
+        if self.text:
+            pattern = master_pattern
+            lookup_keyword = keywords.get
+            lookup_operator = operators.get
+        else:
+            pattern = bytes_pattern
+            lookup_keyword = bytes_keywords.get
+            lookup_operator = bytes_operators.get
+
+        while True:
+            match = pattern.match(self.window, self.pos)
+            kind = match.lastindex
+
+            if not self.eof and (kind == COMMENT or match.end() + LOOKAHEAD > len(self.window)):
+                self.refill()
+                continue
+
+            self.pos = match.end()
+            start = self.base + match.start(kind)
+            end = self.base + self.pos
+
+            if kind == IDENT:
+                literal = match.group(IDENT)
+                keyword = lookup_keyword(literal)
+                if keyword is None:
+                    yield Token(TokenType.IDENT, self.decode(literal), start, end)
+                elif self.text:
+                    yield Token(keyword, literal, start, end)
+                else:
+                    yield Token(*keyword, start, end)
+            elif kind == OPERATOR:
+                literal = match.group(OPERATOR)
+                if self.text:
+                    yield Token(lookup_operator(literal), literal, start, end)
+                else:
+                    yield Token(*lookup_operator(literal), start, end)
+            elif kind == NUMBER:
+                yield Token(TokenType.INT, self.decode(match.group(NUMBER)), start, end)
+            elif kind == EOF:
+                break
+            elif kind == COMMENT:
+                error('Unexpected end of file')
+            else:
+                error('Illegal character ' + self.decode(match.group(ILLEGAL)))
+
+        while True:
+            yield Token(TokenType.EOF, "", self.offset(), self.offset())
+
+    def decode(self, literal):
+        return literal if self.text else literal.decode('utf-8')
@@ -0,0 +1,115 @@
+from array import array
+
+from monkey.tok.tok import Token, TokenType, keywords, token_kinds, kind_of
+from monkey.lexer.lexer import error
+from monkey.lexer.regex_lexer import (
+    operators,
+    master_pattern,
+    NUMBER,
+    IDENT,
+    COMMENT,
+    OPERATOR,
+    EOF,
+    ILLEGAL,
+)
+
+IDENT_KIND = kind_of[TokenType.IDENT]
+INT_KIND = kind_of[TokenType.INT]
+EOF_KIND = kind_of[TokenType.EOF]
+
+keyword_kinds = {literal: kind_of[t] for literal, t in keywords.items()}
+operator_kinds = {literal: kind_of[t] for literal, t in operators.items()}
+
+# Literal of every token kind whose spelling never changes; None means "slice the source".
+fixed_literals = [None] * len(token_kinds)
+for literal, kind in list(keyword_kinds.items()) + list(operator_kinds.items()):
+    fixed_literals[kind] = literal
+fixed_literals[EOF_KIND] = ""
+
+
+class TokenBuffer:
+    """
+    Columnar token stream: kinds[i], starts[i] and ends[i] describe token i,
+    its literal is source[starts[i]:ends[i]] and is only built when asked for.
+    The last token is always EOF.
+    """
+    def __init__(self, source, kinds, starts, ends):
+        self.source = source
+        self.kinds = kinds
+        self.starts = starts
+        self.ends = ends
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def type(self, i):
+        return token_kinds[self.kinds[i]]
+
+    def literal(self, i):
+        return self.source[self.starts[i]:self.ends[i]]
+
+    def token(self, i):
+        kind = self.kinds[i]
+        literal = fixed_literals[kind]
+        if literal is None:
+            literal = self.source[self.starts[i]:self.ends[i]]
+        return Token(token_kinds[kind], literal, self.starts[i], self.ends[i])
+
+    def cursor(self):
+        return TokenCursor(self)
+
+
+class TokenCursor:
+    """
+    Feeds a TokenBuffer to the parsers through the usual next_token() call.
+    """
+    def __init__(self, buffer, index=0):
+        self.buffer = buffer
+        self.index = index
+        self.last = len(buffer) - 1
+        self.input = buffer.source
+
+    def next_token(self):
+        i = self.index
+        if i < self.last:
+            self.index = i + 1
+        return self.buffer.token(i)
+
+
+def tokenize_all(source, pos=0, endpos=None):
+    if endpos is None:
+        endpos = len(source)
+
+    kinds = array('H')
+    starts = array('I')
+    ends = array('I')
+
+    add_kind = kinds.append
+    add_start = starts.append
+    add_end = ends.append
+    lookup_keyword = keyword_kinds.get
+
+    for match in master_pattern.finditer(source, pos, endpos):
+        kind = match.lastindex
+
+        if kind == IDENT:
+            add_kind(lookup_keyword(match.group(IDENT), IDENT_KIND))
+        elif kind == OPERATOR:
+            add_kind(operator_kinds[match.group(OPERATOR)])
+        elif kind == NUMBER:
+            add_kind(INT_KIND)
+        elif kind == EOF:
+            break
+        elif kind == COMMENT:
+            error('Unexpected end of file')
+        else:
+            error('Illegal character ' + match.group(ILLEGAL))
+
+        add_start(match.start(kind))
+        add_end(match.end(kind))
+
+    add_kind(EOF_KIND)
+    add_start(endpos)
+    add_end(endpos)
+
+    return TokenBuffer(source, kinds, starts, ends)
@@ -1,4 +1,6 @@
 class Environment:
+    __slots__ = ('store', 'outer')
+
     def __init__(self):
         self.store = {}
         self.outer = None
@@ -1,20 +1,36 @@
+import io
 from enum import Enum
 
+from monkey.ast.printer import Printer
+
 
 class Type(Enum):
-    INTEGER_OBJ = "INTEGER",
-    BOOLEAN_OBJ = "BOOLEAN",
-    NULL_OBJ = "NULL",
+    INTEGER_OBJ = "INTEGER"
+    BOOLEAN_OBJ = "BOOLEAN"
+    NULL_OBJ = "NULL"
     RETURN_VALUE_OBJ = "RETURN_VALUE"
     ERROR_OBJ = "ERROR"
     FUNCTION_OBJ = "FUNCTION"
 
 
+# Class-level tags of the object classes. The evaluators compare these ints
+# (and the TRUE/FALSE/NULL singletons by identity); type() is left for messages.
+INTEGER_TAG = 1
+BOOLEAN_TAG = 2
+NULL_TAG = 3
+RETURN_VALUE_TAG = 4
+ERROR_TAG = 5
+FUNCTION_TAG = 6
+
+
 class ObjectType:
-    pass
+    __slots__ = ()
 
 
 class Object:
+    __slots__ = ()
+    tag = None
+
     def type(self):
         pass
 
@@ -23,6 +39,9 @@ class Object:
 
 
 class Integer(Object):
+    __slots__ = ('value',)
+    tag = INTEGER_TAG
+
     def __init__(self, value=None):
         self.value = value
 
@@ -33,7 +52,23 @@ class Integer(Object):
         return Type.INTEGER_OBJ
 
 
+class SmallIntegers:
+    """
+    One shared Integer for each value from low to high. Integers are never
+    changed once made, so results in that range need not allocate.
+    """
+    __slots__ = ('low', 'high', 'objects')
+
+    def __init__(self, low=-256, high=4096):
+        self.low = low
+        self.high = high
+        self.objects = [Integer(value=value) for value in range(low, high + 1)]
+
+
 class Boolean(Object):
+    __slots__ = ('value',)
+    tag = BOOLEAN_TAG
+
     def __init__(self, value=None):
         self.value = value
 
@@ -45,6 +80,9 @@ class Boolean(Object):
 
 
 class Null(Object):
+    __slots__ = ('value',)
+    tag = NULL_TAG
+
     def __init__(self):
         self.value = None
 
@@ -56,6 +94,9 @@ class Null(Object):
 
 
 class ReturnValue(Object):
+    __slots__ = ('value',)
+    tag = RETURN_VALUE_TAG
+
     def __init__(self, value):
         self.value = value
 
@@ -67,6 +108,9 @@ class ReturnValue(Object):
 
 
 class Error(Object):
+    __slots__ = ('message',)
+    tag = ERROR_TAG
+
     def __init__(self, message):
         self.message = message
 
@@ -78,22 +122,30 @@ class Error(Object):
 
 
 class Function(Object):
-    def __init__(self, parameters, body, env):
+    __slots__ = ('parameters', 'body', 'env', 'literal')
+    tag = FUNCTION_TAG
+
+    def __init__(self, parameters, body, env, literal=None):
         self.parameters = parameters
         self.body = body
         self.env = env
+        # FunctionLiteral whose body has not been parsed yet (body is None)
+        self.literal = literal
 
     def inspect(self):
-        out = ""
-        params = []
-        for p in self.parameters:
-            params.append(p.string())
-
-        out += "fn"
-        out += "("
-        out += ", ".join(params)
-        out += '\n'
-        out += self.body.string()
-        out += '\n'
-
-        return out
\ No newline at end of file
+        if self.body is None:
+            self.literal.load_body()
+            self.body = self.literal.body
+
+        out = io.StringIO()
+        printer = Printer(out)
+        out.write("fn(")
+        for i, p in enumerate(self.parameters):
+            if i:
+                out.write(", ")
+            printer.write(p)
+        out.write('\n')
+        printer.write(self.body)
+        out.write('\n')
+
+        return out.getvalue()
\ No newline at end of file
@@ -0,0 +1,193 @@
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+
+from monkey.ast import serialize
+from monkey.ast.ast import walk
+from monkey.lexer.lexer import Lexer
+from monkey.lexer.regex_lexer import RegexLexer
+from monkey.parser import cfg_parser, pratt_parser
+from monkey.parser.stack_parser import StackParser
+
+parser_flavors = {
+    'pratt': pratt_parser.Parser,
+    'cfg': cfg_parser.Parser,
+    'stack': StackParser,
+}
+
+
+def source_digest(source):
+    return hashlib.blake2b(source.encode('utf-8'), digest_size=16).digest()
+
+
+def estimate_size(program):
+    """
+    Rough bytes held by a Program: every node, its token and its node lists.
+    """
+    size = 0
+    for node in walk(program):
+        size += sys.getsizeof(node)
+        token = getattr(node, 'token', None)
+        if token is not None:
+            size += sys.getsizeof(token) + sys.getsizeof(token.literal)
+        for field in node.child_fields:
+            child = getattr(node, field)
+            if type(child) is list or type(child) is tuple:
+                size += sys.getsizeof(child)
+    return size
+
+
+class ParseCache:
+    """
+    Bounded, thread-safe LRU cache of parsed programs keyed by a digest of
+    the source and the parser flavor ('pratt', 'cfg' or 'stack').
+
+    The Program handed out is shared by every caller that asks for the same
+    source: its statements are a tuple and nothing in it may be changed.
+    The cache holds at most max_entries programs and, when max_bytes is set,
+    at most that many estimated AST bytes (see estimate_size()).
+    """
+    def __init__(self, max_entries=1024, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # (digest, flavor) -> (program, errors, size)
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def parse(self, source, flavor='pratt'):
+        """
+        Return (program, errors) for source, parsing it only on a miss.
+        """
+        key = (source_digest(source), flavor)
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0], entry[1]
+            self.misses += 1
+
+        # parse outside the lock so other sources are served meanwhile
+        parser = parser_flavors[flavor](Lexer(source))
+        program = parser.parse_program()
+        program.statements = tuple(program.statements)
+        errors = tuple(parser.errors)
+        size = estimate_size(program)
+
+        with self.lock:
+            if key not in self.entries:
+                self.entries[key] = (program, errors, size)
+                self.size += size
+                self.evict()
+            else:
+                program, errors, _ = self.entries[key]  # another thread got here first
+
+        return program, errors
+
+    def evict(self):
+        # called with the lock held; the newest entry always stays
+        while len(self.entries) > 1 and (
+            len(self.entries) > self.max_entries
+            or self.max_bytes is not None and self.size > self.max_bytes
+        ):
+            _, (_, _, size) = self.entries.popitem(last=False)
+            self.size -= size
+            self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def stats(self):
+        with self.lock:
+            return {
+                'entries': len(self.entries),
+                'bytes': self.size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+class CompileCache:
+    """
+    On-disk cache of parsed programs, like __pycache__: one file per source
+    and parser flavor in directory, holding the tree in the compact format of
+    monkey.ast.serialize. A file is used only when its header carries the
+    current format version and the digest of the source, anything else is
+    parsed again and the file rewritten. Writes go to a temporary file that
+    is renamed into place, so readers never see half a file. fn bodies are
+    decoded on first use; one found corrupt then is parsed again from the
+    source and the file removed, to be rewritten by the next miss.
+
+    Programs with parse errors are not stored.
+    """
+    def __init__(self, directory, flavor='pratt'):
+        self.directory = directory
+        self.flavor = flavor
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, digest):
+        name = f'{digest.hex()}.{self.flavor}.v{serialize.FORMAT_VERSION}.mkc'
+        return os.path.join(self.directory, name)
+
+    def parse(self, source):
+        """
+        Return (program, errors) for source, from the cache when possible.
+        """
+        digest = source_digest(source)
+        path = self.path(digest)
+
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            if serialize.read_header(data) == digest:
+                program = serialize.loads(data, reparse=lambda literal: self.reparse(source, path, literal))
+                self.hits += 1
+                return program, []
+        except (OSError, serialize.FormatError):
+            pass
+
+        self.misses += 1
+        parser = parser_flavors[self.flavor](Lexer(source))
+        program = parser.parse_program()
+        if not parser.errors:
+            self.store(path, serialize.dumps(program, digest))
+        return program, parser.errors
+
+    def reparse(self, source, path, literal):
+        # (body, errors) of a fn literal whose stored body is damaged
+        self.misses += 1
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        parser = parser_flavors[self.flavor](RegexLexer(source, literal.start, literal.end))
+        function = parser.parse_program().statements[0].expression
+        return function.body, parser.errors
+
+    def store(self, path, data):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            # a read-only or full cache directory only costs the next start a parse
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
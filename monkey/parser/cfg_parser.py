@@ -1,4 +1,5 @@
 from monkey.tok.tok import TokenType
+from monkey.tok.position import LineIndex, describe_position
 
 from monkey.ast.ast import (
     Program,
@@ -18,12 +19,22 @@ from monkey.ast.ast import (
 )
 
 
+class ParseError(Exception):
+    pass
+
+
 class Parser:
-    def __init__(self, lexer):
+    def __init__(self, lexer, recover=False, interner=None):
         self.lexer = lexer
+        # panic mode: on the first error of a statement skip to a safe point and go on
+        self.recover = recover
+        # monkey.ast.intern.Interner sharing identical subtrees
+        self.interner = interner
+        self.prev_token = None
         self.cur_token = None
         self.peek_token = None
         self.errors = []
+        self.line_index = None
         self.next_token()
         self.next_token()
 
@@ -32,44 +43,104 @@ class Parser:
             self.next_token()
         else:
             msg = f'expected token to be {token_type}, got {self.cur_token.type} instead'
-            self.errors.append(msg)
+            self.error(msg, self.cur_token)
+
+    def error(self, msg, token):
+        self.errors.append(msg + self.position(token))
+        if self.recover:
+            raise ParseError(msg)
+
+    def synchronize(self, start_token):
+        """
+        Skip tokens up to the next statement: past a ';', or up to a '}', 'let', 'return' or EOF.
+        """
+        if self.cur_token is start_token:
+            self.next_token()  # always make progress
+
+        sync = (TokenType.RBRACE, TokenType.LET, TokenType.RETURN, TokenType.EOF)
+        while self.cur_token.type not in sync:
+            if self.cur_token.type == TokenType.SEMICOLON:
+                self.next_token()
+                return
+            self.next_token()
 
     def next_token(self):
+        self.prev_token = self.cur_token
         self.cur_token = self.peek_token
         self.peek_token = self.lexer.next_token()
 
+    def position(self, token):
+        if self.line_index is None and hasattr(self.lexer, 'input'):
+            self.line_index = LineIndex(self.lexer.input)
+        return describe_position(self.line_index, token.start)
+
+    def mark(self, node, start):
+        # the last token of a construct is prev_token once it has been eaten
+        if node is not None and node.structural_hash is None:
+            node.start = start
+            node.end = self.prev_token.end
+            if self.interner is not None:
+                node = self.interner.intern(node)
+        return node
+
     def program(self):
         """
         program ::= (statement)+ EOF
         """
         program = Program()
+        program.start = self.cur_token.start
+        program.statements.extend(self.parse_statements())
+
+        program.end = self.cur_token.end
+        return program
+
+    def parse_statements(self):
+        """
+        Yield the top-level statements one at a time, so a caller can run and
+        drop each one before the next is parsed. self.errors grows as they come.
+        """
         while self.cur_token.type != TokenType.EOF:
             statement = self.statement()
             if statement is not None:
-                program.statements.append(statement)
-
-        return program
+                yield statement
 
     def block(self):
         block = BlockStatement(token=self.cur_token)
         self.eat(TokenType.LBRACE)
 
         while self.cur_token.type != TokenType.RBRACE:
+            if self.recover and self.cur_token.type == TokenType.EOF:
+                break  # eat() reports the missing '}'
             statement = self.statement()
             if statement is not None:
                 block.statements.append(statement)
 
         self.eat(TokenType.RBRACE)
 
-        return block
+        return self.mark(block, block.token.start)
 
     def statement(self):
+        if self.recover:
+            start_token = self.cur_token
+            try:
+                return self.parse_statement()
+            except ParseError:
+                self.synchronize(start_token)
+                return None
+
+        return self.parse_statement()
+
+    def parse_statement(self):
+        start = self.cur_token.start
+
         if self.cur_token.type == TokenType.LET:
-            return self.let_statement()
+            stmt = self.let_statement()
         elif self.cur_token.type == TokenType.RETURN:
-            return self.return_statement()
+            stmt = self.return_statement()
         else:
-            return self.expression_statement()
+            stmt = self.expression_statement()
+
+        return self.mark(stmt, start)
 
     def expression_statement(self):
         stmt = ExpressionStatement(token=self.cur_token)
@@ -109,6 +180,7 @@ class Parser:
         return exp
 
     def equality(self):
+        start = self.cur_token.start
         equ = self.comparison()
         while self.cur_token.type in (TokenType.EQ, TokenType.NOT_EQ):
             tok = self.cur_token
@@ -119,10 +191,12 @@ class Parser:
                 operator=tok.literal,
                 right=self.comparison(),
             )
+            equ = self.mark(equ, start)
 
         return equ
 
     def comparison(self):
+        start = self.cur_token.start
         comp = self.term()
         while self.cur_token.type in (TokenType.LT, TokenType.GT):
             tok = self.cur_token
@@ -133,10 +207,12 @@ class Parser:
                 operator=tok.literal,
                 right=self.comparison(),
             )
+            comp = self.mark(comp, start)
 
         return comp
 
     def term(self):
+        start = self.cur_token.start
         exp = self.factor()
 
         while self.cur_token.type in (TokenType.PLUS, TokenType.MINUS):
@@ -148,10 +224,12 @@ class Parser:
                 left=exp,
                 right=self.factor(),
             )
+            exp = self.mark(exp, start)
 
         return exp
 
     def factor(self):
+        start = self.cur_token.start
         unary = self.unary()
         while self.cur_token.type in (TokenType.ASTERISK, TokenType.SLASH):
             tok = self.cur_token
@@ -162,6 +240,7 @@ class Parser:
                 left=unary,
                 right=self.unary(),
             )
+            unary = self.mark(unary, start)
 
         return unary
 
@@ -169,11 +248,13 @@ class Parser:
         if self.cur_token.type in (TokenType.MINUS, TokenType.BANG):
             operator = self.cur_token
             self.eat(self.cur_token.type)
-            return PrefixExpression(token=self.cur_token, operator=operator.literal, right=self.unary())
+            prefix = PrefixExpression(token=self.cur_token, operator=operator.literal, right=self.unary())
+            return self.mark(prefix, operator.start)
         else:
             return self.call()
 
     def call(self):
+        start = self.cur_token.start
         primary = self.primary()
 
         if self.cur_token.type == TokenType.LPAREN:
@@ -187,6 +268,7 @@ class Parser:
                 primary.arguments = self.parse_call_arguments()
 
             self.eat(TokenType.RPAREN)
+            primary = self.mark(primary, start)
 
         return primary
 
@@ -204,15 +286,15 @@ class Parser:
 
         if tok.type in (TokenType.TRUE, TokenType.FALSE):
             self.eat(tok.type)
-            return Boolean(token=tok, value=(tok.type == TokenType.TRUE))
+            return self.mark(Boolean(token=tok, value=(tok.type == TokenType.TRUE)), tok.start)
 
         elif tok.type == TokenType.NULL:
             self.eat(tok.type)
-            return Boolean(token=tok, value=None)
+            return self.mark(Boolean(token=tok, value=None), tok.start)
 
         elif tok.type == TokenType.INT:
             self.eat(TokenType.INT)
-            return IntegerLiteral(token=tok, value=int(tok.literal))
+            return self.mark(IntegerLiteral(token=tok, value=int(tok.literal)), tok.start)
 
         elif tok.type == TokenType.IDENT:
             return self.identifier()
@@ -221,7 +303,7 @@ class Parser:
             self.eat(TokenType.LPAREN)
             exp = self.expression()
             self.eat(TokenType.RPAREN)
-            return exp
+            return self.mark(exp, tok.start)
 
         elif tok.type == TokenType.FUNCTION:
             return self.function_literal()
@@ -229,6 +311,11 @@ class Parser:
         elif tok.type == TokenType.IF:
             return self.if_expression()
 
+        elif self.recover:
+            if tok.type == TokenType.ILLEGAL:
+                self.error(f'illegal character {tok.literal}', tok)
+            self.error(f'no prefix parse function for {tok.type} found', tok)
+
     def if_expression(self):
         if_exp = IfExpression(token=self.cur_token)
         self.eat(TokenType.IF)
@@ -243,7 +330,7 @@ class Parser:
             self.eat(TokenType.ELSE)
             if_exp.alternative = self.block()
 
-        return if_exp
+        return self.mark(if_exp, if_exp.token.start)
 
     def function_literal(self):
         lit = FunctionLiteral(
@@ -259,7 +346,7 @@ class Parser:
 
         lit.body = self.block()
 
-        return lit
+        return self.mark(lit, lit.token.start)
 
     def parse_function_parameters(self):
 
@@ -278,11 +365,11 @@ class Parser:
         )
         self.eat(TokenType.IDENT)
 
-        return ident
+        return self.mark(ident, ident.token.start)
 
     def parse_program(self):
         program = self.program()
         if self.cur_token.type != TokenType.EOF:
-            self.errors.append(f'Unexpected token {self.cur_token.type}')
+            self.errors.append(f'Unexpected token {self.cur_token.type}' + self.position(self.cur_token))
 
         return program
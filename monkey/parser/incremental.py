@@ -0,0 +1,110 @@
+from bisect import bisect_left, bisect_right
+
+from monkey.ast.ast import walk
+from monkey.lexer.regex_lexer import RegexLexer
+from monkey.lexer.token_buffer import tokenize_all
+from monkey.parser.pratt_parser import Parser
+from monkey.tok.tok import TokenType, kind_of
+
+LBRACE_KIND = kind_of[TokenType.LBRACE]
+RBRACE_KIND = kind_of[TokenType.RBRACE]
+
+
+class Document:
+    """
+    Keeps a source text and its Program in sync under edits.
+
+    An edit relexes and reparses only the top-level statements it touches,
+    every other Statement subtree is reused as is. starts/ends hold the
+    current span of each top-level statement; the spans stored on the nodes
+    of a reused statement are shifted lazily, the first time self.program is
+    read after the edit.
+    """
+    def __init__(self, source, parser_class=Parser):
+        self.parser_class = parser_class
+        self.reparse(source)
+
+    def reparse(self, source):
+        self.source = source
+        parser = self.parser_class(RegexLexer(source))
+        self._program = parser.parse_program()
+        self.errors = parser.errors
+        self.starts = [stmt.start for stmt in self._program.statements]
+        self.ends = [stmt.end for stmt in self._program.statements]
+
+    @property
+    def program(self):
+        for i, stmt in enumerate(self._program.statements):
+            delta = self.starts[i] - stmt.start
+            if delta != 0:
+                for node in walk(stmt):
+                    if node.start is not None:
+                        node.start += delta
+                        node.end += delta
+        return self._program
+
+    def edit(self, offset, removed, inserted):
+        """
+        Replace source[offset:offset + removed] with inserted and return the
+        top-level statements that had to be parsed again.
+        """
+        old_end = offset + removed
+        delta = len(inserted) - removed
+        source = self.source[:offset] + inserted + self.source[old_end:]
+
+        if self.errors:
+            self.reparse(source)
+            return self._program.statements
+
+        statements = self._program.statements
+        count = len(statements)
+
+        first = bisect_left(self.ends, offset)  # the statement just before the edit may grow
+        last = bisect_right(self.starts, old_end) - 1
+
+        # only a ';' is sure to end a statement, anything else may be continued by what follows
+        while first > 0 and self.source[self.ends[first - 1] - 1] != ';':
+            first -= 1
+
+        region_start = self.ends[first - 1] if first > 0 else 0
+
+        while True:
+            region_end = self.starts[last + 1] + delta if last + 1 < count else len(source)
+
+            try:
+                tokens = tokenize_all(source, region_start, region_end)
+            except Exception:  # e.g. a '//' comment now running past region_end
+                if last + 1 < count:
+                    last += 1
+                    continue
+                raise
+
+            # an unclosed '{' silently runs to EOF, so the region has to take in what follows
+            balanced = tokens.kinds.count(LBRACE_KIND) == tokens.kinds.count(RBRACE_KIND)
+
+            parser = self.parser_class(tokens.cursor())
+            region = parser.parse_program().statements
+
+            if (not balanced or region and source[region[-1].end - 1] != ';') and last + 1 < count:
+                last += 1
+                continue
+
+            break
+
+        if parser.errors:
+            self.reparse(source)
+            return self._program.statements
+
+        self.source = source
+        statements[first:last + 1] = region
+        self.starts[first:last + 1] = [stmt.start for stmt in region]
+        self.ends[first:last + 1] = [stmt.end for stmt in region]
+
+        for i in range(first + len(region), len(statements)):
+            self.starts[i] += delta
+            self.ends[i] += delta
+
+        self._program.start = self.starts[0] if self.starts else len(source)
+        self._program.end = len(source)
+
+        return region
@@ -0,0 +1,143 @@
+"""
+Parallel front end: lexes and parses on a pool of processes.
+
+parse_files() parses many files, one task per file, and returns their
+trees serialized with monkey.ast.serialize, which crosses the process
+boundary far cheaper than pickled nodes.
+
+parse_source() parses one large source by cutting it at top-level ';'
+into about one chunk per task, parsing the chunks side by side and joining
+their statements into one Program. Each worker gets the whole source once
+and lexes only its span of it, so offsets, spans and the line numbers in
+error messages are the same as for a parse of the whole source. A
+malformed source, where the brackets do not balance or a chunk has errors,
+is parsed again in one piece, as a chunk boundary can change how the
+parser recovers.
+"""
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from monkey.ast import serialize
+from monkey.ast.ast import Program
+from monkey.lexer.regex_lexer import RegexLexer
+from monkey.parser.cache import parser_flavors, source_digest
+
+# what the prescan has to see: comments (which may hold anything), brackets and ';'
+boundary_pattern = re.compile(r'//[^\n]*|[(){};]')
+
+# below this many characters per chunk a source is parsed in this process
+MIN_CHUNK = 64 * 1024
+
+# chunks per worker, so a slow chunk does not leave the other cores idle
+CHUNKS_PER_WORKER = 4
+
+
+def parse_file(path, flavor='pratt'):
+    """
+    Parse one file, return (path, serialized program, errors).
+    """
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    parser = parser_flavors[flavor](RegexLexer(source))
+    program = parser.parse_program()
+    return path, serialize.dumps(program, source_digest(source)), parser.errors
+
+
+def parse_files(paths, flavor='pratt', workers=None):
+    """
+    Parse every file in paths on workers processes (os.cpu_count() by
+    default) and return a list of (path, serialized program, errors) in the
+    order of paths. serialize.loads() turns the data back into a Program.
+    """
+    paths = list(paths)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(paths) < 2:
+        return [parse_file(path, flavor) for path in paths]
+
+    chunksize = max(1, len(paths) // (workers * CHUNKS_PER_WORKER))
+    with ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(parse_file, paths, [flavor] * len(paths), chunksize=chunksize))
+
+
+def split_points(source, count):
+    """
+    Offsets just past a top-level ';' that cut source into at most count
+    chunks of about the same size. A ';' is top-level when it is outside of
+    any parentheses, braces and comments; every statement in front of it is
+    complete there. There are no cuts when the brackets of source do not
+    balance, as then no ';' is sure to be top-level.
+    """
+    if count < 2:
+        return []
+
+    size = len(source)
+    targets = [size * i // count for i in range(1, count)]
+    cuts = []
+    depth = 0
+
+    for match in boundary_pattern.finditer(source):
+        ch = match.group()
+        if ch == ';':
+            if depth == 0 and len(cuts) < len(targets) and match.start() >= targets[len(cuts)]:
+                cuts.append(match.end())
+        elif ch == '(' or ch == '{':
+            depth += 1
+        elif ch == ')' or ch == '}':
+            depth -= 1
+            if depth < 0:
+                return []
+
+    return cuts if depth == 0 else []
+
+
+# the source parse_range() works on, set in each worker by init_worker()
+worker_source = None
+
+
+def init_worker(source):
+    global worker_source
+    worker_source = source
+
+
+def parse_range(flavor, start, end):
+    parser = parser_flavors[flavor](RegexLexer(worker_source, start, end))
+    program = parser.parse_program()
+    return serialize.dumps(program), parser.errors
+
+
+def parse_source(source, flavor='pratt', workers=None):
+    """
+    Return (program, errors) for source like a parser would, parsing
+    chunks of it on workers processes. fn bodies are decoded on first use.
+    A source with errors is parsed a second time, in this process.
+    """
+    workers = workers or os.cpu_count() or 1
+    count = min(workers * CHUNKS_PER_WORKER, len(source) // MIN_CHUNK)
+    cuts = split_points(source, count) if workers > 1 else []
+
+    if not cuts:
+        return parse_whole(source, flavor)
+
+    bounds = [0] + cuts + [len(source)]
+    with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(source,)) as pool:
+        results = list(pool.map(parse_range, [flavor] * (len(bounds) - 1), bounds[:-1], bounds[1:]))
+
+    if any(chunk_errors for _, chunk_errors in results):
+        return parse_whole(source, flavor)
+
+    program = Program()
+    for i, (data, _) in enumerate(results):
+        chunk = serialize.loads(data)
+        program.statements.extend(chunk.statements)
+        if i == 0:
+            program.start = chunk.start
+        program.end = chunk.end
+
+    return program, []
+
+
+def parse_whole(source, flavor):
+    parser = parser_flavors[flavor](RegexLexer(source))
+    return parser.parse_program(), parser.errors
@@ -1,3 +1,5 @@
+from itertools import chain
+
 from monkey.ast.ast import (
     Program,
     LetStatement,
@@ -15,67 +17,86 @@ from monkey.ast.ast import (
     NullLiteral,
 )
 
+from monkey.lexer.regex_lexer import RegexLexer
 from monkey.tok.tok import TokenType
+from monkey.tok.position import LineIndex, describe_position
+
 
-from enum import Enum
+class Precedence:
+    # plain ints so binding powers compare without any unwrapping
+    LOWEST = 1
+    EQUALS = 2  # ==
+    LESSGREATER = 3  # < or >
+    SUM = 4  # +
+    PRODUCT = 5  # *
+    PREFIX = 6  # -X or !X
+    CALL = 7  # myFunction(X)
 
 
-class Precedence(Enum):
-    LOWEST = 1,
-    EQUALS = 2,  # ==
-    LESSGREATER = 3,  # < or >
-    SUM = 4,  # +
-    PRODUCT = 5,  # *
-    PREFIX = 6,  # -X or !X
-    CALL = 7,  # myFunction(X)
+# what skip_block_statement() has open: blocks, then parentheses
+BLOCK = 0
+IF_BLOCK = 1
+ARGUMENTS = 2
+GROUP = 3
+IF_HEADER = 4
 
 
 class Parser:
-    def __init__(self, lexer):
+    # precedence table
+    precedence = {
+        TokenType.EQ: Precedence.EQUALS,
+        TokenType.NOT_EQ: Precedence.EQUALS,
+        TokenType.LT: Precedence.LESSGREATER,
+        TokenType.GT: Precedence.LESSGREATER,
+        TokenType.PLUS: Precedence.SUM,
+        TokenType.MINUS: Precedence.SUM,
+        TokenType.SLASH: Precedence.PRODUCT,
+        TokenType.ASTERISK: Precedence.PRODUCT,
+        TokenType.LPAREN: Precedence.CALL,
+    }
+
+    # token classes for skip_block_statement()
+    operator_types = {
+        TokenType.PLUS, TokenType.MINUS, TokenType.ASTERISK, TokenType.SLASH,
+        TokenType.LT, TokenType.GT, TokenType.EQ, TokenType.NOT_EQ,
+    }
+    # after these the parser reads a '}' as the missing operand and steps over it
+    operand_expected = operator_types | {
+        TokenType.ASSIGN, TokenType.BANG, TokenType.RETURN, TokenType.LPAREN, TokenType.COMMA,
+    }
+    operand_types = {
+        TokenType.IDENT, TokenType.INT, TokenType.TRUE, TokenType.FALSE, TokenType.NULL,
+        TokenType.LPAREN, TokenType.BANG, TokenType.MINUS, TokenType.FUNCTION, TokenType.IF,
+    }
+    structure_types = {
+        TokenType.LBRACE, TokenType.RBRACE, TokenType.LPAREN, TokenType.RPAREN,
+        TokenType.ELSE, TokenType.IF, TokenType.FUNCTION, TokenType.EOF,
+    }
+    operand_end_types = {
+        TokenType.IDENT, TokenType.INT, TokenType.TRUE, TokenType.FALSE, TokenType.NULL,
+        TokenType.RPAREN, TokenType.RBRACE,
+    }
+
+    # parsing function dictionaries (prefix_parse_fns, infix_parse_fns) are
+    # built once at the end of the class body and shared by every instance.
+
+    def __init__(self, lexer, lazy_bodies=False, interner=None):
+        # only match the braces of fn bodies and parse them on first call,
+        # needs a lexer exposing its source as `input`
+        self.lazy_bodies = lazy_bodies
+        # monkey.ast.intern.Interner sharing identical subtrees
+        self.interner = interner
+        self.reset(lexer)
+
+    def reset(self, lexer):
+        """
+        Get ready to parse a new input, so one parser can serve many snippets.
+        """
         self.lexer = lexer
         self.cur_token = None
         self.peek_token = None
         self.errors = []
-
-        # parsing function dictionary
-        self.prefix_parse_fns = {}
-        self.infix_parse_fns = {}
-
-        # precedence table
-        self.precedence = {
-            TokenType.EQ: Precedence.EQUALS,
-            TokenType.NOT_EQ: Precedence.EQUALS,
-            TokenType.LT: Precedence.LESSGREATER,
-            TokenType.GT: Precedence.LESSGREATER,
-            TokenType.PLUS: Precedence.SUM,
-            TokenType.MINUS: Precedence.SUM,
-            TokenType.SLASH: Precedence.PRODUCT,
-            TokenType.ASTERISK: Precedence.PRODUCT,
-            TokenType.LPAREN: Precedence.CALL,
-        }
-
-        # register prefix tokens
-        self.register_prefix_function(TokenType.IDENT, self.parse_identifier)
-        self.register_prefix_function(TokenType.NULL, self.parse_null_literal)
-        self.register_prefix_function(TokenType.INT, self.parse_integer_literal)
-        self.register_prefix_function(TokenType.BANG, self.parse_prefix_expression)
-        self.register_prefix_function(TokenType.MINUS, self.parse_prefix_expression)
-        self.register_prefix_function(TokenType.TRUE, self.parse_boolean)
-        self.register_prefix_function(TokenType.FALSE, self.parse_boolean)
-        self.register_prefix_function(TokenType.LPAREN, self.parse_grouped_expression)
-        self.register_prefix_function(TokenType.IF, self.parse_if_expression)
-        self.register_prefix_function(TokenType.FUNCTION, self.parse_function_literal)
-
-        # register infix tokens
-        self.register_infix_function(TokenType.PLUS, self.parse_infix_expression)
-        self.register_infix_function(TokenType.MINUS, self.parse_infix_expression)
-        self.register_infix_function(TokenType.SLASH, self.parse_infix_expression)
-        self.register_infix_function(TokenType.ASTERISK, self.parse_infix_expression)
-        self.register_infix_function(TokenType.EQ, self.parse_infix_expression)
-        self.register_infix_function(TokenType.NOT_EQ, self.parse_infix_expression)
-        self.register_infix_function(TokenType.LT, self.parse_infix_expression)
-        self.register_infix_function(TokenType.GT, self.parse_infix_expression)
-        self.register_infix_function(TokenType.LPAREN, self.parse_call_expression)
+        self.line_index = None
 
         # set the current and peek token
         self.next_token()
@@ -87,15 +108,23 @@ class Parser:
 
     def parse_program(self):
         program = Program()
+        start = self.cur_token.start
+
+        program.statements.extend(self.parse_statements())
 
+        return self.mark(program, start)
+
+    def parse_statements(self):
+        """
+        Yield the top-level statements one at a time, so a caller can run and
+        drop each one before the next is parsed. self.errors grows as they come.
+        """
         while not self.cur_token_is(TokenType.EOF):
             stmt = self.parse_statement()
             if stmt is not None:
-                program.statements.append(stmt)
+                yield stmt
             self.next_token()
 
-        return program
-
     def parse_block_statement(self):
         block = BlockStatement(token=self.cur_token)
         self.next_token()  # advance the LBRACE token
@@ -106,15 +135,19 @@ class Parser:
                 block.statements.append(stmt)
             self.next_token()
 
-        return block
+        return self.mark(block, block.token.start)
 
     def parse_statement(self):
+        start = self.cur_token.start
+
         if self.cur_token.type == TokenType.LET:
-            return self.parse_let_statement()
+            stmt = self.parse_let_statement()
         elif self.cur_token.type == TokenType.RETURN:
-            return self.parse_return_statement()
+            stmt = self.parse_return_statement()
         else:
-            return self.parse_expression_statement()
+            stmt = self.parse_expression_statement()
+
+        return self.mark(stmt, start)
 
     def parse_let_statement(self):
         stmt = LetStatement(token=self.cur_token)
@@ -122,10 +155,7 @@ class Parser:
         if not self.expect_peek(TokenType.IDENT):
             return None
 
-        stmt.name = Identifier(
-            token=self.cur_token,
-            value=self.cur_token.literal,
-        )
+        stmt.name = self.parse_identifier()
 
         if not self.expect_peek(TokenType.ASSIGN):
             return None
@@ -168,10 +198,10 @@ class Parser:
             self.no_prefix_parse_fn_error(self.cur_token.type)
             return None
 
-        left_exp = prefix()
+        start = self.cur_token.start
+        left_exp = self.mark(prefix(self), start)
 
-        while not self.peek_token_is(TokenType.SEMICOLON) and \
-                int(precedence.value[0]) < int(self.peek_precedence().value[0]):
+        while not self.peek_token_is(TokenType.SEMICOLON) and precedence < self.peek_precedence():
 
             infix = self.infix_parse_fns.get(self.peek_token.type)
             if infix is None:
@@ -179,7 +209,7 @@ class Parser:
 
             self.next_token()  # eat the prefix (left expression) token.
 
-            left_exp = infix(left_exp)
+            left_exp = self.mark(infix(self, left_exp), start)
 
         return left_exp
 
@@ -243,7 +273,7 @@ class Parser:
         return expression
 
     def parse_identifier(self):
-        return Identifier(token=self.cur_token, value=self.cur_token.literal)
+        return self.mark(Identifier(token=self.cur_token, value=self.cur_token.literal), self.cur_token.start)
 
     def parse_null_literal(self):
         return NullLiteral(token=self.cur_token)
@@ -273,10 +303,162 @@ class Parser:
         if not self.expect_peek(TokenType.LBRACE): # match peek LBRACE token and advance.
             return None
 
-        lit.body = self.parse_block_statement()
+        if self.lazy_bodies and hasattr(self.lexer, 'input'):
+            lit.body_loader = self.skip_block_statement()
+        if lit.body_loader is None:
+            lit.body = self.parse_block_statement()
 
         return lit
 
+    def skip_block_statement(self):
+        """
+        Step over a block without building it and return a loader that
+        parses it later, stopping on the RBRACE that parse_block_statement()
+        would stop on.
+
+        Matching braces finds that RBRACE for well-formed bodies only: in
+        `fn() { fn(;) {} }` the parser rejects the inner header and reads
+        its `{` as a bad expression, in `fn() { 1 + }` it steps over the `}`
+        as the missing operand. So the skip follows the tokens a little
+        closer: a `{` has to open the block of an `if`, an `else` or a fn
+        with a well-formed header, the tokens in parentheses have to make
+        expressions and no `}` may follow an operator. A body breaking one
+        of these rules, or running into EOF, is parsed at once instead: the
+        skip goes back to its LBRACE and returns None. Should the loader
+        still find the body ending elsewhere, it reports that among the
+        body's errors (see FunctionLiteral.load_body).
+        """
+        source = self.lexer.input
+        start = self.cur_token.start
+        next_token = self.lexer.next_token
+        skipped = [self.cur_token]  # to go back to
+        token = self.peek_token
+        nesting = [BLOCK]  # what is open, innermost last
+        inner = BLOCK
+        previous = TokenType.LBRACE
+        needed = None  # the token a header has to go on with
+        opening = None  # the block the needed LBRACE opens
+        closed = None  # the last block closed
+
+        while True:
+            skipped.append(token)
+            token_type = token.type
+
+            if needed is not None:
+                if token_type is not needed:
+                    return self.rewind(skipped)
+                needed = None
+            elif inner >= ARGUMENTS:
+                # in parentheses an operand is followed by an operator, and the other way around
+                if previous in self.operand_end_types:
+                    if not (token_type in self.operator_types or token_type is TokenType.LPAREN
+                            or token_type is TokenType.RPAREN or token_type is TokenType.ELSE
+                            or token_type is TokenType.COMMA and inner == ARGUMENTS):
+                        return self.rewind(skipped)
+                elif not (token_type in self.operand_types
+                          or token_type is TokenType.RPAREN and previous is TokenType.LPAREN and inner == ARGUMENTS):
+                    return self.rewind(skipped)
+
+            if token_type in self.structure_types:
+                if token_type is TokenType.LBRACE:
+                    if opening is None:
+                        return self.rewind(skipped)
+                    nesting.append(opening)
+                    inner = opening
+                    opening = None
+                elif token_type is TokenType.RBRACE:
+                    if inner >= ARGUMENTS or previous in self.operand_expected:
+                        return self.rewind(skipped)
+                    closed = nesting.pop()
+                    if not nesting:
+                        break
+                    inner = nesting[-1]
+                elif token_type is TokenType.LPAREN:
+                    if previous is TokenType.FUNCTION:
+                        token = self.skip_function_parameters(next_token, skipped)
+                        if token is None:
+                            return self.rewind(skipped)
+                        token_type = token.type
+                        needed = TokenType.LBRACE
+                        opening = BLOCK
+                    else:
+                        if previous is TokenType.IF:
+                            inner = IF_HEADER
+                        elif previous in self.operand_end_types:
+                            inner = ARGUMENTS
+                        else:
+                            inner = GROUP
+                        nesting.append(inner)
+                elif token_type is TokenType.RPAREN:
+                    if inner < ARGUMENTS:
+                        return self.rewind(skipped)
+                    if nesting.pop() == IF_HEADER:
+                        needed = TokenType.LBRACE
+                        opening = IF_BLOCK
+                    inner = nesting[-1]
+                elif token_type is TokenType.ELSE:
+                    if previous is not TokenType.RBRACE or closed != IF_BLOCK:
+                        return self.rewind(skipped)
+                    needed = TokenType.LBRACE
+                    opening = BLOCK
+                elif token_type is TokenType.EOF:
+                    return self.rewind(skipped)
+                else:  # IF or FUNCTION
+                    needed = TokenType.LPAREN
+
+            previous = token_type
+            token = next_token()
+
+        self.cur_token = token
+        self.peek_token = next_token()
+        end = token.end
+        parser_class = type(self)
+
+        def load():
+            # relexing the span of the full source keeps offsets and line numbers absolute
+            parser = parser_class(RegexLexer(source, start, end), lazy_bodies=True)
+            body = parser.parse_block_statement()
+            if parser.cur_token.end != end:
+                msg = 'function body ends before the brace it was skipped to'
+                parser.errors.append(msg + parser.position(parser.cur_token))
+            return body, parser.errors
+
+        return load
+
+    def skip_function_parameters(self, next_token, skipped):
+        """
+        Step over the parameters of a fn header after its LPAREN, adding
+        the tokens to skipped, and return its RPAREN. None where
+        parse_function_parameters() would fail; it takes any token for a
+        name, so only the commas matter.
+        """
+        token = next_token()
+        skipped.append(token)
+        if token.type is TokenType.RPAREN:
+            return token
+
+        while token.type is not TokenType.EOF:
+            token = next_token()
+            skipped.append(token)
+            if token.type is TokenType.RPAREN:
+                return token
+            if token.type is not TokenType.COMMA:
+                return None
+            token = next_token()
+            skipped.append(token)
+        return None
+
+    def rewind(self, tokens):
+        """
+        Make tokens, read from the lexer since cur_token (their first),
+        come again, and return None.
+        """
+        lexer = self.lexer
+        self.lexer = Replay(chain(tokens[2:], iter(lexer.next_token, None)), lexer.input)
+        self.cur_token = tokens[0]
+        self.peek_token = tokens[1]
+        return None
+
     def parse_function_parameters(self):
         identifiers = []
 
@@ -286,14 +468,12 @@ class Parser:
 
         self.next_token()
 
-        ident = Identifier(token=self.cur_token, value=self.cur_token.literal)
-        identifiers.append(ident)
+        identifiers.append(self.parse_identifier())
 
         while self.peek_token_is(TokenType.COMMA):
             self.next_token()  # advance and sit on COMMA
             self.next_token()  # advance and sit on IDENT
-            ident = Identifier(token=self.cur_token, value=self.cur_token.literal)
-            identifiers.append(ident)
+            identifiers.append(self.parse_identifier())
 
         if not self.expect_peek(TokenType.RPAREN):
             return None
@@ -342,23 +522,79 @@ class Parser:
 
     def peek_error(self, t):
         msg = f'expected next token to be {t}, got {self.peek_token.type} instead'
-        self.errors.append(msg)
+        self.errors.append(msg + self.position(self.peek_token))
 
     def peek_precedence(self):
-        p = self.precedence.get(self.peek_token.type)
-        return p if p is not None else Precedence.LOWEST
+        return self.precedence.get(self.peek_token.type, Precedence.LOWEST)
 
     def cur_precedence(self):
-        p = self.precedence.get(self.cur_token.type)
-        return p if p is not None else Precedence.LOWEST
+        return self.precedence.get(self.cur_token.type, Precedence.LOWEST)
 
     def no_prefix_parse_fn_error(self, t):
         msg = f'no prefix parse function for {t} found'
-        self.errors.append(msg)
+        self.errors.append(msg + self.position(self.cur_token))
+
+    def position(self, token):
+        if self.line_index is None and hasattr(self.lexer, 'input'):
+            self.line_index = LineIndex(self.lexer.input)
+        return describe_position(self.line_index, token.start)
+
+    def mark(self, node, start):
+        # the last token of a construct is cur_token once its parse function returns
+        if node is not None and node.structural_hash is None:  # shared nodes keep their first span
+            node.start = start
+            node.end = self.cur_token.end
+            if self.interner is not None:
+                node = self.interner.intern(node)
+        return node
 
     # pratt parser functions helpers
+    # Registering on an instance copies the shared table first, so other parsers are unaffected.
     def register_prefix_function(self, token_type, prefix_function):
-        self.prefix_parse_fns[token_type] = prefix_function
+        if 'prefix_parse_fns' not in self.__dict__:
+            self.prefix_parse_fns = dict(self.prefix_parse_fns)
+        self.prefix_parse_fns[token_type] = lambda parser: prefix_function()
 
     def register_infix_function(self, token_type, infix_function):
-        self.infix_parse_fns[token_type] = infix_function
+        if 'infix_parse_fns' not in self.__dict__:
+            self.infix_parse_fns = dict(self.infix_parse_fns)
+        self.infix_parse_fns[token_type] = lambda parser, left: infix_function(left)
+
+    # register prefix tokens
+    prefix_parse_fns = {
+        TokenType.IDENT: parse_identifier,
+        TokenType.NULL: parse_null_literal,
+        TokenType.INT: parse_integer_literal,
+        TokenType.BANG: parse_prefix_expression,
+        TokenType.MINUS: parse_prefix_expression,
+        TokenType.TRUE: parse_boolean,
+        TokenType.FALSE: parse_boolean,
+        TokenType.LPAREN: parse_grouped_expression,
+        TokenType.IF: parse_if_expression,
+        TokenType.FUNCTION: parse_function_literal,
+    }
+
+    # register infix tokens
+    infix_parse_fns = {
+        TokenType.PLUS: parse_infix_expression,
+        TokenType.MINUS: parse_infix_expression,
+        TokenType.SLASH: parse_infix_expression,
+        TokenType.ASTERISK: parse_infix_expression,
+        TokenType.EQ: parse_infix_expression,
+        TokenType.NOT_EQ: parse_infix_expression,
+        TokenType.LT: parse_infix_expression,
+        TokenType.GT: parse_infix_expression,
+        TokenType.LPAREN: parse_call_expression,
+    }
+
+
+class Replay:
+    """
+    Lexer handing out tokens read before, see Parser.rewind().
+    """
+    def __init__(self, tokens, source):
+        self.tokens = tokens
+        self.input = source
+
+    def next_token(self):
+        return next(self.tokens)
@@ -0,0 +1,123 @@
+from monkey.ast.ast import (
+    PrefixExpression,
+    InfixExpression,
+    CallExpression,
+)
+from monkey.parser.pratt_parser import Parser, Precedence
+from monkey.tok.tok import TokenType
+
+# What an open level on the stack is waiting for
+BASE = 0  # the expression parse_expression() was asked for
+PREFIX = 1  # the right operand of '!' or '-'
+GROUP = 2  # the inside of '(' ... ')'
+INFIX = 3  # the right operand of a binary operator
+ARGUMENT = 4  # one argument of a call
+
+
+class StackParser(Parser):
+    """
+    Pratt parser whose parse_expression() keeps pending operators on an
+    explicit stack of levels instead of the Python call stack, so nested
+    parentheses, prefix operators, operands and call arguments cost no
+    recursion. Each level stands for one recursive parse_expression() call
+    of Parser and the trees (spans included) come out identical.
+    Statement-level constructs (if, fn bodies) still recurse per block.
+    """
+    def parse_expression(self, precedence):
+        levels = [(BASE, precedence, self.cur_token.start, None)]
+
+        while True:
+            # prefix part of the innermost level
+            start = levels[-1][2]
+            prefix = self.prefix_parse_fns.get(self.cur_token.type)
+
+            if prefix is None:
+                self.no_prefix_parse_fn_error(self.cur_token.type)
+                left = None
+                skip_operators = True  # the level gives up without looking at operators
+            elif prefix is Parser.parse_prefix_expression:
+                expression = PrefixExpression(token=self.cur_token, operator=self.cur_token.literal)
+                self.next_token()  # eat the '!' or '-' token
+                levels.append((PREFIX, Precedence.PREFIX, self.cur_token.start, expression))
+                continue
+            elif prefix is Parser.parse_grouped_expression:
+                self.next_token()  # advance the LPAREN token.
+                levels.append((GROUP, Precedence.LOWEST, self.cur_token.start, None))
+                continue
+            else:
+                left = self.mark(prefix(self), start)
+                skip_operators = False
+
+            while True:
+                opened = False
+
+                if not skip_operators:
+                    level_precedence = levels[-1][1]
+                    start = levels[-1][2]
+
+                    while not self.peek_token_is(TokenType.SEMICOLON) and level_precedence < self.peek_precedence():
+                        infix = self.infix_parse_fns.get(self.peek_token.type)
+                        if infix is None:
+                            break
+
+                        self.next_token()  # eat the prefix (left expression) token.
+
+                        if infix is Parser.parse_infix_expression:
+                            expression = InfixExpression(
+                                token=self.cur_token,
+                                operator=self.cur_token.literal,
+                                left=left,
+                            )
+                            operator_precedence = self.cur_precedence()
+                            self.next_token()  # eat the infix operator.
+                            levels.append((INFIX, operator_precedence, self.cur_token.start, expression))
+                            opened = True
+                            break
+                        elif infix is Parser.parse_call_expression:
+                            expression = CallExpression(token=self.cur_token)
+                            expression.function = left
+                            if self.peek_token_is(TokenType.RPAREN):
+                                self.next_token()
+                                expression.arguments = []
+                                left = self.mark(expression, start)
+                                continue
+                            self.next_token()
+                            levels.append((ARGUMENT, Precedence.LOWEST, self.cur_token.start, (expression, [])))
+                            opened = True
+                            break
+                        else:
+                            left = self.mark(infix(self, left), start)
+
+                if opened:
+                    break  # go parse the operand of the new level
+
+                # the innermost level is complete, hand its result to the level below
+                kind, _, _, data = levels.pop()
+
+                if kind == BASE:
+                    return left
+
+                start = levels[-1][2]
+                skip_operators = False
+
+                if kind == PREFIX or kind == INFIX:
+                    data.right = left
+                    left = self.mark(data, start)
+                elif kind == GROUP:
+                    if not self.expect_peek(TokenType.RPAREN):
+                        left = None
+                    left = self.mark(left, start)
+                else:
+                    expression, args = data
+                    args.append(left)
+
+                    if self.peek_token_is(TokenType.COMMA):
+                        self.next_token()  # advance and sits on COMMA
+                        self.next_token()  # advance the COMMA
+                        levels.append((ARGUMENT, Precedence.LOWEST, self.cur_token.start, data))
+                        break
+
+                    if not self.expect_peek(TokenType.RPAREN):
+                        args = None
+                    expression.arguments = args
+                    left = self.mark(expression, start)
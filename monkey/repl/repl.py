@@ -1,5 +1,4 @@
-from monkey.lexer.lexer import Lexer
-from monkey.parser.cfg_parser import Parser
+from monkey.parser.cache import ParseCache
 from monkey.evaluator.evaluator import Evaluator
 from monkey.object.environment import Environment
 PROMPT = '>> '
@@ -23,6 +22,7 @@ def start():
     print('Hello! This is SpeedMonkey programming language!\n')
     print('Feel free to type in commands\n')
     env = Environment()
+    cache = ParseCache()
     while True:
         try:
             source = input(PROMPT)
@@ -31,12 +31,10 @@ def start():
         if not source:
             continue
 
-        lexer = Lexer(source)
-        parser = Parser(lexer)
-        program = parser.parse_program()
+        program, errors = cache.parse(source, 'cfg')
 
-        if len(parser.errors) != 0:
-            print_parser_errors(parser.errors)
+        if len(errors) != 0:
+            print_parser_errors(errors)
 
         evaluator = Evaluator()
         evaluated = evaluator.eval(node=program, env=env)
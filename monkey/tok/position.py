@@ -0,0 +1,36 @@
+from bisect import bisect_right
+from itertools import accumulate
+
+
+class LineIndex:
+    """
+    Maps source offsets to 1-based (line, column) pairs. The table of line
+    start offsets is built on the first lookup, so code that never reports a
+    position never pays for it.
+    """
+    def __init__(self, source):
+        self.source = source
+        self.line_starts = None
+
+    def build(self):
+        newline = b'\n' if isinstance(self.source, (bytes, bytearray)) else '\n'
+        lengths = (len(line) + 1 for line in self.source.split(newline))
+        self.line_starts = [0] + list(accumulate(lengths))[:-1]
+
+    def line_col(self, offset):
+        if self.line_starts is None:
+            self.build()
+
+        line = bisect_right(self.line_starts, offset)
+        return line, offset - self.line_starts[line - 1] + 1
+
+    def describe(self, offset):
+        return 'line {}, column {}'.format(*self.line_col(offset))
+
+
+def describe_position(line_index, offset):
+    if offset is None:
+        return ''
+    if line_index is None:
+        return f' (offset {offset})'
+    return f' ({line_index.describe(offset)})'
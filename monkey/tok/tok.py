@@ -44,9 +44,13 @@ class TokenType(Enum):
 
 
 class Token:
-    def __init__(self, type, literal):
+    __slots__ = ('type', 'literal', 'start', 'end')
+
+    def __init__(self, type, literal, start=None, end=None):
         self.type = type
         self.literal = literal
+        self.start = start  # source offsets, see monkey.tok.position
+        self.end = end
 
     def __str__(self):
         return 'type: {type}, literal: {literal}'.format(
@@ -73,3 +77,8 @@ keywords = {
 def lookup_ident(ident):
     tok = keywords.get(ident)
     return tok if tok is not None else TokenType.IDENT
+
+
+# Integer kinds for compact token storage (see monkey.lexer.token_buffer)
+token_kinds = list(TokenType)
+kind_of = {t: kind for kind, t in enumerate(token_kinds)}
@@ -0,0 +1,87 @@
+import threading
+import unittest
+
+from monkey.evaluator.evaluator import Evaluator
+from monkey.object.environment import Environment
+from monkey.parser.cache import ParseCache, estimate_size
+from monkey.parser.pratt_parser import Parser
+from monkey.lexer.lexer import Lexer
+
+
+class TestParseCache(unittest.TestCase):
+    def test_hits_share_the_program(self):
+        cache = ParseCache()
+        program, errors = cache.parse("let a = 1; a + 2")
+        again, _ = cache.parse("let a = 1; a + 2")
+
+        self.assertIs(program, again)
+        self.assertEqual((), errors)
+        self.assertIs(tuple, type(program.statements))
+        self.assertEqual(3, Evaluator().eval(again, Environment()).value)
+        self.assertEqual({'entries': 1, 'bytes': estimate_size(program), 'hits': 1, 'misses': 1, 'evictions': 0},
+                         cache.stats())
+
+    def test_flavors_are_separate(self):
+        cache = ParseCache()
+        pratt, _ = cache.parse("1 + 2", 'pratt')
+        cfg, _ = cache.parse("1 + 2", 'cfg')
+
+        self.assertIsNot(pratt, cfg)
+        self.assertEqual(2, cache.misses)
+
+    def test_errors_are_cached(self):
+        cache = ParseCache()
+        _, errors = cache.parse("let = 1;")
+        _, again = cache.parse("let = 1;")
+
+        self.assertNotEqual((), errors)
+        self.assertEqual(errors, again)
+
+    def test_evicts_least_recently_used(self):
+        cache = ParseCache(max_entries=2)
+        cache.parse("1")
+        cache.parse("2")
+        cache.parse("1")
+        cache.parse("3")  # evicts "2"
+
+        self.assertEqual(1, cache.evictions)
+        cache.parse("1")
+        self.assertEqual(2, cache.hits)
+        cache.parse("2")
+        self.assertEqual(4, cache.misses)
+
+    def test_evicts_by_bytes(self):
+        size = estimate_size(Parser(Lexer("1 + 2")).parse_program())
+        cache = ParseCache(max_bytes=size * 2)
+        for source in ("1 + 2", "3 + 4", "5 + 6"):
+            cache.parse(source)
+
+        self.assertEqual(2, len(cache))
+        self.assertEqual(1, cache.evictions)
+        self.assertLessEqual(cache.size, size * 2)
+
+    def test_threads(self):
+        cache = ParseCache(max_entries=8)
+        sources = [f"let x = {i}; x * {i}" for i in range(16)]
+        failures = []
+
+        def work():
+            for _ in range(20):
+                for i, source in enumerate(sources):
+                    program, _ = cache.parse(source)
+                    if Evaluator().eval(program, Environment()).value != i * i:
+                        failures.append(source)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([], failures)
+        self.assertEqual(4 * 20 * 16, cache.hits + cache.misses)
+        self.assertLessEqual(len(cache), 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
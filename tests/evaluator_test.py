@@ -3,6 +3,7 @@ import unittest
 from monkey.lexer.lexer import Lexer
 from monkey.parser.cfg_parser import Parser
 from monkey.evaluator.evaluator import Evaluator, NULL
+from monkey.evaluator.unboxed_evaluator import UnboxedEvaluator
 from monkey.object.environment import Environment
 from monkey.object.object import (
     Integer,
@@ -152,6 +153,18 @@ class TestEvaluador(unittest.TestCase):
             evaluated = self.assert_test_eval(source)
             self.assert_test_boolean_object(evaluated, expected)
 
+    def test_null_is_false(self):
+        # this parser reads `null` as a Boolean with no value
+        tests = [
+            ["null", False],
+            ["null == false", True],
+            ["!null", True],
+        ]
+        for source, expected in tests:
+            evaluated = self.assert_test_eval(source)
+            self.assertIs(Boolean, type(evaluated))
+            self.assertEqual(expected, evaluated.value)
+
     def assert_test_null_object(self, obj):
         if obj != NULL:
             print(f'object is not NULL. got={obj}')
@@ -219,6 +232,50 @@ class TestEvaluador(unittest.TestCase):
             evaluated = self.assert_test_eval(source)
             self.assert_test_integer_object(evaluated, expected)
 
+    def test_eval_statements(self):
+        tests = [
+            ["let a = 5; a * 2; a + 1;", [None, 10, 6]],
+            ["1; return 2; 3;", [1, 2]],
+            ["1; -true; 3;", [1, 'unknown operator: -Type.BOOLEAN_OBJ']],
+        ]
+        for source, expected in tests:
+            for evaluator_class in (Evaluator, UnboxedEvaluator):
+                parser = Parser(Lexer(source))
+                results = evaluator_class().eval_statements(parser.parse_statements(), Environment())
+
+                actual = []
+                for result in results:
+                    if result is None:
+                        actual.append(None)
+                    elif type(result) is Error:
+                        actual.append(result.message)
+                    else:
+                        actual.append(result.value)
+                self.assertEqual(expected, actual)
+
+    def test_eval_statements_runs_before_parsing_ends(self):
+        parser = Parser(Lexer("let a = 1; a; let = ;"))
+        results = Evaluator().eval_statements(parser.parse_statements(), Environment())
+
+        next(results)
+        self.assertEqual(1, next(results).value)
+        self.assertEqual([], parser.errors)
+
+    def test_shared_integers(self):
+        program = Parser(Lexer("let f = fn(x) { 7 }; f(1) + 2000")).parse_program()
+        literal = program.statements[0].value.body.statements[0].expression
+
+        eva = Evaluator()
+        self.assertIs(eva.eval(literal, Environment()), eva.eval(literal, Environment()))
+        self.assertIs(literal.constant, eva.eval(literal, Environment()))
+        self.assertIs(eva.eval(program, Environment()), eva.eval(program, Environment()))
+        self.assertEqual(-5000, eva.integer(-5000).value)
+        self.assertIsNot(eva.integer(-5000), eva.integer(-5000))
+
+        eva.small_integers = None
+        self.assertIsNot(eva.eval(program, Environment()), eva.eval(program, Environment()))
+        self.assertEqual(2007, eva.eval(program, Environment()).value)
+
     def assert_test_eval(self, source):
         lexer = Lexer(source)
         parser = Parser(lexer)
@@ -226,7 +283,20 @@ class TestEvaluador(unittest.TestCase):
         eva = Evaluator()
         env = Environment()
 
-        return eva.eval(node=program, env=env)
+        evaluated = eva.eval(node=program, env=env)
+        self.assert_same_result(evaluated, UnboxedEvaluator().eval(program, Environment()), source)
+        return evaluated
+
+    def assert_same_result(self, expected, actual, source):
+        # every case also runs on UnboxedEvaluator, which must give the same result
+        def describe(result):
+            if result is None:
+                return None
+            if type(result) is Error:
+                return 'error', result.message
+            return type(result), result.inspect()
+
+        self.assertEqual(describe(expected), describe(actual), source)
 
     def assert_test_integer_object(self, obj, expected):
         result = obj  # Object
@@ -0,0 +1,107 @@
+import pickle
+import unittest
+
+from monkey.ast.ast import walk
+from monkey.ast.flat import flatten, unflatten, from_bytes, FlatProgram
+from monkey.evaluator.evaluator import Evaluator
+from monkey.evaluator.flat_evaluator import FlatEvaluator
+from monkey.lexer.lexer import Lexer
+from monkey.lexer.regex_lexer import RegexLexer
+from monkey.object.environment import Environment
+from monkey.parser import cfg_parser, pratt_parser
+
+SOURCE = """
+let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+let adder = fn(x) { fn(y) { return x + y; } };
+let big = 99999999999999999999;
+if (!(fib(10) == 55)) { -1 } else { adder(big)(fib(10)) / 5 }
+"""
+
+
+def describe(program):
+    out = []
+    for node in walk(program):
+        token = getattr(node, 'token', None)
+        if token is not None:
+            token = (token.type, token.literal, token.start, token.end)
+        value = getattr(node, 'value', None)
+        if not isinstance(value, (int, str, type(None))):
+            value = None  # a child node, compared on its own
+        out.append((type(node), node.start, node.end, token, value, getattr(node, 'operator', None)))
+    return out
+
+
+class TestFlat(unittest.TestCase):
+    def test_round_trip(self):
+        for parser_class in (pratt_parser.Parser, cfg_parser.Parser):
+            program = parser_class(Lexer(SOURCE)).parse_program()
+            flat = flatten(program)
+
+            self.assertIs(FlatProgram, type(flat))
+            self.assertEqual(describe(program), describe(unflatten(flat)))
+            self.assertEqual(program.string(), unflatten(flat).string())
+
+    def test_erroneous_trees_round_trip(self):
+        program = pratt_parser.Parser(Lexer("let = 5; 1 + ; f(")).parse_program()
+        self.assertEqual(describe(program), describe(unflatten(flatten(program))))
+
+        # a None among the arguments stays None
+        program = pratt_parser.Parser(Lexer("g( if )\na(x);")).parse_program()
+        copy = unflatten(flatten(program))
+        self.assertEqual(program.string(), copy.string())
+        self.assertEqual(
+            [[type(a) for a in s.expression.arguments] for s in program.statements],
+            [[type(a) for a in s.expression.arguments] for s in copy.statements],
+        )
+
+    def test_lazy_bodies_are_loaded(self):
+        program = pratt_parser.Parser(RegexLexer(SOURCE), lazy_bodies=True).parse_program()
+        eager = pratt_parser.Parser(RegexLexer(SOURCE)).parse_program()
+        self.assertEqual(describe(eager), describe(unflatten(flatten(program))))
+
+    def test_serialize(self):
+        flat = flatten(pratt_parser.Parser(Lexer(SOURCE)).parse_program())
+
+        data = flat.to_bytes()
+        self.assertIs(bytes, type(data))
+        self.assertEqual(data, from_bytes(data).to_bytes())
+        self.assertEqual(data, pickle.loads(pickle.dumps(flat)).to_bytes())
+
+        with self.assertRaises(ValueError):
+            from_bytes(b'x' * len(data))
+
+    def test_flat_evaluator(self):
+        program = pratt_parser.Parser(Lexer(SOURCE)).parse_program()
+        expected = Evaluator().eval(program, Environment())
+
+        result = FlatEvaluator(flatten(program)).eval(0, Environment())
+        self.assertEqual(expected.value, result.value)
+
+    def test_flat_evaluator_functions(self):
+        source = "let adder = fn(x, y) { let z = x + y; z * 2 }; adder"
+        program = pratt_parser.Parser(Lexer(source)).parse_program()
+        expected = Evaluator().eval(program, Environment())
+
+        result = FlatEvaluator(flatten(program)).eval(0, Environment())
+        self.assertIn('(z * 2)', result.inspect())
+        self.assertEqual(expected.inspect(), result.inspect())
+
+        program = pratt_parser.Parser(Lexer(source + "(1, 2)")).parse_program()
+        self.assertEqual(6, FlatEvaluator(flatten(program)).eval(0, Environment()).value)
+
+    def test_flat_evaluator_errors(self):
+        tests = [
+            "5 + true; 5;",
+            "if (10 > 1) { if (10 > 1) { return true + false; } return 1; }",
+            "foobar",
+        ]
+        for source in tests:
+            program = cfg_parser.Parser(Lexer(source)).parse_program()
+            expected = Evaluator().eval(program, Environment())
+
+            result = FlatEvaluator(flatten(program)).eval(0, Environment())
+            self.assertEqual(expected.message, result.message)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+
+from monkey.ast.ast import walk
+from monkey.lexer.lexer import Lexer
+from monkey.parser import cfg_parser
+from monkey.parser.incremental import Document
+from monkey.parser.pratt_parser import Parser
+
+SOURCE = """let a = 1;
+let add = fn(x, y) { x + y; };
+// note
+add(a, 2);
+if (a < 2) { a } else { 3 };
+let b = a * 4;
+b
+"""
+
+
+class TestIncremental(unittest.TestCase):
+    def assert_same_as_full_parse(self, document, parser_class=Parser):
+        parser = parser_class(Lexer(document.source))
+        expected = parser.parse_program()
+
+        self.assertEqual(parser.errors, document.errors)
+        self.assertEqual(expected.string(), document.program.string())
+        self.assertEqual(
+            [(node.start, node.end) for node in walk(expected)],
+            [(node.start, node.end) for node in walk(document.program)],
+        )
+
+    def test_reuses_untouched_statements(self):
+        document = Document(SOURCE)
+        before = list(document.program.statements)
+
+        offset = SOURCE.index("a * 4") + 4
+        reparsed = document.edit(offset, 1, "40")
+
+        self.assertEqual(1, len(reparsed))
+        self.assertEqual("let b = (a * 40);", reparsed[0].string())
+        after = document.program.statements
+        for i in (0, 1, 2, 3, 5):
+            self.assertIs(before[i], after[i])
+        self.assert_same_as_full_parse(document)
+
+    def test_shifts_following_spans(self):
+        document = Document(SOURCE)
+        document.edit(0, 0, "let zero = 0;\n")
+        self.assert_same_as_full_parse(document)
+
+    def test_edits_that_join_statements(self):
+        document = Document(SOURCE)
+
+        # dropping the ';' makes the call run into the if expression's statement
+        offset = SOURCE.index("add(a, 2);") + len("add(a, 2)")
+        document.edit(offset, 1, "")
+        self.assert_same_as_full_parse(document)
+
+        # an unclosed '{' swallows everything up to the end
+        offset = document.source.index("{ x + y; }") + len("{ x + y;")
+        document.edit(offset, 2, "")
+        self.assert_same_as_full_parse(document)
+
+        # a comment without its newline comments out the next statement too
+        offset = document.source.index("// note") + len("// note")
+        document.edit(offset, 1, " ")
+        self.assert_same_as_full_parse(document)
+
+    def test_errors_fall_back_to_full_parse(self):
+        document = Document(SOURCE)
+        document.edit(SOURCE.index("let b"), 3, "le")
+        self.assertNotEqual([], document.errors)
+        self.assert_same_as_full_parse(document)
+
+        document.edit(document.source.index("le b"), 2, "let")
+        self.assertEqual([], document.errors)
+        self.assert_same_as_full_parse(document)
+
+    def test_cfg_parser(self):
+        document = Document("let a = 1; let b = a + 2; b;", cfg_parser.Parser)
+        reparsed = document.edit(15, 1, "c")
+
+        self.assertEqual(["let c = (a + 2);"], [stmt.string() for stmt in reparsed])
+        self.assert_same_as_full_parse(document, cfg_parser.Parser)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+
+from monkey.index.index import SymbolIndex, Symbol
+
+LIB = """let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+let twice = fn(f, x) { f(f(x)) };
+"""
+
+MAIN = """let x = 10;
+let y = twice(fn(x) { x * 2 }, fib(x));
+let x = x + y;
+"""
+
+
+class TestSymbolIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = SymbolIndex(':memory:')
+        self.index.index_source('lib.mk', LIB)
+        self.index.index_source('main.mk', MAIN)
+
+    def tearDown(self):
+        self.index.close()
+
+    def test_definitions(self):
+        self.assertEqual([
+            Symbol('lib.mk', 'x', 'parameter', LIB.index('x)'), LIB.index('x)') + 1, 2, 19),
+            Symbol('main.mk', 'x', 'let', 4, 5, 1, 5),
+            Symbol('main.mk', 'x', 'parameter', MAIN.index('x)'), MAIN.index('x)') + 1, 2, 18),
+            Symbol('main.mk', 'x', 'let', MAIN.rindex('let x') + 4, MAIN.rindex('let x') + 5, 3, 5),
+        ], self.index.definitions('x'))
+
+    def test_resolution(self):
+        # fib inside its own body, the fn parameter shadowing the let
+        self.assertEqual(Symbol('lib.mk', 'fib', 'let', 4, 7, 1, 5),
+                         self.index.definition_at('lib.mk', LIB.index('fib(n - 1)')))
+        self.assertEqual('parameter', self.index.definition_at('main.mk', MAIN.index('x * 2')).kind)
+
+        # `let x = x + y` reads the x defined before it
+        first_x = self.index.definition_at('main.mk', MAIN.rindex('x + y'))
+        self.assertEqual(4, first_x.start)
+
+        self.assertIsNone(self.index.definition_at('main.mk', MAIN.index('twice')))
+        self.assertIsNone(self.index.definition_at('main.mk', MAIN.index('=')))
+
+    def test_usages(self):
+        usages = self.index.usages('lib.mk', LIB.index('fib'))
+        self.assertEqual([LIB.index('fib(n - 1)'), LIB.index('fib(n - 2)')], [u.start for u in usages])
+
+        self.assertEqual(
+            [MAIN.index('fib(x)') + 4, MAIN.rindex('x + y')],
+            [u.start for u in self.index.usages('main.mk', 4)],
+        )
+
+    def test_dependencies(self):
+        self.assertEqual(['fib', 'twice'], self.index.imports('main.mk'))
+        self.assertEqual(['lib.mk'], self.index.dependencies('main.mk'))
+        self.assertEqual(['main.mk'], self.index.dependents('lib.mk'))
+        self.assertEqual([], self.index.dependencies('lib.mk'))
+
+        self.index.remove('lib.mk')
+        self.assertEqual([], self.index.dependencies('main.mk'))
+        self.assertEqual(['main.mk'], self.index.paths())
+
+    def test_reindex_only_changed_files(self):
+        self.assertFalse(self.index.index_source('main.mk', MAIN))
+        self.assertTrue(self.index.index_source('main.mk', MAIN + 'let z = y;'))
+        self.assertEqual(4, len(self.index.definitions('x')))
+        self.assertEqual(1, len(self.index.definitions('z')))
+
+    def test_parse_errors(self):
+        self.assertTrue(self.index.index_source('broken.mk', 'let a = ; let b = a + @;'))
+        self.assertEqual(1, len(self.index.definitions('b')))
+
+
+class TestSymbolIndexOnDisk(unittest.TestCase):
+    def test_update(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [os.path.join(directory, name) for name in ('lib.mk', 'main.mk')]
+            for path, source in zip(paths, (LIB, MAIN)):
+                with open(path, 'w') as f:
+                    f.write(source)
+
+            database = os.path.join(directory, 'symbols.db')
+            index = SymbolIndex(database)
+            self.assertEqual(paths, index.update(paths))
+            index.close()
+
+            with open(paths[1], 'a') as f:
+                f.write('let z = 1;\n')
+
+            index = SymbolIndex(database)
+            self.assertEqual([paths[1]], index.changed(paths))
+            self.assertEqual([paths[1]], index.update(paths))
+            self.assertEqual([], index.update(paths))
+            self.assertEqual([paths[0]], index.dependencies(paths[1]))
+            index.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
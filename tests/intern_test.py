@@ -0,0 +1,64 @@
+import unittest
+
+from monkey.ast.ast import walk
+from monkey.ast.intern import Interner
+from monkey.evaluator.evaluator import Evaluator
+from monkey.lexer.lexer import Lexer
+from monkey.lexer.regex_lexer import RegexLexer
+from monkey.object.environment import Environment
+from monkey.parser import cfg_parser, pratt_parser
+from monkey.parser.stack_parser import StackParser
+
+SOURCE = """
+let twice = fn(f, x) { f(f(x)) };
+let inc = fn(x) { x + 1 };
+let a = twice(inc, 1 + 2 * 3);
+let b = twice(fn(x) { x + 1 }, 1 + 2 * 3);
+let c = twice(fn(y) { y + 1 }, (1 + 2) * 3);
+a + b + c
+"""
+
+
+class TestInterner(unittest.TestCase):
+    def test_same_program(self):
+        for parser_class in (pratt_parser.Parser, StackParser, cfg_parser.Parser):
+            program = parser_class(Lexer(SOURCE)).parse_program()
+            interned = parser_class(Lexer(SOURCE), interner=Interner()).parse_program()
+
+            self.assertEqual(program.string(), interned.string())
+            self.assertEqual(
+                Evaluator().eval(program, Environment()).value,
+                Evaluator().eval(interned, Environment()).value,
+            )
+
+    def test_identical_subtrees_are_shared(self):
+        interner = Interner()
+        program = pratt_parser.Parser(Lexer(SOURCE), interner=interner).parse_program()
+        inc, a, b, c = [s.value for s in program.statements[1:5]]
+
+        self.assertIs(inc, b.arguments[0])  # whole fn literals
+        self.assertIs(a.arguments[1], b.arguments[1])
+        self.assertIsNot(inc, c.arguments[0])  # another parameter name
+        self.assertIsNot(a.arguments[1], c.arguments[1])  # grouped differently
+        self.assertEqual(inc.structural_hash, b.arguments[0].structural_hash)
+        self.assertNotEqual(inc.structural_hash, c.arguments[0].structural_hash)
+
+        nodes = list(walk(program))
+        self.assertLess(len(set(map(id, nodes))), len(nodes))
+        self.assertGreater(interner.hits, 0)
+
+    def test_shared_nodes_keep_first_span(self):
+        program = pratt_parser.Parser(Lexer("x; x"), interner=Interner()).parse_program()
+        first, second = program.statements
+
+        self.assertIs(first, second)
+        self.assertEqual((0, 2), (second.start, second.end))
+
+    def test_lazy_bodies_are_not_shared(self):
+        parser = pratt_parser.Parser(RegexLexer("fn(x) { x }; fn(x) { x }"), lazy_bodies=True, interner=Interner())
+        first, second = parser.parse_program().statements
+        self.assertIsNot(first.expression, second.expression)
+
+
+if __name__ == '__main__':
+    unittest.main()
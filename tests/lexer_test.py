@@ -116,6 +116,21 @@ class TestLexer(unittest.TestCase):
             self.assertEqual(expected_token.type, actual.type)
             self.assertEqual(expected_token.literal, actual.literal)
 
+    def test_illegal_tokens(self):
+        lexer = Lexer("a @ b // trailing comment", illegal_tokens=True)
+
+        expected_tokens = [
+            Token(TokenType.IDENT, "a"),
+            Token(TokenType.ILLEGAL, "@"),
+            Token(TokenType.IDENT, "b"),
+            Token(TokenType.EOF, ""),
+        ]
+        for expected_token in expected_tokens:
+            actual = lexer.next_token()
+
+            self.assertEqual(expected_token.type, actual.type)
+            self.assertEqual(expected_token.literal, actual.literal)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+
+from monkey.ast import serialize
+from monkey.evaluator.evaluator import Evaluator
+from monkey.lexer.regex_lexer import RegexLexer
+from monkey.object.environment import Environment
+from monkey.parser import parallel
+from monkey.parser.pratt_parser import Parser
+
+LIBRARY = """
+// helpers; nothing here { ends a statement
+let add = fn(a, b) { let c = a + b; c };
+let pick = fn(x) { if (x > 1) { add(x, 1); } else { x; } };
+pick(add(1, 2));
+"""
+
+
+class TestParallel(unittest.TestCase):
+    def test_split_points(self):
+        source = "let a = fn() { 1; 2; }; // ; {\nlet b = (1); c;"
+        cuts = parallel.split_points(source, 10)
+
+        self.assertEqual([source.index('};') + 2, len(source) - len(' c;'), len(source)], cuts)
+        for cut in cuts:
+            self.assertEqual(';', source[cut - 1])
+
+    def test_parse_source(self):
+        source = LIBRARY * 50
+        expected = Parser(RegexLexer(source)).parse_program()
+
+        minimum, parallel.MIN_CHUNK = parallel.MIN_CHUNK, 100
+        try:
+            program, errors = parallel.parse_source(source, workers=2)
+        finally:
+            parallel.MIN_CHUNK = minimum
+
+        self.assertEqual([], errors)
+        self.assertEqual(expected.string(), program.string())
+        self.assertEqual((expected.start, expected.end), (program.start, program.end))
+        self.assertEqual([(s.start, s.end) for s in expected.statements],
+                         [(s.start, s.end) for s in program.statements])
+        self.assertEqual(4, Evaluator().eval(program, Environment()).value)
+
+    def test_parse_source_errors(self):
+        source = LIBRARY * 20 + "let = 1;\n" + LIBRARY * 20
+        parser = Parser(RegexLexer(source))
+        parser.parse_program()
+
+        minimum, parallel.MIN_CHUNK = parallel.MIN_CHUNK, 100
+        try:
+            _, errors = parallel.parse_source(source, workers=2)
+        finally:
+            parallel.MIN_CHUNK = minimum
+
+        self.assertEqual(parser.errors, errors)
+        self.assertIn('(line 101, column 5)', errors[0])
+
+    def test_malformed_sources(self):
+        self.assertEqual([], parallel.split_points("let a = 1); let b = (2;", 2))
+        self.assertEqual([], parallel.split_points("let a = (1; let b = 2;", 2))
+
+        for broken in ("let x = 1); let y = 2;\n", "}\n", "let f = fn() { 1;\n", "let x = add(1;\n"):
+            source = LIBRARY * 20 + broken + LIBRARY * 20
+            parser = Parser(RegexLexer(source))
+            expected = parser.parse_program()
+
+            minimum, parallel.MIN_CHUNK = parallel.MIN_CHUNK, 100
+            try:
+                program, errors = parallel.parse_source(source, workers=2)
+            finally:
+                parallel.MIN_CHUNK = minimum
+
+            self.assertEqual(parser.errors, errors, broken)
+            self.assertEqual(expected.string(), program.string(), broken)
+            self.assertEqual([(s.start, s.end) for s in expected.statements],
+                             [(s.start, s.end) for s in program.statements], broken)
+
+    def test_parse_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for i in range(5):
+                paths.append(os.path.join(directory, f'{i}.mk'))
+                with open(paths[-1], 'w') as f:
+                    f.write(f'let x = {i}; x * 2' if i else '')
+
+            results = parallel.parse_files(paths, workers=2)
+
+        self.assertEqual(paths, [path for path, _, _ in results])
+        for i, (_, data, errors) in enumerate(results):
+            self.assertEqual([], errors)
+            program = serialize.loads(data)
+            result = Evaluator().eval(program, Environment())
+            self.assertEqual(i * 2 if i else None, result and result.value)
+
+
+if __name__ == '__main__':
+    unittest.main()
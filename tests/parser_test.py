@@ -2,6 +2,7 @@ import unittest
 
 from monkey.lexer.lexer import Lexer
 from monkey.parser.cfg_parser import Parser
+from monkey.lexer.regex_lexer import RegexLexer
 
 
 class TestParser(unittest.TestCase):
@@ -420,6 +421,40 @@ class TestParser(unittest.TestCase):
             if not self.assert_test_literal_expression(val, expected_value):
                 return
 
+    def test_error_recovery(self):
+        source = """let a = 5;
+let = 10;
+let b = 3 @ 4;
+let c = fn(x) { x + ; return x };
+}
+return a +
+let e = 7;
+f(1, 2
+"""
+        for lexer in (Lexer(source, illegal_tokens=True), RegexLexer(source, illegal_tokens=True)):
+            parser = Parser(lexer, recover=True)
+            program = parser.parse_program()
+
+            self.assertEqual([
+                'expected token to be TokenType.IDENT, got TokenType.ASSIGN instead (line 2, column 5)',
+                'illegal character @ (line 3, column 11)',
+                'no prefix parse function for TokenType.SEMICOLON found (line 4, column 21)',
+                'no prefix parse function for TokenType.RBRACE found (line 5, column 1)',
+                'no prefix parse function for TokenType.LET found (line 7, column 1)',
+                'expected token to be TokenType.RPAREN, got TokenType.EOF instead (line 9, column 1)',
+            ], parser.errors)
+
+            self.assertEqual(["a", "b", "c", "e"], [stmt.name.value for stmt in program.statements])
+            self.assertEqual("fn(x) return x;", program.statements[2].value.string())
+
+    def test_error_recovery_unclosed_block(self):
+        parser = Parser(Lexer("if (x) { let y = 1;", illegal_tokens=True), recover=True)
+        parser.parse_program()
+        self.assertEqual(
+            ['expected token to be TokenType.RBRACE, got TokenType.EOF instead (line 1, column 20)'],
+            parser.errors,
+        )
+
     def assert_check_parser_errors(self, p):
         errors = p.errors
         if len(errors) == 0:
@@ -0,0 +1,64 @@
+import unittest
+
+from monkey.lexer.lexer import Lexer
+from monkey.lexer.regex_lexer import RegexLexer
+from monkey.lexer.token_buffer import tokenize_all
+from monkey.parser import cfg_parser, pratt_parser
+from monkey.tok.position import LineIndex
+from monkey.tok.tok import TokenType
+
+SOURCE = "let add = fn(a, b) {\n  a + b * 2\n};\nadd(1, -2) == !(false);\n"
+
+
+class TestPosition(unittest.TestCase):
+    def test_line_index(self):
+        index = LineIndex("ab\ncd\n\nx")
+        self.assertIsNone(index.line_starts)
+        self.assertEqual((1, 1), index.line_col(0))
+        self.assertEqual((2, 2), index.line_col(4))
+        self.assertEqual((3, 1), index.line_col(6))
+        self.assertEqual((4, 1), index.line_col(7))
+
+    def test_token_spans(self):
+        for lexer in (Lexer(SOURCE), RegexLexer(SOURCE), tokenize_all(SOURCE).cursor()):
+            while True:
+                tok = lexer.next_token()
+                self.assertEqual(tok.literal, SOURCE[tok.start:tok.end])
+                if tok.type == TokenType.EOF:
+                    break
+
+    def test_node_spans(self):
+        for module in (pratt_parser, cfg_parser):
+            program = module.Parser(Lexer(SOURCE)).parse_program()
+            let, call = program.statements
+
+            self.assertEqual("let add = fn(a, b) {\n  a + b * 2\n};", SOURCE[let.start:let.end])
+            self.assertEqual("fn(a, b) {\n  a + b * 2\n}", SOURCE[let.value.start:let.value.end])
+            self.assertEqual("b", SOURCE[let.value.parameters[1].start:let.value.parameters[1].end])
+
+            infix = let.value.body.statements[0].expression
+            self.assertEqual("a + b * 2", SOURCE[infix.start:infix.end])
+            self.assertEqual("b * 2", SOURCE[infix.right.start:infix.right.end])
+
+            equals = call.expression
+            self.assertEqual("add(1, -2)", SOURCE[equals.left.start:equals.left.end])
+            self.assertEqual("!(false)", SOURCE[equals.right.start:equals.right.end])
+
+    def test_error_positions(self):
+        parser = pratt_parser.Parser(Lexer("let x = 1;\nlet = 5;"))
+        parser.parse_program()
+        self.assertEqual(
+            'expected next token to be TokenType.IDENT, got TokenType.ASSIGN instead (line 2, column 5)',
+            parser.errors[0],
+        )
+
+        parser = cfg_parser.Parser(RegexLexer("let x = 1;\nlet = 5;"))
+        parser.parse_program()
+        self.assertEqual(
+            'expected token to be TokenType.IDENT, got TokenType.ASSIGN instead (line 2, column 5)',
+            parser.errors[0],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+
+from monkey.ast.ast import IntegerLiteral
+from monkey.evaluator.evaluator import Evaluator
+from monkey.lexer.lexer import Lexer
+from monkey.lexer.regex_lexer import RegexLexer
+from monkey.object.environment import Environment
+from monkey.parser.pratt_parser import Parser, Precedence
+from monkey.tok.tok import TokenType
+
+
+class TestPrattParser(unittest.TestCase):
+    def test_operator_precedence_parsing(self):
+        tests = [
+            ["-a * b", "((-a) * b)"],
+            ["a + b * c + d / e - f", "(((a + (b * c)) + (d / e)) - f)"],
+            ["5 > 4 == 3 < 4", "((5 > 4) == (3 < 4))"],
+            ["a + add(b * c) + d", "((a + add((b * c))) + d)"],
+            ["-(5 + 5)", "(-(5 + 5))"],
+        ]
+        for source, expected in tests:
+            parser = Parser(Lexer(source))
+            program = parser.parse_program()
+            self.assertEqual([], parser.errors)
+            self.assertEqual(expected, program.string())
+
+    def test_precedences_are_ints(self):
+        self.assertIs(int, type(Precedence.LOWEST))
+        self.assertLess(Precedence.SUM, Precedence.PRODUCT)
+
+    def test_reset_reuses_parser(self):
+        parser = Parser(Lexer("let = 1;"))
+        parser.parse_program()
+        self.assertNotEqual([], parser.errors)
+
+        parser.reset(Lexer("1 + 2 * 3"))
+        program = parser.parse_program()
+        self.assertEqual([], parser.errors)
+        self.assertEqual("(1 + (2 * 3))", program.string())
+
+    def test_register_is_per_instance(self):
+        parser = Parser(Lexer("null"))
+        parser.register_prefix_function(
+            TokenType.NULL,
+            lambda: IntegerLiteral(token=parser.cur_token, value=0),
+        )
+        program = parser.parse_program()
+        self.assertIs(IntegerLiteral, type(program.statements[0].expression))
+
+        program = Parser(Lexer("null")).parse_program()
+        self.assertIsNot(IntegerLiteral, type(program.statements[0].expression))
+
+    def test_lazy_function_bodies(self):
+        source = """let add = fn(a, b) { let f = fn(x) { x * 2 }; if (a > b) { f(a) } else { b } };
+let unused = fn() { 1 + ; };
+add(3, 2)"""
+        parser = Parser(RegexLexer(source), lazy_bodies=True)
+        program = parser.parse_program()
+        self.assertEqual([], parser.errors)  # the broken body is never parsed
+
+        literal = program.statements[0].value
+        self.assertIsNone(literal.body)
+
+        result = Evaluator().eval(program, Environment())
+        self.assertEqual(6, result.value)
+
+        eager = Parser(RegexLexer(source)).parse_program().statements[0].value
+        self.assertIsNotNone(literal.body)  # parsed on the call and cached
+        self.assertEqual(eager.body.string(), literal.body.string())
+        self.assertEqual((eager.body.start, eager.body.end), (literal.body.start, literal.body.end))
+
+    def test_lazy_function_body_errors(self):
+        source = "let broken = fn() {\n  1 + ; };\nbroken()"
+        program = Parser(RegexLexer(source), lazy_bodies=True).parse_program()
+
+        result = Evaluator().eval(program, Environment())
+        self.assertEqual(
+            'invalid function body: no prefix parse function for TokenType.SEMICOLON found (line 2, column 7)',
+            result.message,
+        )
+
+    def test_ambiguous_lazy_bodies(self):
+        sources = [
+            # the parser takes `{` for a parameter, brace matching runs to EOF
+            "let f = fn() { return fn({, y) { y } }; let a = 1; let b = 2;",
+            # the parser steps over the `}` as the missing operand
+            "let f = fn() { 1 + }; let a = 1; }",
+            # a header the parser rejects, whose `{` is a bad expression
+            "let f = fn() { fn(a b) { 1 } }; let a = 1; }",
+            "let f = fn() { if (a, b) { 1 } }; let a = 1; }",
+            "let f = fn() { 1 } else { 2 } }; let a = 1;",
+        ]
+        for source in sources:
+            eager_parser = Parser(RegexLexer(source))
+            eager = eager_parser.parse_program()
+            parser = Parser(RegexLexer(source), lazy_bodies=True)
+            lazy = parser.parse_program()
+
+            self.assertEqual(eager.string(), lazy.string(), source)
+            self.assertEqual(eager_parser.errors, parser.errors, source)
+            self.assertIsNotNone(lazy.statements[0].value.body, source)  # parsed at once
+
+        # a well-formed body after an ambiguous one is still skipped
+        source = "let f = fn() { let a = (1 + ); 2 }; let g = fn(x) { x };"
+        f, g = Parser(RegexLexer(source), lazy_bodies=True).parse_program().statements
+        self.assertIsNotNone(f.value.body)
+        self.assertIsNone(g.value.body)
+
+
+if __name__ == '__main__':
+    unittest.main()
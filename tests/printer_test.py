@@ -0,0 +1,110 @@
+import io
+import unittest
+
+from monkey.ast.ast import PrefixExpression, Identifier, ExpressionStatement, Program
+from monkey.ast.printer import Printer, dump, to_string
+from monkey.evaluator.evaluator import Evaluator
+from monkey.lexer.lexer import Lexer
+from monkey.object.environment import Environment
+from monkey.parser import cfg_parser, pratt_parser
+from monkey.tok.tok import Token, TokenType
+
+SOURCE = """
+let max = fn(a, b) { if (a > b) { return a; } else { b } };
+let f = fn() { };
+!-max(1, 2 * 3) == null;
+if (true) { 1 }
+"""
+
+
+class CountingSink:
+    def __init__(self):
+        self.writes = []
+
+    def write(self, text):
+        self.writes.append(text)
+
+
+class TestPrinter(unittest.TestCase):
+    def test_string(self):
+        program = pratt_parser.Parser(Lexer(SOURCE)).parse_program()
+
+        self.assertEqual(
+            program.string(),
+            "let max = fn(a, b) if(a > b) return a;else b;"
+            "let f = fn() ;"
+            "((!(-max(1, (2 * 3)))) == null)"
+            "iftrue 1",
+        )
+
+    def test_lazy_bodies(self):
+        eager = pratt_parser.Parser(Lexer(SOURCE)).parse_program()
+        lazy = pratt_parser.Parser(Lexer(SOURCE), lazy_bodies=True).parse_program()
+
+        self.assertEqual(to_string(lazy), eager.string())
+
+    def test_indent(self):
+        program = pratt_parser.Parser(Lexer(SOURCE)).parse_program()
+        expected = (
+            "let max = fn(a, b) {\n"
+            "  if ((a > b)) {\n"
+            "    return a;\n"
+            "  } else {\n"
+            "    b;\n"
+            "  };\n"
+            "};\n"
+            "let f = fn() {};\n"
+            "((!(-max(1, (2 * 3)))) == null);\n"
+            "if (true) {\n"
+            "  1;\n"
+            "};\n"
+        )
+
+        self.assertEqual(to_string(program, indent=2), expected)
+        self.assertEqual(to_string(program, indent='  '), expected)
+
+        for parser_class in (pratt_parser.Parser, cfg_parser.Parser):
+            parser = parser_class(Lexer(expected))
+            self.assertEqual(parser.parse_program().string(), program.string())
+            self.assertEqual(parser.errors, [])
+
+    def test_missing_children(self):
+        parser = cfg_parser.Parser(Lexer("let x = ; 1 +;"), recover=True)
+        program = parser.parse_program()
+
+        self.assertNotEqual(parser.errors, [])
+        self.assertIsInstance(program.string(), str)
+
+    def test_deep_tree(self):
+        # far deeper than the recursion limit
+        node = Identifier(Token(TokenType.IDENT, "x"), "x")
+        for _ in range(50000):
+            node = PrefixExpression(Token(TokenType.MINUS, "-"), "-", node)
+        program = Program()
+        program.statements.append(ExpressionStatement(node.token, node))
+
+        self.assertEqual(program.string(), "(-" * 50000 + "x" + ")" * 50000)
+
+    def test_streaming_sink(self):
+        program = pratt_parser.Parser(Lexer("let a = 1 + 2;" * 5000)).parse_program()
+        sink = CountingSink()
+        dump(program, sink)
+
+        self.assertEqual("".join(sink.writes), program.string())
+        self.assertGreater(len(sink.writes), 1)
+
+        out = io.StringIO()
+        Printer(out).write(program.statements[0])
+        Printer(out).write(program.statements[1])
+        self.assertEqual(out.getvalue(), "let a = (1 + 2);" * 2)
+
+    def test_function_inspect(self):
+        for lazy in (False, True):
+            program = pratt_parser.Parser(Lexer("fn(x, y) { x + y; }"), lazy_bodies=lazy).parse_program()
+            function = Evaluator().eval(program, Environment())
+
+            self.assertEqual(function.inspect(), "fn(x, y\n(x + y)\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
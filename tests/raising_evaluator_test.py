@@ -0,0 +1,79 @@
+import unittest
+
+from monkey.evaluator.evaluator import Evaluator
+from monkey.evaluator.raising_evaluator import RaisingEvaluator
+from monkey.lexer.lexer import Lexer
+from monkey.lexer.regex_lexer import RegexLexer
+from monkey.object.environment import Environment
+from monkey.object.object import Error
+from monkey.parser.pratt_parser import Parser
+
+SOURCES = [
+    "let fib = fn(n) { if (n < 2) { return n; } fib(n - 1) + fib(n - 2) }; fib(15)",
+    "let newAdder = fn(x) { fn(y) { x + y } }; let addTwo = newAdder(2); addTwo(2);",
+    "let f = fn(x) { if (x > 1) { if (x > 2) { return 3; } return 2; } 1 }; f(1) * 100 + f(2) * 10 + f(3)",
+    "return 2 * 5; 9;",
+    "9; if (10 > 1) { if (10 > 1) { return 10; } return 1; }",
+    "if (1 > 2) { 10 }",
+    "!(1 == 1) != !!5",
+    "let a = 5; let b = a; let c = a + b + 5; c;",
+    "(5 + 10 * 2 + 15 / 3) * 2 + -10",
+    "fn(x) { x + 2; };",
+    "let a = 1;",
+    # errors
+    "5 + true; 5;",
+    "-true",
+    "5; true + false; 5",
+    "if (10 > 1) { if (10 > 1) { return true + false; } return 1; }",
+    "foobar",
+    "let f = fn(x) { x + y }; let g = fn(x) { f(x) * 2 }; g(1); 3",
+    "let f = fn(x) { return x; }; f(-true)",
+    "let one = 1; one(2)",
+    "if (unknown) { 1 } else { 2 }",
+]
+
+
+def describe(result):
+    if result is None:
+        return None
+    if type(result) is Error:
+        return 'error', result.message
+    return type(result), result.inspect()
+
+
+class TestRaisingEvaluator(unittest.TestCase):
+    def test_same_results(self):
+        for source in SOURCES:
+            program = Parser(Lexer(source)).parse_program()
+            expected = describe(Evaluator().eval(program, Environment()))
+            self.assertEqual(expected, describe(RaisingEvaluator().eval(program, Environment())), source)
+
+    def test_error_messages(self):
+        program = Parser(Lexer("let f = fn(x) { x + true }; f(1) + 1")).parse_program()
+        result = RaisingEvaluator().eval(program, Environment())
+        self.assertEqual('type mismatch: Type.INTEGER_OBJ + Type.BOOLEAN_OBJ', result.message)
+
+    def test_eval_statements(self):
+        tests = [
+            ["let a = 5; a * 2; a + 1;", [None, 10, 6]],
+            ["1; return 2; 3;", [1, 2]],
+            ["1; -true; 3;", [1, 'unknown operator: -Type.BOOLEAN_OBJ']],
+        ]
+        for source, expected in tests:
+            results = RaisingEvaluator().eval_statements(Parser(Lexer(source)).parse_statements(), Environment())
+            self.assertEqual(expected, [
+                None if r is None else r.message if type(r) is Error else r.value for r in results
+            ])
+
+    def test_lazy_bodies(self):
+        source = "let f = fn(x) { return x * 2; }; let g = fn() { 1 + ; }; f(21)"
+        program = Parser(RegexLexer(source), lazy_bodies=True).parse_program()
+        self.assertEqual(42, RaisingEvaluator().eval(program, Environment()).value)
+
+        program = Parser(RegexLexer(source + "; g()"), lazy_bodies=True).parse_program()
+        result = RaisingEvaluator().eval(program, Environment())
+        self.assertTrue(result.message.startswith('invalid function body: '))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+from monkey.lexer.lexer import Lexer
+from monkey.lexer.regex_lexer import RegexLexer
+from monkey.parser import cfg_parser, pratt_parser
+from monkey.tok.tok import TokenType
+
+
+class TestRegexLexer(unittest.TestCase):
+    def test_same_tokens_as_lexer(self):
+        source = """
+        let five = 5;
+        let add = fn(x, y) {
+            x + y; // adds
+        };
+        let result = add(five, 10.5);
+        !-/*5;
+        5 < 10 > 5;
+        if (5 < 10) { return true; } else { return false; }
+        10 == 10;
+        10 != 9;
+        result = null;
+        x_1 5abc
+        """
+        expected = Lexer(source)
+        actual = RegexLexer(source)
+
+        while True:
+            expected_token = expected.next_token()
+            actual_token = actual.next_token()
+
+            self.assertEqual(expected_token.type, actual_token.type)
+            self.assertEqual(expected_token.literal, actual_token.literal)
+
+            if expected_token.type == TokenType.EOF:
+                break
+
+    def test_eof_repeats(self):
+        lexer = RegexLexer("  ")
+        self.assertEqual(TokenType.EOF, lexer.next_token().type)
+        self.assertEqual(TokenType.EOF, lexer.next_token().type)
+
+    def test_errors(self):
+        with self.assertRaisesRegex(Exception, 'Illegal character @'):
+            lexer = RegexLexer("a @")
+            lexer.next_token()
+            lexer.next_token()
+
+        with self.assertRaisesRegex(Exception, 'Unexpected end of file'):
+            lexer = RegexLexer("a // no newline")
+            lexer.next_token()
+            lexer.next_token()
+
+    def test_drop_in_for_parsers(self):
+        source = "let add = fn(a, b) { a + b * 2 }; add(1, -2) == !false;"
+        for module in (pratt_parser, cfg_parser):
+            expected = module.Parser(Lexer(source)).parse_program()
+            parser = module.Parser(RegexLexer(source))
+            actual = parser.parse_program()
+
+            self.assertEqual([], parser.errors)
+            self.assertEqual(expected.string(), actual.string())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+import os
+import tempfile
+import unittest
+
+from monkey.ast import serialize
+from monkey.ast.flat import flatten
+from monkey.ast.serialize import dumps, loads, FormatError
+from monkey.evaluator.evaluator import Evaluator
+from monkey.lexer.lexer import Lexer
+from monkey.object.environment import Environment
+from monkey.parser import cfg_parser, pratt_parser
+from monkey.parser.cache import CompileCache, source_digest
+from monkey.tok.tok import Token, TokenType
+
+SOURCE = """
+let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+let adder = fn(x) { fn(y) { return x + y; } };
+let big = 99999999999999999999;
+if (!(fib(10) == 55)) { -1 } else { adder(big)(fib(10)) / 5 }
+"""
+
+
+def describe(program):
+    # the flat encoding keeps every node, token and span and loads lazy bodies
+    return flatten(program).to_bytes()
+
+
+class TestSerialize(unittest.TestCase):
+    def test_round_trip(self):
+        sources = [SOURCE, "let = 5; 1 + ; f(", "f(1, , 2)", "fn(a, ) { }", "-5; !true; null"]
+        for parser_class in (pratt_parser.Parser, cfg_parser.Parser):
+            for source in sources:
+                program = parser_class(Lexer(source)).parse_program()
+                data = dumps(program)
+
+                self.assertEqual(describe(program), describe(loads(data, lazy=False)))
+                self.assertEqual(describe(program), describe(loads(data)))
+
+    def test_lazy_bodies(self):
+        eager = pratt_parser.Parser(Lexer(SOURCE)).parse_program()
+        program = loads(dumps(eager))
+        fib = program.statements[0].value
+
+        self.assertIsNone(fib.body)
+        self.assertEqual(
+            Evaluator().eval(eager, Environment()).value,
+            Evaluator().eval(program, Environment()).value,
+        )
+        self.assertIsNotNone(fib.body)
+
+    def test_tokens_the_parser_does_not_make(self):
+        program = pratt_parser.Parser(Lexer("let a = b + c; -d")).parse_program()
+        let, expression = program.statements
+        let.token = Token(TokenType.LET, 'let')
+        let.name.token = Token(TokenType.IDENT, 'x', 4, 9)
+        let.value.token = Token(TokenType.PLUS, 'plus', 10, 11)
+        expression.expression.token = Token(TokenType.MINUS, '-', 15)
+        expression.expression.operator = '~'
+
+        for lazy in (False, True):
+            self.assertEqual(describe(program), describe(loads(dumps(program), lazy=lazy)))
+
+    def test_compact(self):
+        source = "let add = fn(a, b) { a + b };\n" * 100
+        data = dumps(pratt_parser.Parser(Lexer(source)).parse_program())
+        self.assertLess(len(data), len(source) * 2)
+
+    def test_rejects_bad_data(self):
+        data = dumps(pratt_parser.Parser(Lexer(SOURCE)).parse_program())
+
+        with self.assertRaises(FormatError):
+            loads(b'MKAST')
+        with self.assertRaises(FormatError):
+            loads(data[:5] + bytes([serialize.FORMAT_VERSION + 1]) + data[6:])
+        with self.assertRaises(FormatError):
+            loads(data[:len(data) // 2], lazy=False)
+
+
+class TestCompileCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = CompileCache(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_second_load_is_cached(self):
+        program, errors = self.cache.parse(SOURCE)
+        cached, cached_errors = self.cache.parse(SOURCE)
+
+        self.assertEqual([], errors)
+        self.assertEqual([], cached_errors)
+        self.assertEqual((1, 1), (self.cache.misses, self.cache.hits))
+        self.assertEqual(program.string(), cached.string())
+        self.assertEqual(
+            Evaluator().eval(program, Environment()).value,
+            Evaluator().eval(cached, Environment()).value,
+        )
+        self.assertEqual([self.cache.path(source_digest(SOURCE))],
+                         [os.path.join(self.directory.name, name) for name in os.listdir(self.directory.name)])
+
+    def test_errors_are_not_stored(self):
+        _, errors = self.cache.parse("let = 1;")
+        self.assertNotEqual([], errors)
+        self.assertEqual([], os.listdir(self.directory.name))
+
+    def test_falls_back_on_bad_files(self):
+        self.cache.parse(SOURCE)
+        path = self.cache.path(source_digest(SOURCE))
+
+        for data in (b'garbage', open(path, 'rb').read()[:40]):
+            with open(path, 'wb') as f:
+                f.write(data)
+            program, _ = self.cache.parse(SOURCE)
+            self.assertEqual(pratt_parser.Parser(Lexer(SOURCE)).parse_program().string(), program.string())
+
+        self.assertEqual(3, self.cache.misses)
+        self.cache.parse(SOURCE)
+        self.assertEqual(1, self.cache.hits)  # rewritten by the last miss
+
+    def test_reparses_damaged_bodies(self):
+        source = "let f = fn(x) { x * 2 }; f(21)"
+        self.cache.parse(source)
+        path = self.cache.path(source_digest(source))
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        # a byte inside the body of f, which is only decoded on the call
+        damaged = data[:60] + b'\xff' + data[61:]
+        with self.assertRaises(FormatError):
+            loads(damaged).statements[0].value.load_body()
+        with open(path, 'wb') as f:
+            f.write(damaged)
+
+        program, _ = self.cache.parse(source)
+        self.assertEqual(1, self.cache.hits)
+        self.assertEqual(42, Evaluator().eval(program, Environment()).value)
+        self.assertEqual("(x * 2)", program.statements[0].value.body.string())
+        self.assertEqual(2, self.cache.misses)
+        self.assertFalse(os.path.exists(path))
+
+    def test_checks_the_source_digest(self):
+        self.cache.parse("1 + 2")
+        os.replace(self.cache.path(source_digest("1 + 2")), self.cache.path(source_digest("3 + 4")))
+
+        program, _ = self.cache.parse("3 + 4")
+        self.assertEqual("(3 + 4)", program.string())
+        self.assertEqual(0, self.cache.hits)
+
+
+if __name__ == '__main__':
+    unittest.main()
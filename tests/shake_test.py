@@ -0,0 +1,81 @@
+import unittest
+
+from monkey.ast.shake import shake
+from monkey.evaluator.evaluator import Evaluator
+from monkey.lexer.lexer import Lexer
+from monkey.object.environment import Environment
+from monkey.parser.pratt_parser import Parser
+
+PRELUDE = """
+let unused = fn(x) { x * 1000 };
+let square = fn(x) { x * x };
+let sum_of_squares = fn(a, b) { square(a) + square(b) };
+let limit = 10;
+let offset = 5;
+let first = fn(x) { x };
+let first = fn(x) { offset };
+"""
+
+
+def parse(source, lazy_bodies=False):
+    return Parser(Lexer(source), lazy_bodies=lazy_bodies).parse_program()
+
+
+def names(program):
+    return [s.name.value for s in program.statements if hasattr(s, 'name')]
+
+
+class TestShake(unittest.TestCase):
+    def test_drops_unused_bindings(self):
+        program = parse(PRELUDE + "sum_of_squares(3, 4) + first(1)")
+        shaken, report = shake(program)
+
+        # square through sum_of_squares' body, offset through the second first
+        self.assertEqual(['square', 'sum_of_squares', 'offset', 'first', 'first'], names(shaken))
+        self.assertEqual(['limit', 'unused'], report['removed'])
+        self.assertEqual({'statements': 8, 'kept': 6}, {k: report[k] for k in ('statements', 'kept')})
+        self.assertGreater(report['removed_source'], len('let limit = 10;'))
+
+        self.assertEqual(30, Evaluator().eval(shaken, Environment()).value)
+
+    def test_exports(self):
+        shaken, report = shake(parse(PRELUDE + "1"), exports=['sum_of_squares'])
+
+        self.assertEqual(['square', 'sum_of_squares'], names(shaken))
+
+    def test_parameters_shadow(self):
+        shaken, _ = shake(parse("let a = 1; let f = fn(a) { a }; f(2)"))
+
+        self.assertEqual(['f'], names(shaken))
+
+    def test_keeps_effects(self):
+        source = "let g = fn(x) { x }; let h = fn(x) { x }; let y = g(1); let z = 1 + true; let w = 2;"
+        program = parse(source)
+        shaken, report = shake(program)
+
+        # calls and expressions that may fail stay, and so does the last statement
+        self.assertEqual(['g', 'y', 'z', 'w'], names(shaken))
+        self.assertEqual(['h'], report['removed'])
+        self.assertEqual(
+            Evaluator().eval(program, Environment()).message,
+            Evaluator().eval(shaken, Environment()).message,
+        )
+
+    def test_nothing_to_drop(self):
+        program = parse("let a = 1; a")
+        shaken, report = shake(program)
+
+        self.assertIs(program, shaken)
+        self.assertEqual([], report['removed'])
+
+    def test_dropped_bodies_stay_unparsed(self):
+        program = parse(PRELUDE + "square(3)", lazy_bodies=True)
+        shaken, _ = shake(program)
+
+        unused = program.statements[0].value
+        self.assertIsNotNone(unused.body_loader)
+        self.assertEqual(9, Evaluator().eval(shaken, Environment()).value)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+from monkey.ast.ast import walk, InfixExpression, PrefixExpression
+from monkey.lexer.regex_lexer import RegexLexer
+from monkey.parser.pratt_parser import Parser
+from monkey.parser.stack_parser import StackParser
+
+
+def shape(program):
+    return [
+        (type(node).__name__, node.start, node.end, getattr(node, 'operator', None))
+        for node in walk(program)
+    ]
+
+
+class TestStackParser(unittest.TestCase):
+    def test_same_trees_as_pratt_parser(self):
+        tests = [
+            "-a * b",
+            "!-a",
+            "a + b * c + d / e - f",
+            "3 + 4; -5 * 5",
+            "5 > 4 == 3 < 4",
+            "1 + (2 + 3) + 4",
+            "-(5 + 5)",
+            "a + add(b * c) + d",
+            "add(a, b, 1, 2 * 3, 4 + 5, add(6, 7 * 8))",
+            "f()(1)(2, g())",
+            "let x = fn(a) { if (a < 1) { -a } else { a * (a - 1) } }(3);",
+            "return !(true == (false));",
+            "(1 + ; 2",
+            "f(1, 2",
+            "a + )",
+        ]
+        for source in tests:
+            expected_parser = Parser(RegexLexer(source))
+            expected = expected_parser.parse_program()
+            parser = StackParser(RegexLexer(source))
+            actual = parser.parse_program()
+
+            self.assertEqual(expected_parser.errors, parser.errors, source)
+            self.assertEqual(shape(expected), shape(actual), source)
+
+    def test_deep_nesting(self):
+        depth = 5000
+        source = '(' * depth + '1' + ')' * depth + ' + ' + '-!' * depth + 'x'
+        parser = StackParser(RegexLexer(source))
+        program = parser.parse_program()
+
+        self.assertEqual([], parser.errors)
+        infix = program.statements[0].expression
+        self.assertIs(InfixExpression, type(infix))
+        self.assertEqual(
+            2 * depth,
+            sum(1 for node in walk(infix.right) if type(node) is PrefixExpression),
+        )
+
+    def test_deep_calls(self):
+        depth = 5000
+        source = 'f(' * depth + '1' + ')' * depth
+        parser = StackParser(RegexLexer(source))
+        program = parser.parse_program()
+
+        self.assertEqual([], parser.errors)
+        self.assertEqual(2 * depth + 3, sum(1 for _ in walk(program)))
+
+
+if __name__ == '__main__':
+    unittest.main()
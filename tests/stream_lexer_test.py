@@ -0,0 +1,71 @@
+import io
+import os
+import tempfile
+import unittest
+
+from monkey.lexer.lexer import Lexer
+from monkey.lexer.stream_lexer import StreamLexer
+from monkey.parser.pratt_parser import Parser
+from monkey.tok.tok import TokenType
+
+SOURCE = """
+let five = 5;
+let add = fn(x, y) {
+    x + y; // adds
+};
+let résultat = add(five, 10);
+!-/*5;
+if (5 < 10) { return true; } else { return false; }
+10 == 10;
+10 != 9;
+"""
+
+
+class TestStreamLexer(unittest.TestCase):
+    def tokens(self, lexer):
+        result = []
+        while True:
+            tok = lexer.next_token()
+            result.append((tok.type, tok.literal))
+            if tok.type == TokenType.EOF:
+                return result
+
+    def test_tokens_across_chunk_boundaries(self):
+        expected = self.tokens(Lexer(SOURCE))
+
+        for chunk_size in (1, 2, 3, 7, 64):
+            self.assertEqual(expected, self.tokens(StreamLexer(io.StringIO(SOURCE), chunk_size)))
+            self.assertEqual(expected, self.tokens(StreamLexer(io.BytesIO(SOURCE.encode()), chunk_size)))
+
+    def test_from_path(self):
+        fd, path = tempfile.mkstemp()
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(SOURCE.encode())
+
+            self.assertEqual(self.tokens(Lexer(SOURCE)), self.tokens(StreamLexer.from_path(path)))
+        finally:
+            os.remove(path)
+
+    def test_drop_in_for_parser(self):
+        source = "let add = fn(x, y) { x + y; }; add(1, 2 * 3);"
+        parser = Parser(StreamLexer(io.BytesIO(source.encode()), chunk_size=4))
+        program = parser.parse_program()
+
+        self.assertEqual([], parser.errors)
+        self.assertEqual(Parser(Lexer(source)).parse_program().string(), program.string())
+
+    def test_window_stays_bounded(self):
+        lexer = StreamLexer(io.BytesIO(b"let x = 1;\n" * 1000), chunk_size=16)
+        while lexer.next_token().type != TokenType.EOF:
+            self.assertLessEqual(len(lexer.window), 32)
+
+    def test_unterminated_comment(self):
+        with self.assertRaisesRegex(Exception, 'Unexpected end of file'):
+            lexer = StreamLexer(io.BytesIO(b"a // no newline"), chunk_size=4)
+            lexer.next_token()
+            lexer.next_token()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+from monkey.lexer.lexer import Lexer
+from monkey.lexer.token_buffer import tokenize_all
+from monkey.parser import cfg_parser, pratt_parser
+from monkey.tok.tok import TokenType
+
+
+class TestTokenBuffer(unittest.TestCase):
+    def test_columns(self):
+        source = "let x = 10;\nfoo(x)"
+        buffer = tokenize_all(source)
+
+        self.assertEqual(10, len(buffer))
+        self.assertEqual('H', buffer.kinds.typecode)
+        self.assertEqual('I', buffer.starts.typecode)
+
+        self.assertEqual(TokenType.LET, buffer.type(0))
+        self.assertEqual(TokenType.INT, buffer.type(3))
+        self.assertEqual("10", buffer.literal(3))
+        self.assertEqual((8, 10), (buffer.starts[3], buffer.ends[3]))
+        self.assertEqual("foo", buffer.literal(5))
+        self.assertEqual(TokenType.EOF, buffer.type(len(buffer) - 1))
+
+    def test_cursor_matches_lexer(self):
+        source = "let add = fn(x, y) { x + y; }; // adds\nif (a != b) { return null; } else { !true == false }\n"
+        lexer = Lexer(source)
+        cursor = tokenize_all(source).cursor()
+
+        while True:
+            expected = lexer.next_token()
+            actual = cursor.next_token()
+
+            self.assertEqual(expected.type, actual.type)
+            self.assertEqual(expected.literal, actual.literal)
+
+            if expected.type == TokenType.EOF:
+                break
+
+        self.assertEqual(TokenType.EOF, cursor.next_token().type)
+
+    def test_parsers_consume_cursor(self):
+        source = "let add = fn(a, b) { a + b * 2 }; add(1, -2) == !false;"
+        buffer = tokenize_all(source)
+
+        for module in (pratt_parser, cfg_parser):
+            expected = module.Parser(Lexer(source)).parse_program()
+            parser = module.Parser(buffer.cursor())
+            actual = parser.parse_program()
+
+            self.assertEqual([], parser.errors)
+            self.assertEqual(expected.string(), actual.string())
+
+
+if __name__ == '__main__':
+    unittest.main()
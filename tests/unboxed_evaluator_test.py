@@ -0,0 +1,103 @@
+import unittest
+
+from monkey.evaluator.evaluator import Evaluator, NULL, TRUE
+from monkey.evaluator.unboxed_evaluator import UnboxedEvaluator, box, unbox, inspect
+from monkey.lexer.lexer import Lexer
+from monkey.object.environment import Environment
+from monkey.object.object import Error, Integer
+from monkey.parser.pratt_parser import Parser
+
+SOURCES = [
+    "let fib = fn(n) { if (n < 2) { return n; } fib(n - 1) + fib(n - 2) }; fib(15)",
+    "let newAdder = fn(x) { fn(y) { x + y } }; let addTwo = newAdder(2); addTwo(2);",
+    "(5 + 10 * 2 + 15 / 3) * 2 + -10",
+    "-7 / 2",
+    "99999999999999999999 * 99999999999999999999",
+    "return 2 * 5; 9;",
+    "!(1 == 1) != !!5",
+    "(1 < 2) == true",
+    "1 == true",
+    "1 != true",
+    "0 == false",
+    "!0",
+    "!null",
+    "null == null",
+    "if (0) { 10 } else { 20 }",
+    "if (null) { 10 }",
+    "let a = null; a",
+    "let a = 1;",
+    # no value, which is not null
+    "if (7) {}",
+    "!if (7) {}",
+    "if (if (0) {} else { 1 }) { 2 }",
+    "let f = fn() { let a = 1; }; let b = f(); b",
+    "let g = fn(x) { x }(if (-2) {} else {}); -g()",
+    "let x = 5; let f = fn(x) { x }; f(if (true) {})",
+    "(fn() {} == if (1) {})",
+    "fn(x) { x + 2; };",
+    "let f = fn(x) { x }; f == f",
+    " ",
+    # errors
+    "1 + true",
+    "true + 1",
+    "true + false",
+    "-true",
+    "-null",
+    "null + 1",
+    "fn(x) { x } + fn(x) { x }",
+    "foobar",
+    "1(2)",
+    "true(2)",
+    "let f = fn(x) { x + y }; f(1); 3",
+]
+
+
+def describe(result):
+    if result is None:
+        return None
+    if type(result) is Error:
+        return 'error', result.message
+    return type(result), result.inspect()
+
+
+class TestUnboxedEvaluator(unittest.TestCase):
+    def test_same_results(self):
+        for source in SOURCES:
+            program = Parser(Lexer(source)).parse_program()
+            expected = describe(Evaluator().eval(program, Environment()))
+            self.assertEqual(expected, describe(UnboxedEvaluator().eval(program, Environment())), source)
+
+    def test_booleans_are_not_integers(self):
+        program = Parser(Lexer("1 + true")).parse_program()
+        result = UnboxedEvaluator().eval(program, Environment())
+        self.assertEqual('type mismatch: Type.INTEGER_OBJ + Type.BOOLEAN_OBJ', result.message)
+
+    def test_environment_holds_values(self):
+        env = Environment()
+        evaluator = UnboxedEvaluator()
+        evaluator.eval(Parser(Lexer("let a = 2 * 3; let b = a > 5; let c = null;")).parse_program(), env)
+
+        self.assertEqual({'a': 6, 'b': True, 'c': None}, env.store)
+        self.assertIs(True, env.store['b'])
+        self.assertEqual('6', inspect(env.store['a']))
+        self.assertEqual('null', inspect(None))
+
+    def test_box(self):
+        self.assertIs(NULL, box(None))
+        self.assertIs(TRUE, box(True))
+        self.assertEqual(5, box(5).value)
+        self.assertIs(Integer, type(box(5)))
+        for value in (5, True, False, None):
+            self.assertIs(value, unbox(box(value)))
+
+    def test_eval_statements(self):
+        source = "let a = 5; a * 2; a == 5; -true; 3;"
+        results = UnboxedEvaluator().eval_statements(Parser(Lexer(source)).parse_statements(), Environment())
+        self.assertEqual(
+            [None, (Integer, '10'), (type(TRUE), 'True'), ('error', 'unknown operator: -Type.BOOLEAN_OBJ')],
+            [describe(r) for r in results],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()